@@ -12,6 +12,9 @@ from google import genai
 from google.genai import types
 from dotenv import load_dotenv
 
+from scraper.gemini_limiter import call_gemini
+from scraper.json_salvage import parse_json_array
+
 # 환경 변수 로드 (우선순위: .env 파일)
 load_dotenv()
 
@@ -460,14 +463,14 @@ class RecipeMatcher:
 
 **출력 형식 (JSON만):**"""
                 
-                response = self.client.models.generate_content(
+                response = call_gemini(lambda: self.client.models.generate_content(
                     model='gemini-2.0-flash-001',
                     contents=prompt,
                     config=types.GenerateContentConfig(
                         temperature=0.1,
                         max_output_tokens=500
                     )
-                )
+                ))
                 
                 response_text = response.text.strip()
                 
@@ -509,24 +512,16 @@ class RecipeMatcher:
         return result
     
     def parse_gemini_response(self, response_text: str) -> List[Dict[str, Any]]:
-        """Gemini API 응답을 파싱하여 레시피 리스트로 변환합니다."""
-        import re
-        
-        # JSON 코드 블록 제거
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(1)
-        elif response_text.startswith('```'):
-            response_text = response_text.strip('`').strip()
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
-        
-        try:
-            recipes_data = json.loads(response_text)
-        except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON 파싱 실패: {str(e)}")
+        """
+        Gemini API 응답을 파싱하여 레시피 리스트로 변환합니다.
+        출력 토큰 한도로 잘린 응답은 완전한 레시피 객체만 사용합니다.
+        """
+        result = parse_json_array(response_text, label="레시피")
+        if not result.items and not result.complete:
+            print(f"[ERROR] JSON 파싱 실패")
             print(f"응답 내용:\n{response_text[:500]}")
             return []
+        recipes_data = result.items
         
         # 데이터 검증 및 ID 추가
         recipes = []
@@ -583,11 +578,11 @@ class RecipeMatcher:
         prompt = self.create_prompt(store_name, products)
         
         try:
-            # Gemini API 호출
-            response = self.client.models.generate_content(
+            # Gemini API 호출 (공용 제한기가 호출 간격/429 재시도 관리)
+            response = call_gemini(lambda: self.client.models.generate_content(
                 model='gemini-2.0-flash-001',
                 contents=prompt
-            )
+            ))
             response_text = response.text
             
             recipes = self.parse_gemini_response(response_text)
@@ -684,10 +679,6 @@ class RecipeMatcher:
                 recipe['valid_until'] = sale_end.isoformat()
             
             all_recipes.extend(recipes)
-            
-            # API 제한 방지를 위해 대기
-            import time
-            time.sleep(3)
         
         # 4. 레시피 저장
         if all_recipes:
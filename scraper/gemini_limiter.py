@@ -0,0 +1,236 @@
+"""
+Gemini API 공용 요청 속도 제한기
+
+모든 Gemini 호출(스크래퍼 파싱, 이미지 분석, 레시피 생성/번역)이
+프로세스당 하나의 토큰 버킷을 거치도록 합니다.
+
+- 토큰 버킷: 초당 rate개 보충, 최대 burst개까지 몰아서 사용
+- 429/503 응답: Retry-After(없으면 지수 대기)만큼 전체 호출을 멈추고 속도를 절반으로
+- 성공 응답: 설정 속도까지 조금씩 회복 (AIMD)
+- 스레드/asyncio 모두에서 같은 인스턴스 사용 가능
+
+호출부는 고정 sleep 대신 call_gemini / call_gemini_async 로 감싸면 됩니다.
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+# 분당 요청 수 (환경변수로 조정 가능, API 요금제에 맞춤)
+GEMINI_RPM = float(os.getenv("GEMINI_RPM", "30"))
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "5"))
+
+# 스로틀링 시 재시도 횟수와 Retry-After가 없을 때의 기본 대기
+THROTTLE_MAX_ATTEMPTS = 5
+THROTTLE_BASE_DELAY = 5.0
+THROTTLE_MAX_DELAY = 120.0
+
+THROTTLE_STATUSES = (429, 503)
+
+
+class GeminiThrottled(Exception):
+    """Gemini가 429/503으로 요청을 거절함 (호출부에서 발생시켜 재시도 유도)"""
+
+    def __init__(self, status: int, retry_after: Optional[float] = None):
+        super().__init__(f"Gemini API HTTP {status}")
+        self.status = status
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Retry-After 헤더(초 또는 HTTP 날짜) → 대기 초"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def throttle_info(exc: BaseException) -> Optional[Tuple[int, Optional[float]]]:
+    """
+    예외가 스로틀링(429/503)인지 판별
+
+    GeminiThrottled, requests.HTTPError, google-genai APIError(code 속성)를 지원합니다.
+
+    Returns:
+        (status, retry_after) 또는 스로틀링이 아니면 None
+    """
+    if isinstance(exc, GeminiThrottled):
+        return exc.status, exc.retry_after
+
+    response = getattr(exc, 'response', None)
+    status = getattr(exc, 'code', None) or getattr(exc, 'status_code', None)
+    if status is None and response is not None:
+        status = getattr(response, 'status_code', None) or getattr(response, 'status', None)
+
+    try:
+        status = int(status)
+    except (TypeError, ValueError):
+        return None
+    if status not in THROTTLE_STATUSES:
+        return None
+
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        retry_after = parse_retry_after(headers.get('Retry-After'))
+    except AttributeError:
+        retry_after = None
+    return status, retry_after
+
+
+class AdaptiveRateLimiter:
+    """AIMD 방식으로 속도를 조절하는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rpm: float = GEMINI_RPM, burst: int = GEMINI_BURST, min_rpm: Optional[float] = None):
+        self.max_rate = rpm / 60.0
+        self.min_rate = (min_rpm if min_rpm is not None else rpm / 8) / 60.0
+        self.rate = self.max_rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._throttle_streak = 0
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """토큰 하나 예약 후 기다려야 할 시간 반환 (토큰이 음수면 빚으로 기록)"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            return max(wait, self._paused_until - now)
+
+    def acquire(self):
+        """요청 전 호출 (동기)"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """요청 전 호출 (비동기)"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def on_success(self):
+        """성공 응답: 설정 속도까지 선형 회복"""
+        with self._lock:
+            self._throttle_streak = 0
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> float:
+        """
+        429/503 응답: 속도를 절반으로 줄이고 모든 호출을 일시 정지
+
+        Returns:
+            정지 시간 (초)
+        """
+        with self._lock:
+            self._throttle_streak += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            if retry_after is None:
+                retry_after = min(
+                    THROTTLE_MAX_DELAY,
+                    THROTTLE_BASE_DELAY * 2 ** (self._throttle_streak - 1)
+                ) * random.uniform(0.8, 1.2)
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+            # 정지 중 쌓인 토큰으로 한꺼번에 몰리지 않도록 버킷 비우기
+            self._tokens = min(self._tokens, 0.0)
+            return retry_after
+
+    @property
+    def rpm(self) -> float:
+        return self.rate * 60
+
+
+_default_limiter: Optional[AdaptiveRateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_gemini_limiter() -> AdaptiveRateLimiter:
+    """프로세스 공용 Gemini 제한기"""
+    global _default_limiter
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = AdaptiveRateLimiter()
+        return _default_limiter
+
+
+def _report_throttle(limiter: AdaptiveRateLimiter, status: int, retry_after: Optional[float], attempt: int):
+    delay = limiter.on_throttle(retry_after)
+    print(
+        f"⏳ Gemini 스로틀링 (HTTP {status}) - {delay:.0f}초 정지, "
+        f"속도 {limiter.rpm:.0f}/분 ({attempt}/{THROTTLE_MAX_ATTEMPTS})"
+    )
+
+
+def call_gemini(
+    func: Callable[[], T],
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    max_attempts: int = THROTTLE_MAX_ATTEMPTS
+) -> T:
+    """
+    Gemini 호출을 제한기로 감싸 실행 (동기)
+
+    스로틀링 예외만 재시도하고, 그 밖의 예외는 그대로 호출부로 전달합니다.
+    """
+    limiter = limiter or get_gemini_limiter()
+    attempt = 0
+    while True:
+        attempt += 1
+        limiter.acquire()
+        try:
+            result = func()
+        except Exception as e:
+            info = throttle_info(e)
+            if info is None or attempt >= max_attempts:
+                raise
+            _report_throttle(limiter, info[0], info[1], attempt)
+            continue
+        limiter.on_success()
+        return result
+
+
+async def call_gemini_async(
+    func: Callable[[], Awaitable[T]],
+    limiter: Optional[AdaptiveRateLimiter] = None,
+    max_attempts: int = THROTTLE_MAX_ATTEMPTS
+) -> T:
+    """Gemini 호출을 제한기로 감싸 실행 (비동기, func는 매번 새 코루틴 생성)"""
+    limiter = limiter or get_gemini_limiter()
+    attempt = 0
+    while True:
+        attempt += 1
+        await limiter.acquire_async()
+        try:
+            result = await func()
+        except Exception as e:
+            info = throttle_info(e)
+            if info is None or attempt >= max_attempts:
+                raise
+            _report_throttle(limiter, info[0], info[1], attempt)
+            continue
+        limiter.on_success()
+        return result
+
+
+def raise_for_throttle(status: int, headers: Any = None):
+    """HTTP 응답 상태가 429/503이면 GeminiThrottled 발생 (REST 호출부용)"""
+    if status in THROTTLE_STATUSES:
+        retry_after = parse_retry_after((headers or {}).get('Retry-After'))
+        raise GeminiThrottled(status, retry_after)
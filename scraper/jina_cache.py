@@ -0,0 +1,224 @@
+"""
+Jina Reader 로컬 HTTP 캐시
+
+타겟 URL(마트 세일 페이지)을 키로 마크다운 본문, 콘텐츠 해시, 수집 시각,
+검증자(ETag / Last-Modified)를 data/cache/jina/ 에 저장합니다.
+
+- TTL 이내: 업스트림 요청 없이 캐시 본문 사용
+- TTL 경과: 검증자가 있으면 조건부 요청(If-None-Match / If-Modified-Since)으로 재검증
+- 오래된 항목(STALE_SECONDS 경과)과 용량 초과분(MAX_BYTES)은 자동 정리
+
+스마트 스케줄러의 업데이트 확인과 실제 스크래핑이 같은 시간대에 실행되면
+업스트림 요청은 한 번만 발생합니다.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, Mapping, Optional
+
+import requests
+
+PROJECT_ROOT = Path(__file__).parent.parent
+CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "jina"
+
+JINA_BASE_URL = "https://r.jina.ai"
+
+TTL_SECONDS = 60 * 60                # 1시간: 이 안에서는 재요청하지 않음
+STALE_SECONDS = 7 * 24 * 60 * 60     # 1주일: 세일 주기가 지나면 삭제
+MAX_BYTES = 50 * 1024 * 1024         # 캐시 전체 용량 상한 (50MB)
+
+
+@dataclass
+class CacheEntry:
+    """캐시 항목"""
+    url: str
+    body: str
+    content_hash: str
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def age(self) -> float:
+        """수집(또는 마지막 재검증) 후 경과 시간 (초)"""
+        return time.time() - self.fetched_at
+
+    def conditional_headers(self) -> Dict[str, str]:
+        """조건부 요청 헤더"""
+        headers = {}
+        if self.etag:
+            headers['If-None-Match'] = self.etag
+        if self.last_modified:
+            headers['If-Modified-Since'] = self.last_modified
+        return headers
+
+
+def content_hash(body: str) -> str:
+    """본문 SHA-256 해시"""
+    return hashlib.sha256(body.encode('utf-8')).hexdigest()
+
+
+class JinaCache:
+    """타겟 URL 기준 마크다운 캐시 (파일 기반, 프로세스 간 공유)"""
+
+    def __init__(
+        self,
+        cache_dir: Path = CACHE_DIR,
+        ttl: float = TTL_SECONDS,
+        stale_after: float = STALE_SECONDS,
+        max_bytes: int = MAX_BYTES
+    ):
+        self.cache_dir = Path(cache_dir)
+        self.ttl = ttl
+        self.stale_after = stale_after
+        self.max_bytes = max_bytes
+
+    def _path(self, url: str) -> Path:
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()[:32]
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """캐시 항목 조회 (만료 여부와 무관)"""
+        path = self._path(url)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entry = CacheEntry(**data)
+        except (OSError, ValueError, TypeError):
+            return None
+
+        if entry.url != url or entry.age() > self.stale_after:
+            return None
+        return entry
+
+    def get_fresh(self, url: str, max_age: Optional[float] = None) -> Optional[CacheEntry]:
+        """TTL(또는 max_age) 이내의 캐시 항목만 반환"""
+        entry = self.get(url)
+        limit = self.ttl if max_age is None else max_age
+        if entry and entry.age() <= limit:
+            return entry
+        return None
+
+    def store(self, url: str, body: str, headers: Optional[Mapping[str, str]] = None) -> CacheEntry:
+        """새 응답 저장 (200 OK)"""
+        headers = headers or {}
+        entry = CacheEntry(
+            url=url,
+            body=body,
+            content_hash=content_hash(body),
+            fetched_at=time.time(),
+            etag=headers.get('ETag'),
+            last_modified=headers.get('Last-Modified'),
+        )
+        self._write(entry)
+        self.evict()
+        return entry
+
+    def revalidated(self, entry: CacheEntry, headers: Optional[Mapping[str, str]] = None) -> CacheEntry:
+        """304 Not Modified 응답 반영 (본문 유지, 수집 시각/검증자 갱신)"""
+        headers = headers or {}
+        entry.fetched_at = time.time()
+        entry.etag = headers.get('ETag') or entry.etag
+        entry.last_modified = headers.get('Last-Modified') or entry.last_modified
+        self._write(entry)
+        return entry
+
+    def _write(self, entry: CacheEntry):
+        """임시 파일에 쓴 뒤 rename (동시 실행 중에도 깨진 파일이 보이지 않음)"""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(entry.url))
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def evict(self):
+        """오래된 항목 삭제 후 용량 상한을 넘으면 오래된 순으로 삭제"""
+        if not self.cache_dir.exists():
+            return
+
+        now = time.time()
+        files = []
+        for path in self.cache_dir.glob('*.json'):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            if now - stat.st_mtime > self.stale_after:
+                path.unlink(missing_ok=True)
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+_default_cache: Optional[JinaCache] = None
+
+
+def get_default_cache() -> JinaCache:
+    """프로세스 공용 캐시 인스턴스"""
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = JinaCache()
+    return _default_cache
+
+
+def fetch_jina_markdown(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    timeout: float = 60,
+    max_age: Optional[float] = None,
+    cache: Optional[JinaCache] = None
+) -> str:
+    """
+    Jina Reader로 마크다운 가져오기 (동기, 캐시 우선)
+
+    Args:
+        url: 타겟 페이지 URL (Jina URL 아님)
+        headers: 추가 요청 헤더
+        timeout: 요청 타임아웃 (초)
+        max_age: 캐시 허용 나이 (초). None이면 캐시 TTL, 0이면 항상 재검증
+        cache: 사용할 캐시 (기본: 프로세스 공용 캐시)
+
+    Returns:
+        마크다운 텍스트
+
+    Raises:
+        requests.RequestException: 업스트림 요청 실패
+    """
+    cache = cache or get_default_cache()
+
+    fresh = cache.get_fresh(url, max_age)
+    if fresh:
+        print(f"💾 Jina 캐시 사용 ({fresh.age() / 60:.0f}분 전 수집): {url}")
+        return fresh.body
+
+    request_headers = dict(headers or {})
+    stale = cache.get(url)
+    if stale:
+        request_headers.update(stale.conditional_headers())
+
+    response = requests.get(f"{JINA_BASE_URL}/{url}", headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and stale:
+        print(f"💾 Jina 캐시 재검증 (변경 없음): {url}")
+        return cache.revalidated(stale, response.headers).body
+
+    response.raise_for_status()
+    cache.store(url, response.text, response.headers)
+    return response.text
@@ -0,0 +1,109 @@
+"""
+Jina Reader 마트별 응답 시간 기록
+
+성공한 요청의 응답 시간(시간 초과는 타임아웃 값)을 data/cache/jina_latency.json 에
+마트별로 최근 HISTORY_SIZE개까지 저장합니다. 지연 꼬리가 긴(p90이 중앙값보다 훨씬 느린)
+마트는 헤지 요청(두 번째 요청을 먼저 끝나는 쪽으로 사용)의 기준으로 씁니다.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).parent.parent
+HISTORY_PATH = PROJECT_ROOT / "data" / "cache" / "jina_latency.json"
+
+HISTORY_SIZE = 30
+MIN_SAMPLES = 5              # 이보다 기록이 적으면 헤지하지 않음
+LONG_TAIL_RATIO = 2.0        # p90 / p50 이 이 값 이상이면 꼬리가 긴 마트
+HEDGE_PERCENTILE = 75        # 이 백분위 시간이 지나도 응답이 없으면 헤지 요청
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """선형 보간 백분위수"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+class LatencyHistory:
+    """마트별 Jina 응답 시간 기록 (파일 기반)"""
+
+    def __init__(self, path: Path = HISTORY_PATH, size: int = HISTORY_SIZE):
+        self.path = Path(path)
+        self.size = size
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = self._load()
+
+    def _load(self) -> Dict[str, List[float]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            return {store: [float(v) for v in values] for store, values in data.items()}
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def record(self, store: str, seconds: float):
+        with self._lock:
+            samples = self._samples.setdefault(store, [])
+            samples.append(round(seconds, 2))
+            del samples[:-self.size]
+
+    def record_timeout(self, store: str, timeout: float):
+        """
+        시간 초과한 요청 기록
+
+        실제 응답 시간은 timeout 이상이므로 timeout 값을 중도 절단 표본으로 남깁니다
+        (빼 버리면 헤지 기준 백분위가 느린 꼬리를 과소평가).
+        """
+        self.record(store, timeout)
+
+    def hedge_delay(self, store: str) -> Optional[float]:
+        """
+        헤지 요청을 보낼 시점 (초)
+
+        기록이 충분하고 꼬리가 긴 마트만 HEDGE_PERCENTILE 시간을 반환,
+        그 외에는 None (헤지 안 함)
+        """
+        samples = self._samples.get(store, [])
+        if len(samples) < MIN_SAMPLES:
+            return None
+        median = percentile(samples, 50)
+        if median <= 0 or percentile(samples, 90) / median < LONG_TAIL_RATIO:
+            return None
+        return percentile(samples, HEDGE_PERCENTILE)
+
+    def save(self):
+        """임시 파일에 쓴 뒤 rename"""
+        with self._lock:
+            data = dict(self._samples)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+_default_history: Optional[LatencyHistory] = None
+
+
+def get_latency_history() -> LatencyHistory:
+    """프로세스 공용 응답 시간 기록"""
+    global _default_history
+    if _default_history is None:
+        _default_history = LatencyHistory()
+    return _default_history
@@ -0,0 +1,134 @@
+"""
+LLM 응답 JSON 배열 복구 파서
+
+Gemini 응답은 maxOutputTokens에 걸려 배열 중간(객체 안)에서 잘리거나,
+코드 블록(```json)과 앞뒤 설명문이 붙어 오는 경우가 많습니다.
+`re.search(r'\\[[\\s\\S]*\\]')` + json.loads 는 이런 응답을 통째로 버리므로,
+배열 원소를 하나씩 json.JSONDecoder.raw_decode 로 읽어 완전한 원소는 모두 살립니다.
+
+- 코드 블록/앞뒤 설명문 허용 (첫 '[' 부터 읽음)
+- 배열이 잘렸으면 마지막 완전한 원소까지 반환 (truncated=True)
+- 배열 없이 객체만 나열된 응답은 최상위 {...} 객체를 차례로 읽음
+- 중첩 객체/배열도 원소 단위로 그대로 파싱 (정규식 {...} 추출과 달리 안전)
+
+사용 예:
+    result = parse_json_array(generated_text, label="Dirk")
+    products = result.items          # 잘린 응답이면 복구된 원소만
+    if result.truncated: ...         # result.salvaged 개 복구
+"""
+
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, List
+
+_decoder = json.JSONDecoder()
+_FENCE = re.compile(r'```(?:json)?', re.IGNORECASE)
+_VALUE_START = set('{["-0123456789]')
+
+
+@dataclass
+class SalvageResult:
+    """파싱 결과"""
+    items: List[Any] = field(default_factory=list)
+    complete: bool = False      # 배열을 끝(']')까지 읽었는지
+    truncated: bool = False     # 원소 중간에서 끊겨 나머지를 버렸는지
+
+    @property
+    def salvaged(self) -> int:
+        """잘린 응답에서 복구한 원소 수 (완전한 응답이면 0)"""
+        return len(self.items) if self.truncated else 0
+
+
+def _skip(text: str, pos: int) -> int:
+    """공백과 원소 구분자(,) 건너뛰기"""
+    while pos < len(text) and (text[pos].isspace() or text[pos] == ','):
+        pos += 1
+    return pos
+
+
+def _opens_array(text: str, start: int) -> bool:
+    """text[start]의 '['가 JSON 배열을 시작할 수 있는지 (다음 글자가 값 시작 또는 ']')"""
+    pos = start + 1
+    while pos < len(text) and text[pos].isspace():
+        pos += 1
+    return pos >= len(text) or text[pos] in _VALUE_START
+
+
+def _read_array(text: str, start: int) -> SalvageResult:
+    """text[start] == '[' 인 배열을 원소 단위로 읽음"""
+    result = SalvageResult()
+    pos = start + 1
+    while True:
+        pos = _skip(text, pos)
+        if pos >= len(text):
+            result.truncated = True
+            return result
+        if text[pos] == ']':
+            result.complete = True
+            return result
+        try:
+            item, pos = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            result.truncated = True
+            return result
+        result.items.append(item)
+
+
+def _read_objects(text: str) -> SalvageResult:
+    """배열 없이 나열된 최상위 {...} 객체들을 차례로 읽음"""
+    result = SalvageResult()
+    pos = text.find('{')
+    while pos != -1:
+        try:
+            item, end = _decoder.raw_decode(text, pos)
+        except json.JSONDecodeError:
+            result.truncated = True
+            break
+        result.items.append(item)
+        pos = text.find('{', end)
+    result.complete = not result.truncated and bool(result.items)
+    return result
+
+
+def parse_json_array(text: str, label: str = '') -> SalvageResult:
+    """
+    LLM 응답에서 JSON 배열 원소 추출 (잘린 응답은 완전한 원소만 복구)
+
+    Args:
+        text: 모델 응답 텍스트
+        label: 로그 접두어 (복구가 일어났을 때만 출력)
+    """
+    text = _FENCE.sub('', text or '').strip()
+
+    # 가장 흔한 경우: 순수 JSON
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    else:
+        if isinstance(data, list):
+            return SalvageResult(items=data, complete=True)
+        if isinstance(data, dict):
+            return SalvageResult(items=[data], complete=True)
+
+    bracket, brace = text.find('['), text.find('{')
+    if bracket != -1 and (brace == -1 or bracket < brace):
+        result = _read_array(text, bracket)
+        # 설명문 안의 '[' (예: "[참고]")였으면 다음 '[' 부터 다시 시도
+        # (값으로 시작하는 배열이 첫 원소에서 잘렸으면 중첩 배열로 넘어가지 않고 잘림으로 보고)
+        while not result.items and not result.complete and not _opens_array(text, bracket):
+            bracket = text.find('[', bracket + 1)
+            if bracket == -1:
+                break
+            result = _read_array(text, bracket)
+    else:
+        result = _read_objects(text)
+
+    if result.truncated:
+        prefix = f"[{label}] " if label else ""
+        if result.items:
+            print(f"🩹 {prefix}JSON 응답 잘림 → 완전한 객체 {result.salvaged}개 복구 (재요청 생략)")
+        else:
+            print(f"⚠️ {prefix}JSON 응답 잘림 → 복구할 완전한 객체 없음")
+    return result
@@ -0,0 +1,146 @@
+"""
+Jina 마크다운 청크 분할 / 추출 결과 병합
+
+긴 마트 페이지를 상품 블록 경계(헤딩, 가격 줄 직후, 반복되는 카드 패턴)에서
+잘라 여러 청크로 나누고, 청크별 Gemini 추출 결과를 하나로 합칩니다.
+글자 수로 자르지 않으므로 상품 하나가 두 청크에 걸쳐 잘리지 않습니다.
+"""
+
+import re
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+# 청크 최대 길이 (문자)
+CHUNK_MAX_CHARS = 8000
+
+HEADING_RE = re.compile(r'^\s{0,3}#{1,6}\s')
+PRICE_RE = re.compile(r'(€\s?\d+[.,]\d{1,2}|^\s*\d+[.,]\d{2}\s*$)')
+DISCOUNT_RE = re.compile(
+    r'(\d+\s*\+\s*\d+|korting|gratis|halve prijs|\d+\s*voor\s*€?\s*\d|\d+\s*%)',
+    re.IGNORECASE
+)
+
+# 카드 패턴 판별용 최소 반복 횟수
+CARD_PATTERN_MIN_REPEATS = 5
+
+
+def _line_signature(line: str) -> Optional[str]:
+    """줄의 시작 형태 (예: '[![', '![', '* [', '- ') - 카드 패턴 감지용"""
+    stripped = line.lstrip()
+    if not stripped:
+        return None
+    match = re.match(r'^([\[\]!*\-+>|#]+\s?\(?\[?)', stripped)
+    return match.group(1) if match else None
+
+
+def _is_price_line(line: str) -> bool:
+    return bool(PRICE_RE.search(line) or DISCOUNT_RE.search(line))
+
+
+def find_block_boundaries(lines: Sequence[str]) -> List[bool]:
+    """
+    각 줄이 새 상품 블록의 시작(자를 수 있는 위치)인지 판별
+
+    - 마크다운 헤딩
+    - 페이지에서 반복되는 카드 시작 패턴 (이미지 링크 등)
+    - 가격/할인 줄이 끝난 직후의 첫 줄
+    """
+    signatures = [_line_signature(line) for line in lines]
+    counts = Counter(sig for sig in signatures if sig and not sig.startswith('#'))
+    card_signatures = {sig for sig, n in counts.items() if n >= CARD_PATTERN_MIN_REPEATS}
+
+    boundaries = []
+    previous_was_price = False
+    for line, sig in zip(lines, signatures):
+        if not line.strip():
+            boundaries.append(False)
+            continue
+
+        is_price = _is_price_line(line)
+        boundary = (
+            bool(HEADING_RE.match(line))
+            or sig in card_signatures
+            or (previous_was_price and not is_price)
+        )
+        boundaries.append(boundary)
+        previous_was_price = is_price
+
+    return boundaries
+
+
+def split_markdown_into_chunks(markdown_text: str, max_chars: int = CHUNK_MAX_CHARS) -> List[str]:
+    """
+    마크다운을 상품 블록 경계에서 max_chars 이하 청크로 분할
+
+    경계가 전혀 없는 긴 구간만 줄 단위로 강제로 자릅니다.
+    """
+    if len(markdown_text) <= max_chars:
+        return [markdown_text]
+
+    lines = markdown_text.splitlines()
+    boundaries = find_block_boundaries(lines)
+
+    chunks: List[str] = []
+    current: List[str] = []
+    current_len = 0
+    last_boundary = 0  # current 안에서 마지막 경계 위치
+
+    def emit(part: List[str]):
+        text = '\n'.join(part).strip()
+        if text:
+            chunks.append(text)
+
+    for line, is_boundary in zip(lines, boundaries):
+        if is_boundary and current:
+            last_boundary = len(current)
+
+        current.append(line)
+        current_len += len(line) + 1
+
+        if current_len > max_chars:
+            if last_boundary > 0:
+                emit(current[:last_boundary])
+                current = current[last_boundary:]
+            else:
+                emit(current)
+                current = []
+            current_len = sum(len(part) + 1 for part in current)
+            last_boundary = 0
+
+    emit(current)
+    return chunks
+
+
+def _normalize(value: Any) -> str:
+    return re.sub(r'\s+', ' ', str(value or '')).strip().lower()
+
+
+def merge_products(
+    product_lists: Iterable[List[Dict[str, Any]]],
+    key_fields: Sequence[str] = ('product_name', 'price')
+) -> List[Dict[str, Any]]:
+    """
+    청크별 상품 목록 병합 (순서 유지, 중복 제거)
+
+    같은 키의 상품이 여러 번 나오면 첫 번째 항목을 유지하고,
+    비어 있는 필드만 뒤의 항목 값으로 채웁니다.
+    """
+    merged: Dict[tuple, Dict[str, Any]] = {}
+
+    for products in product_lists:
+        for product in products or []:
+            if not isinstance(product, dict):
+                continue
+            key = tuple(_normalize(product.get(field)) for field in key_fields)
+            if not key[0]:
+                continue
+
+            existing = merged.get(key)
+            if existing is None:
+                merged[key] = dict(product)
+                continue
+            for field, value in product.items():
+                if existing.get(field) in (None, '') and value not in (None, ''):
+                    existing[field] = value
+
+    return list(merged.values())
@@ -0,0 +1,165 @@
+"""
+Jina 마크다운 압축 (Gemini 입력 토큰 절감)
+
+Jina Reader 마크다운에는 메뉴, 푸터, 쿠키 안내, 이미지/추적 링크가 많습니다.
+상품 정보(이름, 가격, 할인, 단위)는 그대로 두고 나머지를 걷어냅니다.
+
+- 링크 [텍스트](url) → 텍스트, 이미지 ![alt](url) → 의미 있는 alt 텍스트만
+- 남은 URL 제거 (추적 파라미터 포함)
+- 공통/마트별 보일러플레이트 줄 제거 (줄 전체가 메뉴/푸터/동의 문구이고 가격 줄 옆이 아닐 때만)
+- 반복 공백/빈 줄/연속 중복 줄 정리
+"""
+
+import re
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Pattern, Tuple
+
+# 토큰 수 추정 (Gemini 기준 대략 1토큰 ≈ 4문자)
+CHARS_PER_TOKEN = 4
+
+IMAGE_RE = re.compile(r'!\[([^\]]*)\]\([^)]*\)')
+LINK_RE = re.compile(r'\[([^\]]*)\]\([^)]*\)')
+URL_RE = re.compile(r'<?https?://\S+>?')
+GENERIC_ALT_RE = re.compile(r'^\s*(image\s*\d*:?|logo|icon|afbeelding)\s*', re.IGNORECASE)
+
+# Jina 응답 헤더 줄
+JINA_HEADER_RE = re.compile(r'^(Title|URL Source|Published Time|Markdown Content|Warning):', re.IGNORECASE)
+
+# 모든 마트 공통 보일러플레이트 (짧은 줄에만 적용)
+# 상품명과 겹칠 수 있어("Verkade chocolate cookies" 등) 줄 전체가 메뉴/푸터/동의 문구일 때만 제거
+COMMON_BOILERPLATE = [
+    r'(alle )?cookies?( (accepteren|instellingen|instellen|weigeren|beleid|verklaring))?',
+    r'(cookie|privacy)(beleid|verklaring|instellingen|statement)',
+    r'privacy',
+    r'(geef |geef je )?toestemming( geven| beheren)?',
+    r'(ik ga )?akkoord',
+    r'(alles |alle cookies )?accepteren',
+    r'(©|copyright)\s.*', r'.*alle rechten voorbehouden',
+    r'algemene voorwaarden',
+    r'download (de|onze) app', r'(download (it )?(in|on) the )?app store', r'(get it on |ontdek het op )?google play',
+    r'volg ons( op \w+)?', r'(meld je aan voor (de|onze) )?nieuwsbrief( aanmelden)?',
+    r'skip to( main)? content', r'(ga )?naar (de )?(hoofd)?inhoud', r'veelgestelde vragen',
+    r'(menu|zoeken|inloggen|log in|mijn account|winkelmand(je)?|winkelwagen)',
+    r'(klantenservice|contact|vacatures|over ons|disclaimer|home)',
+]
+
+# 마트별 보일러플레이트 (키: scraper/store_urls.STORE_URLS 이름, 역시 줄 전체 일치)
+STORE_BOILERPLATE: Dict[str, List[str]] = {
+    'Albert Heijn': [r'ah\s?premium', r'(ah )?bonuskaart', r'allerhande( recepten)?', r'ah to go', r'bezorgbundel'],
+    'Dirk': [r'(download de )?dirk app', r'(bekijk de )?digitale folder', r'(mijn )?boodschappenlijst(je)?'],
+    'Lidl': [r'lidl plus', r'lidl-shop', r'non-food( aanbiedingen)?', r'(bekijk de )?prospectus(sen)?'],
+    'ALDI': [r'(download de )?aldi app', r'filiaalzoeker', r'folder bekijken'],
+    'Plus': [r'plus punten', r'bezorgen of ophalen', r'mijn plus'],
+    'Coop': [r'(download de )?coop app', r'bezorgservice', r'mijn coop'],
+    'Hoogvliet': [r'(download de )?hoogvliet app', r'bestellen en bezorgen', r'mijn hoogvliet'],
+}
+
+# 보일러플레이트 판정 대상 최대 줄 길이 (긴 줄은 상품 설명일 수 있어 유지)
+BOILERPLATE_MAX_LINE = 80
+
+# 가격/할인 표시가 있는 줄은 보일러플레이트 패턴에 걸려도 유지
+KEEP_RE = re.compile(r'(€|\d+[.,]\d{2}|\d+\s*\+\s*\d+|korting|gratis|halve prijs|\d+\s*%)', re.IGNORECASE)
+
+
+@dataclass
+class CompactionStats:
+    """압축 전후 크기"""
+    before_chars: int
+    after_chars: int
+    before_tokens: int
+    after_tokens: int
+
+    @property
+    def saved_ratio(self) -> float:
+        if not self.before_chars:
+            return 0.0
+        return 1 - self.after_chars / self.before_chars
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['saved_ratio'] = round(self.saved_ratio, 3)
+        return data
+
+
+def estimate_tokens(text: str) -> int:
+    """문자 수 기반 토큰 수 추정"""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _compile(patterns: List[str]) -> List[Pattern]:
+    return [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+
+_COMMON_PATTERNS = _compile(COMMON_BOILERPLATE)
+_STORE_PATTERNS = {store: _compile(patterns) for store, patterns in STORE_BOILERPLATE.items()}
+
+
+def _image_alt(match: re.Match) -> str:
+    """이미지 문법 → 의미 있는 alt 텍스트 (없으면 제거)"""
+    return GENERIC_ALT_RE.sub('', match.group(1)).strip()
+
+
+def _is_boilerplate(line: str, patterns: List[Pattern]) -> bool:
+    if len(line) > BOILERPLATE_MAX_LINE or KEEP_RE.search(line):
+        return False
+    text = line.lstrip('*-+># ').strip().rstrip(' .:|>')
+    return any(pattern.fullmatch(text) for pattern in patterns)
+
+
+def _next_text(lines: List[str], index: int) -> str:
+    """index 다음의 첫 비어 있지 않은 줄"""
+    for line in lines[index + 1:]:
+        if line:
+            return line
+    return ''
+
+
+def compact_markdown(markdown_text: str, store: str = "") -> Tuple[str, CompactionStats]:
+    """
+    마크다운에서 링크/이미지/보일러플레이트 제거 후 공백 정리
+
+    Returns:
+        (압축된 마크다운, 압축 통계)
+    """
+    patterns = _COMMON_PATTERNS + _STORE_PATTERNS.get(store, [])
+
+    text = IMAGE_RE.sub(_image_alt, markdown_text)
+    text = LINK_RE.sub(r'\1', text)
+    text = URL_RE.sub('', text)
+
+    normalized = [re.sub(r'[ \t]+', ' ', raw_line).strip() for raw_line in text.splitlines()]
+
+    lines: List[str] = []
+    previous = ''   # 직전의 비어 있지 않은 원본 줄
+    for index, line in enumerate(normalized):
+        # 빈 줄은 하나만 유지
+        if not line:
+            if lines and lines[-1]:
+                lines.append('')
+            continue
+
+        before, previous = previous, line
+        if JINA_HEADER_RE.match(line):
+            continue
+        # 구분선/기호만 남은 줄 (빈 링크, 목록 기호 등)
+        if not re.search(r'\w', line):
+            continue
+        # 가격 줄 바로 옆은 상품 블록 안이므로 패턴에 걸려도 유지
+        if _is_boilerplate(line, patterns) and not (
+            KEEP_RE.search(before) or KEEP_RE.search(_next_text(normalized, index))
+        ):
+            continue
+        # 연속 중복 줄 (이미지 alt + 상품명 등)
+        if lines and line == lines[-1]:
+            continue
+
+        lines.append(line)
+
+    compacted = '\n'.join(lines).strip()
+    stats = CompactionStats(
+        before_chars=len(markdown_text),
+        after_chars=len(compacted),
+        before_tokens=estimate_tokens(markdown_text),
+        after_tokens=estimate_tokens(compacted),
+    )
+    return compacted, stats
@@ -0,0 +1,93 @@
+"""
+마트별/주차별 스크래핑 결과 샤드
+
+마트 하나가 끝날 때마다 결과를 data/shards/<week_type>/<week_number>/<마트>.json
+에 바로 저장합니다 (임시 파일 + rename). 통합 파일(current_sales.json 등)은
+샤드를 모아서 만들므로, 실행 중간에 중단되어도 끝난 마트 결과는 남고
+--only-failed 재실행 때 실패/누락된 마트만 다시 수집할 수 있습니다.
+"""
+
+import json
+import os
+import re
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SHARD_DIR = PROJECT_ROOT / "data" / "shards"
+
+
+def _file_mode(path: Path) -> int:
+    """기존 파일 권한 (없으면 umask 기본값, mkstemp의 0600을 그대로 쓰지 않도록)"""
+    try:
+        st = os.lstat(path)
+        if stat.S_ISREG(st.st_mode):
+            return stat.S_IMODE(st.st_mode)
+    except OSError:
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write_text(path: Path, text: str):
+    """임시 파일에 쓴 뒤 rename (읽는 쪽에 반쯤 쓰인 파일이 보이지 않음)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def _slug(store: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', store.lower()).strip('-')
+
+
+def shard_dir(week_type: str, week_number: str) -> Path:
+    return SHARD_DIR / week_type / week_number
+
+
+def write_shard(week_type: str, week_number: str, result: Dict[str, Any]) -> Path:
+    """마트 결과 하나를 샤드로 저장 (result['store'] 필수)"""
+    path = shard_dir(week_type, week_number) / f"{_slug(result['store'])}.json"
+    atomic_write_text(path, json.dumps(result, ensure_ascii=False))
+    return path
+
+
+def load_shards(week_type: str, week_number: str) -> Dict[str, Dict[str, Any]]:
+    """해당 주차의 모든 샤드 로드 ({store: result})"""
+    shards: Dict[str, Dict[str, Any]] = {}
+    directory = shard_dir(week_type, week_number)
+    if not directory.exists():
+        return shards
+
+    for path in sorted(directory.glob('*.json')):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            print(f"⚠️ 샤드 읽기 실패 (무시): {path}")
+            continue
+        if isinstance(data, dict) and data.get('store'):
+            shards[data['store']] = data
+    return shards
+
+
+def stores_needing_rerun(week_type: str, week_number: str, stores: Iterable[str]) -> List[str]:
+    """샤드가 없거나 실패로 기록된 마트 목록"""
+    shards = load_shards(week_type, week_number)
+    return [
+        store for store in stores
+        if store not in shards or not shards[store].get('success')
+    ]
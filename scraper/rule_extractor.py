@@ -0,0 +1,241 @@
+"""
+규칙 기반 상품 추출기 (Gemini 호출 전 빠른 경로)
+
+구조가 규칙적인 마트 페이지는 상품 블록이
+    상품명 → 가격(€0.89) → 할인 라벨(2 voor 2.49, 1+1 gratis, 25% korting) → 단위
+순서로 반복됩니다. 정규식으로 줄 종류를 판별하고 상태 머신으로 블록을 묶어
+Gemini 프롬프트와 같은 필드(product_name, price, original_price,
+discount_label, unit)를 만듭니다.
+
+신뢰도(confidence)가 낮으면 호출하는 쪽에서 Gemini로 넘깁니다.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from scraper.markdown_chunker import merge_products
+
+# 이 신뢰도 이상이면 Gemini 호출 생략
+RULE_CONFIDENCE_THRESHOLD = 0.8
+# 이보다 적게 추출되면 페이지 구조를 못 읽은 것으로 보고 신뢰도 0
+RULE_MIN_PRODUCTS = 5
+
+NAME_MAX_CHARS = 80
+
+PRICE_VALUE = r'\d{1,3}[.,]\d{2}'
+PRICE_RE = re.compile(rf'€\s?({PRICE_VALUE})|(?<![\d.,])({PRICE_VALUE})(?![\d.,])')
+PRICE_LINE_RE = re.compile(rf'^(van\s+|voor\s+|nu\s+)?€?\s?{PRICE_VALUE}(\s*(van|voor|nu)?\s*€?\s?{PRICE_VALUE})*$', re.IGNORECASE)
+DISCOUNT_RE = re.compile(
+    r'(\d+\s*\+\s*\d+(\s*gratis)?'
+    r'|\d+\s*(voor|for)\s*€?\s?\d+([.,]\d{2})?'
+    r'|\d+\s*%\s*(korting)?'
+    r'|\d+e\s*(halve prijs|gratis)'
+    r'|halve prijs'
+    r'|\d+\s*euro\s*korting)',
+    re.IGNORECASE
+)
+UNIT_RE = re.compile(
+    r'^(per\s+)?(\d+\s*x\s*)?\d+([.,]\d+)?\s*(g|gr|gram|kg|kilo|ml|cl|l|liter|stuks?|st)\.?$'
+    r'|^per\s+(kilo|kg|stuk|bos|bak|zak|pak|100\s*g)$'
+    r'|^(bak|zak|pak|fles|doos|bos|net)\s+\d',
+    re.IGNORECASE
+)
+# 상품명이 아니라 블록을 꾸미는 줄 (변형/시작가/배송 안내): 블록 경계로 쓰지 않음
+DESCRIPTOR_RE = re.compile(
+    r'^(alle|diverse|verschillende)\s+(varianten|soorten|smaken|combinaties)\b'
+    r'|^(va\.?|vanaf|op\s*=\s*op|combineren mogelijk|mix\s*(en|&)\s*match|alleen online|online|nieuw)$'
+    r'|bezorg',
+    re.IGNORECASE
+)
+# 이름 끝에 붙은 가격 ("Hollandse aardbeien €2,99")
+TRAILING_PRICE_RE = re.compile(rf'\s*[-–:]?\s*((van|voor|nu|va\.?)\s+)?€\s?{PRICE_VALUE}$', re.IGNORECASE)
+TRAILING_UNIT_RE = re.compile(
+    r'[\s,]+((\d+\s*x\s*)?\d+([.,]\d+)?\s*(g|gr|gram|kg|ml|cl|l|liter|stuks?|st))\.?$',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class _Block:
+    """상품 블록 (상태 머신 내부용)"""
+    name: str
+    prices: List[str] = field(default_factory=list)
+    discount_label: Optional[str] = None
+    unit: Optional[str] = None
+    discount_lines: int = 0
+    unit_lines: int = 0
+
+    def is_complete(self) -> bool:
+        return bool(self.prices or self.discount_label)
+
+    def looks_merged(self) -> bool:
+        """인접한 두 상품이 한 블록으로 합쳐진 흔적 (가격 3개 이상, 할인/단위 줄 중복)"""
+        return len(set(self.prices)) > 2 or self.discount_lines > 1 or self.unit_lines > 1
+
+    def to_product(self) -> Dict[str, Any]:
+        name, unit = self.name, self.unit
+        if not unit:
+            match = TRAILING_UNIT_RE.search(name)
+            if match:
+                unit = match.group(1)
+                name = name[:match.start()].strip()
+
+        price = original_price = None
+        if self.prices:
+            values = sorted(set(self.prices), key=_price_value)
+            price = values[0]
+            if len(values) > 1:
+                original_price = values[-1]
+
+        return {
+            'product_name': name,
+            'price': price,
+            'original_price': original_price,
+            'discount_label': self.discount_label,
+            'unit': unit,
+        }
+
+
+@dataclass
+class RuleExtraction:
+    """규칙 기반 추출 결과"""
+    products: List[Dict[str, Any]]
+    confidence: float
+    price_lines: int = 0      # 페이지 전체의 가격/할인 줄 수
+    matched_lines: int = 0    # 그중 상품 블록에 들어간 줄 수
+
+    @property
+    def is_confident(self) -> bool:
+        return self.confidence >= RULE_CONFIDENCE_THRESHOLD
+
+
+def _price_value(price: str) -> float:
+    return float(re.sub(r'[^\d.,]', '', price).replace(',', '.'))
+
+
+def _format_price(value: str) -> str:
+    return f"€{value.replace(',', '.')}"
+
+
+def _clean(line: str) -> str:
+    """마크다운 기호 제거 (헤딩, 목록, 강조)"""
+    line = re.sub(r'^[#>*\-+\s]+', '', line)
+    line = line.replace('**', '').replace('__', '')
+    return re.sub(r'\s+', ' ', line).strip()
+
+
+def _classify(line: str) -> str:
+    """줄 종류: price, unit, descriptor, discount, name, noise"""
+    if PRICE_LINE_RE.match(line):
+        return 'price'
+    if UNIT_RE.match(line):
+        return 'unit'
+    if DESCRIPTOR_RE.search(line):
+        return 'descriptor'
+    if len(line) <= 40 and DISCOUNT_RE.search(line):
+        return 'discount'
+    if 3 <= len(line) <= NAME_MAX_CHARS and re.search(r'[A-Za-zÀ-ÿ]{2}', line):
+        return 'name'
+    return 'noise'
+
+
+def _is_good_name(name: str) -> bool:
+    """상품명다운지 (안내 문구/가격/숫자 위주 줄이 이름이 된 경우 걸러냄)"""
+    if DESCRIPTOR_RE.search(name) or PRICE_RE.search(name):
+        return False
+    letters = len(re.findall(r'[A-Za-zÀ-ÿ]', name))
+    return letters >= 3 and letters >= len(name.replace(' ', '')) / 2
+
+
+def extract_products_by_rules(markdown_text: str) -> RuleExtraction:
+    """
+    압축된 마크다운에서 상품 블록 추출
+
+    상품명 줄에서 새 블록을 시작하고, 이어지는 가격/할인/단위 줄을 붙입니다.
+    가격이나 할인 없이 다음 상품명이 나오면 앞 줄은 카테고리나 안내 문구로 보고 버립니다.
+    "Alle varianten", "va.", 배송 안내 같은 줄은 블록을 꾸미는 줄이라 이름으로 쓰지 않고,
+    가격이 이미 두 개인 블록에 온 세 번째 가격은 다음 블록으로 넘깁니다.
+
+    신뢰도 = 가격/할인 줄이 블록에 붙은 비율 × 가격이 있는 상품 비율 가중치
+             × 상품명다운 이름 비율 × (1 - 합쳐진 블록 비율)
+    """
+    blocks: List[_Block] = []
+    current: Optional[_Block] = None
+    carried: List[str] = []     # 다음 블록으로 넘길 가격
+    carried_lines = 0
+    price_lines = matched_lines = 0
+
+    for raw_line in markdown_text.splitlines():
+        line = _clean(raw_line)
+        if not line:
+            continue
+
+        kind = _classify(line)
+        if kind in ('price', 'discount'):
+            price_lines += 1
+
+        if kind == 'name':
+            if current and current.is_complete():
+                blocks.append(current)
+            match = TRAILING_PRICE_RE.search(line)
+            if match and match.start() > 0:
+                # 이름 줄에 가격이 같이 있으면 가격을 떼어 블록에 붙임
+                current = _Block(name=line[:match.start()].strip())
+                current.prices.extend(_format_price(a or b) for a, b in PRICE_RE.findall(match.group(0)))
+                price_lines += 1
+                matched_lines += 1
+            else:
+                current = _Block(name=line)
+            if carried:
+                current.prices[:0] = carried
+                matched_lines += carried_lines
+                carried, carried_lines = [], 0
+            continue
+
+        if current is None:
+            continue
+
+        if kind == 'price' and len(current.prices) >= 2:
+            # 가격이 이미 두 개(원가/할인가)면 다음 상품의 가격 - 블록을 닫고 다음 블록으로 넘김
+            blocks.append(current)
+            current = None
+            carried = [_format_price(a or b) for a, b in PRICE_RE.findall(line)]
+            carried_lines = 1
+            continue
+
+        if kind == 'price':
+            current.prices.extend(_format_price(a or b) for a, b in PRICE_RE.findall(line))
+            matched_lines += 1
+        elif kind == 'discount':
+            if current.discount_label:
+                current.discount_label = f"{current.discount_label}, {line}"
+            else:
+                current.discount_label = line
+            current.discount_lines += 1
+            matched_lines += 1
+        elif kind == 'unit':
+            current.unit_lines += 1
+            if not current.unit:
+                current.unit = line
+
+    if current and current.is_complete():
+        blocks.append(current)
+
+    products = merge_products([[block.to_product() for block in blocks]])
+
+    if len(products) < RULE_MIN_PRODUCTS or not price_lines:
+        confidence = 0.0
+    else:
+        coverage = matched_lines / price_lines
+        priced = sum(1 for p in products if p['price']) / len(products)
+        named = sum(1 for p in products if _is_good_name(p['product_name'])) / len(products)
+        merged = sum(1 for block in blocks if block.looks_merged()) / len(blocks)
+        confidence = coverage * (0.5 + 0.5 * priced) * named * (1 - merged)
+
+    return RuleExtraction(
+        products=products,
+        confidence=round(confidence, 3),
+        price_lines=price_lines,
+        matched_lines=matched_lines,
+    )
@@ -0,0 +1,112 @@
+"""
+세일 데이터 JSON 출력
+
+- 페이로드는 한 번만 직렬화하고 같은 바이트를 모든 출력에 사용
+- 임시 파일 + rename 으로 원자적 저장, 내용이 같으면 다시 쓰지 않음
+- 호환용 별칭(weekly_sales.json 등)은 같은 바이트의 별도 파일로 원자적 저장
+  (링크로 만들면 별칭 경로에 직접 쓰는 기존 스크래퍼들이 원본까지 덮어씀)
+- 배포용 압축 변형: <이름>.min.json (공백 제거), <이름>.json.gz
+"""
+
+import gzip
+import json
+import os
+import stat
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, List
+
+
+def _file_mode(path: Path) -> int:
+    """기존 파일 권한 (없으면 umask 기본값, mkstemp의 0600을 그대로 쓰지 않도록)"""
+    try:
+        st = os.lstat(path)
+        if stat.S_ISREG(st.st_mode):
+            return stat.S_IMODE(st.st_mode)
+    except OSError:
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def atomic_write_bytes(path: Path, data: bytes):
+    """임시 파일에 쓴 뒤 rename (권한은 기존 파일/umask 기준)"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, _file_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def write_if_changed(path: Path, data: bytes) -> bool:
+    """
+    내용이 다를 때만 저장 (예전 실행이 만든 심볼릭/하드 링크였다면 실제 파일로 교체)
+
+    Returns:
+        실제로 썼으면 True
+    """
+    path = Path(path)
+    if path.is_file() and not path.is_symlink():
+        try:
+            st = path.stat()
+            if st.st_nlink == 1 and st.st_size == len(data) and path.read_bytes() == data:
+                return False
+        except OSError:
+            pass
+    atomic_write_bytes(path, data)
+    return True
+
+
+def write_json_outputs(
+    payload: Any,
+    path: Path,
+    aliases: Iterable[Path] = (),
+    compact_variants: bool = False
+) -> List[Path]:
+    """
+    페이로드를 한 번 직렬화해 path와 별칭에 같은 바이트를 저장하고 압축 변형 생성
+
+    Returns:
+        실제로 새로 쓴 경로 목록
+    """
+    path = Path(path)
+    data = json.dumps(payload, ensure_ascii=False, indent=2).encode('utf-8')
+    written: List[Path] = []
+
+    if write_if_changed(path, data):
+        written.append(path)
+        print(f"📁 저장 완료: {path}")
+    else:
+        print(f"📁 변경 없음 (저장 생략): {path}")
+
+    for alias in aliases:
+        if write_if_changed(Path(alias), data):
+            written.append(Path(alias))
+            print(f"📁 별칭 저장: {alias} (= {path.name})")
+        else:
+            print(f"📁 별칭 변경 없음 (저장 생략): {alias}")
+
+    if compact_variants:
+        compact = json.dumps(payload, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+        min_path = path.with_suffix('.min.json')
+        # mtime=0: 내용이 같으면 gzip 바이트도 같아서 재작성 생략 가능
+        gz_path = path.with_suffix('.json.gz')
+        for variant_path, variant_data in (
+            (min_path, compact),
+            (gz_path, gzip.compress(compact, compresslevel=9, mtime=0)),
+        ):
+            if write_if_changed(variant_path, variant_data):
+                written.append(variant_path)
+            print(f"🗜️ 배포용 변형: {variant_path} ({len(variant_data):,} bytes, 원본 {len(data):,})")
+
+    return written
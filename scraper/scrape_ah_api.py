@@ -4,6 +4,7 @@ Albert Heijn 프로모션 API 직접 호출
 """
 import os
 import json
+import sys
 import time
 from pathlib import Path
 from playwright.sync_api import sync_playwright
@@ -11,6 +12,11 @@ from datetime import datetime, timedelta
 
 # 브라우저 경로 설정
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.utils.network_harvest import NetworkHarvester
+from scrapers.utils.request_blocking import RequestBlocker
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -18,8 +24,6 @@ if LOCAL_BROWSERS_PATH.exists():
 def scrape_ah_via_network():
     """네트워크 요청을 캡처하여 AH 프로모션 데이터 추출"""
     url = "https://www.ah.nl/bonus"
-    all_products = []
-    captured_requests = []
     
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True)
@@ -27,26 +31,11 @@ def scrape_ah_via_network():
             user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             viewport={'width': 1920, 'height': 1080}
         )
-        
-        def capture_response(response):
-            """모든 API 응답 캡처"""
-            url_lower = response.url.lower()
-            if any(kw in url_lower for kw in ['graphql', 'promotion', 'bonus', 'product', 'api']):
-                try:
-                    if response.status == 200:
-                        content_type = response.headers.get('content-type', '')
-                        if 'json' in content_type:
-                            body = response.json()
-                            captured_requests.append({
-                                'url': response.url,
-                                'data': body
-                            })
-                            print(f"  📡 API 응답 캡처: {response.url[:80]}...")
-                except Exception as e:
-                    pass
+        # API 응답(XHR/fetch)만 필요하므로 이미지까지 차단
+        blocker = RequestBlocker("Albert Heijn", url, block_images=True).install(context)
         
         page = context.new_page()
-        page.on('response', capture_response)
+        harvester = NetworkHarvester("Albert Heijn").attach(page)
         
         print(f"🔍 Albert Heijn Bonus 페이지 접속 (네트워크 모니터링): {url}")
         page.goto(url, timeout=60000)
@@ -67,30 +56,18 @@ def scrape_ah_via_network():
         for i in range(8):
             page.evaluate("window.scrollBy(0, window.innerHeight)")
             time.sleep(1.5)
-            print(f"  스크롤 {i+1}/8 완료, 캡처된 요청: {len(captured_requests)}개")
+            print(f"  스크롤 {i+1}/8 완료, 캡처된 응답: {len(harvester.responses)}개")
         
         # 추가 대기
         time.sleep(3)
         
+        blocker.report()
         browser.close()
     
-    print(f"\n📊 총 {len(captured_requests)}개의 API 응답 캡처됨")
+    print(f"\n📊 총 {len(harvester.responses)}개의 API 응답 캡처됨")
     
-    # 캡처된 데이터에서 상품 정보 추출
-    for req in captured_requests:
-        products = extract_products_deep(req['data'])
-        if products:
-            print(f"  ✅ {req['url'][:50]}... 에서 {len(products)}개 상품 추출")
-            all_products.extend(products)
-    
-    # 중복 제거
-    seen = set()
-    unique_products = []
-    for p in all_products:
-        key = p['name']
-        if key not in seen:
-            seen.add(key)
-            unique_products.append(p)
+    # 캡처된 응답에서 상품 정보 추출 (엔드포인트 매핑 + 이름 기준 중복 제거)
+    unique_products = harvester.products()
     
     print(f"\n🎯 총 {len(unique_products)}개의 고유 상품 추출")
     
@@ -100,58 +77,6 @@ def scrape_ah_via_network():
     
     return unique_products
 
-def extract_products_deep(data, depth=0):
-    """재귀적으로 데이터 구조 탐색하여 상품 정보 추출"""
-    products = []
-    
-    if depth > 15:
-        return products
-    
-    if isinstance(data, dict):
-        # 상품 정보가 있는지 확인
-        if 'title' in data or 'name' in data:
-            name = data.get('title') or data.get('name')
-            if name and isinstance(name, str) and len(name) > 2:
-                # 가격 정보 추출
-                price = None
-                price_data = data.get('price') or data.get('priceInfo') or data.get('prices')
-                if isinstance(price_data, dict):
-                    amount = price_data.get('amount') or price_data.get('now') or price_data.get('unitPrice')
-                    if amount:
-                        if isinstance(amount, (int, float)):
-                            if amount > 100:  # 센트 단위
-                                price = f"€{amount/100:.2f}"
-                            else:
-                                price = f"€{amount:.2f}"
-                elif isinstance(price_data, (int, float)):
-                    if price_data > 100:
-                        price = f"€{price_data/100:.2f}"
-                    else:
-                        price = f"€{price_data:.2f}"
-                
-                # 할인 정보
-                discount = data.get('discountLabel') or data.get('bonusLabel') or data.get('shield')
-                if isinstance(discount, dict):
-                    discount = discount.get('text') or discount.get('label')
-                
-                products.append({
-                    'name': name,
-                    'price': price,
-                    'discount': discount,
-                    'supermarket': 'Albert Heijn'
-                })
-        
-        # 하위 데이터 탐색
-        for key, value in data.items():
-            if key not in ['__typename', 'id', '__ref']:
-                products.extend(extract_products_deep(value, depth + 1))
-    
-    elif isinstance(data, list):
-        for item in data:
-            products.extend(extract_products_deep(item, depth + 1))
-    
-    return products
-
 def save_results(products):
     """결과 저장"""
     today = datetime.now()
@@ -86,43 +86,7 @@ def scrape_ah_bonus():
         title = page.title()
         print(f"📰 페이지 제목: {title}")
         
-        # 상품 카드 찾기 - AH 사이트 구조에 맞게
-        # 다양한 선택자 시도
-        product_selectors = [
-            '[data-testhook="product-card"]',
-            '[data-testhook="bonus-card"]',
-            'article[class*="product"]',
-            'div[class*="product-card"]',
-            'div[class*="ProductCard"]',
-            'a[href*="/producten/"]',
-        ]
-        
-        found_products = []
-        for selector in product_selectors:
-            elements = soup.select(selector)
-            if elements:
-                print(f"✅ '{selector}' 선택자로 {len(elements)}개 요소 발견")
-                found_products.extend(elements)
-        
-        # 중복 제거
-        seen = set()
-        unique_products = []
-        for elem in found_products:
-            elem_str = str(elem)[:200]
-            if elem_str not in seen:
-                seen.add(elem_str)
-                unique_products.append(elem)
-        
-        print(f"📦 총 {len(unique_products)}개의 고유 상품 요소 발견")
-        
-        # 상품 정보 추출
-        for elem in unique_products[:50]:  # 최대 50개
-            try:
-                product = extract_product_info(elem)
-                if product:
-                    products.append(product)
-            except Exception as e:
-                continue
+        products = extract_products_from_soup(soup)
         
         # 텍스트 기반 검색 (백업)
         if len(products) < 5:
@@ -154,6 +118,51 @@ def scrape_ah_bonus():
     
     return products
 
+def extract_products_from_soup(soup):
+    """
+    저장된/렌더링된 AH Bonus HTML에서 상품 추출
+    (scrapers/replay_bench.py 가 저장된 페이지로 같은 로직을 측정)
+    """
+    # 상품 카드 찾기 - AH 사이트 구조에 맞게
+    # 다양한 선택자 시도
+    product_selectors = [
+        '[data-testhook="product-card"]',
+        '[data-testhook="bonus-card"]',
+        'article[class*="product"]',
+        'div[class*="product-card"]',
+        'div[class*="ProductCard"]',
+        'a[href*="/producten/"]',
+    ]
+    
+    found_products = []
+    for selector in product_selectors:
+        elements = soup.select(selector)
+        if elements:
+            print(f"✅ '{selector}' 선택자로 {len(elements)}개 요소 발견")
+            found_products.extend(elements)
+    
+    # 중복 제거
+    seen = set()
+    unique_products = []
+    for elem in found_products:
+        elem_str = str(elem)[:200]
+        if elem_str not in seen:
+            seen.add(elem_str)
+            unique_products.append(elem)
+    
+    print(f"📦 총 {len(unique_products)}개의 고유 상품 요소 발견")
+    
+    # 상품 정보 추출
+    products = []
+    for elem in unique_products[:50]:  # 최대 50개
+        try:
+            product = extract_product_info(elem)
+            if product:
+                products.append(product)
+        except Exception as e:
+            continue
+    return products
+
 def extract_product_info(elem):
     """상품 요소에서 정보 추출"""
     try:
@@ -18,7 +18,6 @@ Gemini API로 상품 정보를 추출합니다.
 import json
 import os
 import sys
-import re
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
@@ -42,6 +41,10 @@ try:
 except ImportError:
     CONFIG_API_KEY = None
 
+from scraper.gemini_limiter import call_gemini
+from scraper.json_salvage import parse_json_array
+from scraper.jina_cache import fetch_jina_markdown
+
 
 class AHJinaScraper:
     """Albert Heijn 보너스 스크래퍼 (Jina + Gemini)"""
@@ -90,10 +93,7 @@ class AHJinaScraper:
                 'Accept': 'text/plain',
             }
             
-            response = requests.get(jina_url, headers=headers, timeout=60)
-            response.raise_for_status()
-            
-            markdown_text = response.text
+            markdown_text = fetch_jina_markdown(url, headers=headers, timeout=60)
             print(f"✅ 마크다운 데이터 수신 완료 ({len(markdown_text):,} 문자)")
             
             return markdown_text
@@ -150,7 +150,7 @@ class AHJinaScraper:
 ]
 """
 
-        try:
+        def send() -> requests.Response:
             response = requests.post(
                 f"{self.gemini_url}?key={self.gemini_api_key}",
                 headers={"Content-Type": "application/json"},
@@ -164,9 +164,12 @@ class AHJinaScraper:
                 },
                 timeout=120
             )
-            
             response.raise_for_status()
-            result = response.json()
+            return response
+
+        try:
+            # 공용 제한기 경유 (429/503은 Retry-After 반영 후 재시도)
+            result = call_gemini(send).json()
             
             # 응답에서 텍스트 추출
             generated_text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
@@ -185,26 +188,11 @@ class AHJinaScraper:
             return []
     
     def _parse_json_response(self, text: str) -> List[Dict[str, Any]]:
-        """Gemini 응답에서 JSON 배열 추출"""
-        # 코드 블록 제거
-        text = re.sub(r'```json\s*', '', text)
-        text = re.sub(r'```\s*', '', text)
-        text = text.strip()
-        
-        # JSON 배열 찾기
-        match = re.search(r'\[[\s\S]*\]', text)
-        if match:
-            try:
-                return json.loads(match.group())
-            except json.JSONDecodeError:
-                pass
-        
-        # 직접 파싱 시도
-        try:
-            return json.loads(text)
-        except json.JSONDecodeError:
+        """Gemini 응답에서 JSON 배열 추출 (maxOutputTokens로 잘린 응답은 완전한 객체만 복구)"""
+        result = parse_json_array(text, label="AH")
+        if not result.items and not result.complete:
             print(f"⚠️ JSON 파싱 실패, 응답 텍스트:\n{text[:500]}")
-            return []
+        return [item for item in result.items if isinstance(item, dict)]
     
     def scrape_bonus(self, week: str = 'current') -> Dict[str, Any]:
         """
@@ -323,10 +311,7 @@ class JumboJinaScraper:
         print(f"📡 Jina Reader API 호출: {jina_url}")
         
         try:
-            response = requests.get(jina_url, timeout=60)
-            response.raise_for_status()
-            
-            markdown_text = response.text
+            markdown_text = fetch_jina_markdown(url, timeout=60)
             print(f"✅ 마크다운 데이터 수신 완료 ({len(markdown_text):,} 문자)")
             
             return markdown_text
@@ -363,7 +348,7 @@ class JumboJinaScraper:
 **출력 형식 (JSON 배열만):**
 """
 
-        try:
+        def send() -> requests.Response:
             response = requests.post(
                 f"{self.gemini_url}?key={self.gemini_api_key}",
                 headers={"Content-Type": "application/json"},
@@ -376,23 +361,19 @@ class JumboJinaScraper:
                 },
                 timeout=120
             )
-            
             response.raise_for_status()
-            result = response.json()
+            return response
+
+        try:
+            result = call_gemini(send).json()
             
             generated_text = result.get("candidates", [{}])[0].get("content", {}).get("parts", [{}])[0].get("text", "")
             
-            # JSON 파싱
-            text = re.sub(r'```json\s*', '', generated_text)
-            text = re.sub(r'```\s*', '', text).strip()
-            
-            match = re.search(r'\[[\s\S]*\]', text)
-            if match:
-                products = json.loads(match.group())
+            # JSON 파싱 (잘린 응답은 완전한 객체만 복구)
+            products = [item for item in parse_json_array(generated_text, label="Jumbo").items if isinstance(item, dict)]
+            if products:
                 print(f"✅ {len(products)}개 상품 추출 완료")
-                return products
-            
-            return []
+            return products
             
         except Exception as e:
             print(f"❌ Gemini API 오류: {e}")
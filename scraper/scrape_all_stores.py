@@ -8,8 +8,10 @@ Jina Reader + Gemini API를 사용하여 네덜란드 주요 마트들의
 
 🚀 실행 방법:
     python3 scraper/scrape_all_stores.py
+    python3 scraper/scrape_all_stores.py --only-failed   # 실패/누락 마트만 재수집
 
 📁 출력 파일:
+    data/shards/<week>/<주차>/<마트>.json  - 마트별 결과 (완료 즉시 저장)
     data/all_stores_sales.json  - 모든 마트 통합 데이터
     data/current_sales.json     - 앱에서 사용하는 형식
     data/weekly_sales.json      - 기존 호환 형식
@@ -24,13 +26,14 @@ import asyncio
 import aiohttp
 import json
 import os
-import re
+import random
 import sys
 import time
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass, asdict
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, asdict, fields
 
 # 프로젝트 루트 경로
 PROJECT_ROOT = Path(__file__).parent.parent
@@ -44,6 +47,17 @@ try:
 except ImportError:
     GEMINI_API_KEY = None
 
+from scraper.gemini_limiter import call_gemini_async, raise_for_throttle
+from scraper.json_salvage import parse_json_array
+from scraper.jina_cache import get_default_cache
+from scraper.jina_latency import get_latency_history
+from scraper.markdown_chunker import split_markdown_into_chunks, merge_products
+from scraper.markdown_compactor import compact_markdown, CompactionStats
+from scraper.rule_extractor import extract_products_by_rules
+from scraper.result_shards import write_shard, load_shards, stores_needing_rerun
+from scraper.sales_output import write_json_outputs
+from scraper.store_urls import STORE_URLS, week_url
+
 # 환경변수에서도 확인
 if not GEMINI_API_KEY:
     GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
@@ -59,14 +73,10 @@ if not GEMINI_API_KEY:
 # 📋 타겟 마트 설정
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+# URL은 스마트 스케줄러와 공유 (scraper/store_urls.py, Jina 캐시 키가 같아야 함)
 STORES: Dict[str, str] = {
-    "Albert Heijn": "https://www.ah.nl/bonus",
-    "Dirk": "https://www.dirk.nl/aanbiedingen",
-    "Lidl": "https://www.lidl.nl/c/aanbiedingen/a10008785",
-    "ALDI": "https://www.aldi.nl/aanbiedingen.html",
-    "Plus": "https://www.plus.nl/aanbiedingen",
-    "Coop": "https://www.coop.nl/aanbiedingen",
-    "Hoogvliet": "https://www.hoogvliet.com/aanbiedingen",
+    store: STORE_URLS[store]
+    for store in ("Albert Heijn", "Dirk", "Lidl", "ALDI", "Plus", "Coop", "Hoogvliet")
 }
 
 # Jina Reader API 기본 URL
@@ -75,6 +85,19 @@ JINA_BASE_URL = "https://r.jina.ai"
 # Gemini API 설정
 GEMINI_API_URL = "https://generativelanguage.googleapis.com/v1beta/models/gemini-2.0-flash:generateContent"
 
+# 배포용 압축 변형(.min.json, .json.gz) 생성 여부 (--compact-output 으로도 설정)
+COMPACT_OUTPUT = os.getenv("SALES_COMPACT_OUTPUT") == "1"
+
+# Jina 재시도 설정 (시도마다 타임아웃 + 지터를 준 지수 백오프)
+JINA_ATTEMPTS = 3
+JINA_ATTEMPT_TIMEOUT = 90  # 초 (느린 마트 페이지는 수십 초 걸림)
+JINA_BACKOFF_BASE = 2.0    # 초
+JINA_RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# 파이프라인 동시성 설정 (이번 주/다음 주 전체에 걸친 전역 제한)
+JINA_CONCURRENCY = 5  # Jina Reader 동시 요청 수
+GEMINI_WORKERS = 3    # Gemini 파싱 워커 수 (API 동시 호출 제한)
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📦 데이터 클래스
@@ -102,6 +125,42 @@ class StoreResult:
     products: List[Dict[str, Any]]
     error: Optional[str] = None
     scraped_at: str = ""
+    compaction: Optional[Dict[str, Any]] = None  # 마크다운 압축 전후 크기
+    extractor: str = "gemini"  # 상품 추출 방식: rules, gemini
+    rule_confidence: Optional[float] = None
+
+
+def store_result_from_shard(data: Dict[str, Any]) -> Optional[StoreResult]:
+    """샤드 → StoreResult (모르는 키는 버림, 필수 키가 없거나 형식이 틀리면 None)"""
+    known = {field.name for field in fields(StoreResult)}
+    try:
+        result = StoreResult(**{key: value for key, value in data.items() if key in known})
+    except TypeError:
+        return None
+    return result if isinstance(result.products, list) else None
+
+
+@dataclass
+class StageTiming:
+    """마트별 파이프라인 단계 시간 (초)
+
+    wait는 자원(동시 요청 슬롯, Gemini 워커)을 기다린 시간,
+    run은 실제 요청을 처리한 시간입니다.
+    """
+    store: str
+    fetch_wait: float = 0.0
+    fetch_run: float = 0.0
+    parse_wait: float = 0.0
+    parse_run: float = 0.0
+    finished_at: float = 0.0  # 파이프라인 시작 기준 완료 시각
+
+
+@dataclass
+class PipelineResources:
+    """여러 주차 파이프라인이 공유하는 세션과 전역 동시성 제한"""
+    session: aiohttp.ClientSession
+    jina_slots: asyncio.Semaphore
+    gemini_slots: asyncio.Semaphore
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -125,6 +184,15 @@ def get_next_week_dates() -> Tuple[str, str]:
     return next_monday.strftime('%Y-%m-%d'), next_sunday.strftime('%Y-%m-%d')
 
 
+def get_week_number(week_type: str = 'current') -> str:
+    """ISO 주차 문자열 (예: '2025-03')"""
+    if week_type == 'next':
+        monday = datetime.strptime(get_next_week_dates()[0], '%Y-%m-%d')
+    else:
+        monday = datetime.now()
+    return f"{monday.year}-{monday.isocalendar()[1]:02d}"
+
+
 def categorize_product(product_name: str) -> str:
     """상품을 카테고리로 분류 (main/sub/fruits)"""
     name_lower = product_name.lower()
@@ -172,6 +240,67 @@ def print_success(store: str, count: int):
 # 🌐 Jina Reader API 호출 (비동기)
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
+async def request_jina_once(
+    session: aiohttp.ClientSession,
+    jina_url: str,
+    headers: Dict[str, str]
+) -> Tuple[int, str, Dict[str, str]]:
+    """
+    Jina Reader 요청 1회 (JINA_ATTEMPT_TIMEOUT 적용)
+    
+    Returns:
+        (status, text, response_headers)
+    """
+    timeout = aiohttp.ClientTimeout(total=JINA_ATTEMPT_TIMEOUT)
+    async with session.get(jina_url, headers=headers, timeout=timeout) as response:
+        text = await response.text() if response.status == 200 else ""
+        return response.status, text, dict(response.headers)
+
+
+async def request_jina_hedged(
+    session: aiohttp.ClientSession,
+    store: str,
+    jina_url: str,
+    headers: Dict[str, str],
+    hedge_delay: Optional[float]
+) -> Tuple[int, str, Dict[str, str]]:
+    """
+    헤지 요청: hedge_delay가 지나도 응답이 없으면 같은 요청을 하나 더 보내고
+    먼저 성공(200/304)한 응답을 사용 (나머지는 취소)
+    
+    빠른 429/503 응답이 아직 진행 중인 정상 응답을 이기지 않도록, 성공 응답이 없으면
+    모든 요청이 끝날 때까지 기다린 뒤 받은 응답 중 하나(없으면 마지막 예외)를 반환합니다.
+    """
+    if hedge_delay is None:
+        return await request_jina_once(session, jina_url, headers)
+    
+    pending = {asyncio.ensure_future(request_jina_once(session, jina_url, headers))}
+    done, pending = await asyncio.wait(pending, timeout=hedge_delay)
+    if not done:
+        print_progress(f"[{store}] {hedge_delay:.1f}초 동안 응답 없음 → 헤지 요청", "🪝")
+        pending.add(asyncio.ensure_future(request_jina_once(session, jina_url, headers)))
+    
+    fallback: Optional[Tuple[int, str, Dict[str, str]]] = None
+    last_error: Optional[BaseException] = None
+    try:
+        while True:
+            for task in done:
+                if task.exception() is not None:
+                    last_error = task.exception()
+                elif task.result()[0] in (200, 304):
+                    return task.result()
+                elif fallback is None:
+                    fallback = task.result()
+            if not pending:
+                if fallback is not None:
+                    return fallback
+                raise last_error
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in pending:
+            task.cancel()
+
+
 async def fetch_markdown_from_jina(
     session: aiohttp.ClientSession, 
     store: str, 
@@ -180,81 +309,82 @@ async def fetch_markdown_from_jina(
     """
     Jina Reader API를 통해 마크다운 텍스트 가져오기 (비동기)
     
+    일시적 오류(타임아웃, 5xx, 429)는 최대 JINA_ATTEMPTS회까지 지터를 준
+    지수 백오프로 재시도합니다. 응답 시간 꼬리가 긴 마트는 헤지 요청을 보냅니다.
+    
     Returns:
         (store, markdown_text, error)
     """
     # URL 인코딩 (특수문자 처리)
     encoded_url = url
     jina_url = f"{JINA_BASE_URL}/{encoded_url}"
-    
-    try:
-        print_progress(f"[{store}] Jina Reader 요청 중... URL: {url}", "📡")
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-            'Accept': 'text/plain',
-        }
+    cache = get_default_cache()
+    history = get_latency_history()
+    
+    # 캐시 TTL 이내면 업스트림 요청 생략 (스마트 스케줄러 확인 직후 등)
+    cached = cache.get_fresh(url)
+    if cached:
+        print_progress(f"[{store}] Jina 캐시 사용 ({cached.age() / 60:.0f}분 전 수집, {len(cached.body):,}자)", "💾")
+        return store, cached.body, None
+    stale = cache.get(url)
+    
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
+        'Accept': 'text/plain',
+    }
+    if stale:
+        headers.update(stale.conditional_headers())
+    hedge_delay = history.hedge_delay(store)
+    
+    error = None
+    for attempt in range(1, JINA_ATTEMPTS + 1):
+        if attempt > 1:
+            backoff = random.uniform(0, JINA_BACKOFF_BASE * 2 ** (attempt - 1))
+            print_progress(f"[{store}] {backoff:.1f}초 후 재시도 ({attempt}/{JINA_ATTEMPTS}) - {error}", "🔁")
+            await asyncio.sleep(backoff)
         
-        async with session.get(jina_url, headers=headers, timeout=aiohttp.ClientTimeout(total=90)) as response:
-            if response.status == 200:
-                markdown_text = await response.text()
-                # 다음 주 페이지인지 확인 (키워드 체크)
-                if 'volgende-week' in url.lower() or 'next week' in url.lower():
-                    if 'volgende week' in markdown_text.lower() or 'next week' in markdown_text.lower():
-                        print_progress(f"[{store}] 다음 주 세일 정보 확인됨", "✅")
-                    else:
-                        print_progress(f"[{store}] 다음 주 세일 정보가 마크다운에 없을 수 있음", "⚠️")
-                
-                print_progress(f"[{store}] 마크다운 수신 ({len(markdown_text):,}자)", "📥")
-                return store, markdown_text, None
-            else:
-                error = f"HTTP {response.status}"
-                print_error(store, f"{error} - URL: {url}")
-                return store, None, error
-                
-    except asyncio.TimeoutError:
-        error = "요청 시간 초과 (90초)"
-        print_error(store, f"{error} - URL: {url}")
-        return store, None, error
-    except Exception as e:
-        error = str(e)
-        print_error(store, f"{error} - URL: {url}")
-        return store, None, error
-
-
-async def fetch_all_stores_markdown(stores: Dict[str, str]) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
-    """
-    모든 마트의 마크다운을 비동기로 동시에 가져오기
-    
-    Returns:
-        {store: (markdown_text, error)}
-    """
-    print("\n" + "=" * 60)
-    print("📡 Step 1: Jina Reader API로 모든 마트 데이터 동시 수집")
-    print("=" * 60 + "\n")
-    
-    results = {}
-    
-    connector = aiohttp.TCPConnector(limit=5)  # 동시 연결 수 제한
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [
-            fetch_markdown_from_jina(session, store, url)
-            for store, url in stores.items()
-        ]
+        print_progress(f"[{store}] Jina Reader 요청 중... URL: {url}", "📡")
+        started = time.perf_counter()
+        try:
+            status, markdown_text, response_headers = await request_jina_hedged(
+                session, store, jina_url, headers, hedge_delay
+            )
+        except asyncio.TimeoutError:
+            # 느린 꼬리도 헤지 기준에 반영되도록 시간 초과를 중도 절단 표본으로 기록
+            history.record_timeout(store, JINA_ATTEMPT_TIMEOUT)
+            error = f"요청 시간 초과 ({JINA_ATTEMPT_TIMEOUT}초)"
+            continue
+        except aiohttp.ClientError as e:
+            error = str(e) or type(e).__name__
+            continue
+        except Exception as e:
+            error = str(e)
+            break
         
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
+        if status == 304 and stale:
+            history.record(store, time.perf_counter() - started)
+            cache.revalidated(stale, response_headers)
+            print_progress(f"[{store}] Jina 캐시 재검증 (변경 없음, {len(stale.body):,}자)", "💾")
+            return store, stale.body, None
+        elif status == 200:
+            history.record(store, time.perf_counter() - started)
+            cache.store(url, markdown_text, response_headers)
+            # 다음 주 페이지인지 확인 (키워드 체크)
+            if 'volgende-week' in url.lower() or 'next week' in url.lower():
+                if 'volgende week' in markdown_text.lower() or 'next week' in markdown_text.lower():
+                    print_progress(f"[{store}] 다음 주 세일 정보 확인됨", "✅")
+                else:
+                    print_progress(f"[{store}] 다음 주 세일 정보가 마크다운에 없을 수 있음", "⚠️")
+            
+            print_progress(f"[{store}] 마크다운 수신 ({len(markdown_text):,}자)", "📥")
+            return store, markdown_text, None
         
-        for response in responses:
-            if isinstance(response, Exception):
-                continue
-            store, markdown, error = response
-            results[store] = (markdown, error)
-    
-    # 결과 요약
-    success_count = sum(1 for _, (md, _) in results.items() if md)
-    print(f"\n📊 Jina Reader 결과: {success_count}/{len(stores)} 마트 성공")
+        error = f"HTTP {status}"
+        if status not in JINA_RETRY_STATUSES:
+            break
     
-    return results
+    print_error(store, f"{error} - URL: {url}")
+    return store, None, error
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -264,25 +394,64 @@ async def fetch_all_stores_markdown(stores: Dict[str, str]) -> Dict[str, Tuple[O
 async def parse_products_with_gemini(
     session: aiohttp.ClientSession,
     store: str,
-    markdown_text: str
+    markdown_text: str,
+    slots: Optional[asyncio.Semaphore] = None
 ) -> Tuple[str, List[Dict[str, Any]], Optional[str]]:
     """
     Gemini API로 마크다운에서 상품 정보 추출 (비동기)
     
+    긴 마크다운은 상품 블록 경계에서 청크로 나눠 동시에 파싱하고,
+    결과를 병합/중복 제거합니다 (앞부분만 잘라 쓰지 않음).
+    
+    Args:
+        slots: 청크 요청마다 획득할 Gemini 동시성 제한 (없으면 제한 없음)
+    
     Returns:
         (store, products, error)
     """
-    print_progress(f"[{store}] Gemini API로 파싱 중...", "🤖")
+    chunks = split_markdown_into_chunks(markdown_text)
+    print_progress(f"[{store}] Gemini API로 파싱 중... ({len(chunks)}개 청크, {len(markdown_text):,}자)", "🤖")
+    
+    async def run_chunk(index: int, chunk: str) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        label = f"{store} {index}/{len(chunks)}" if len(chunks) > 1 else store
+        if slots is None:
+            return await request_products_from_gemini(session, store, chunk, label)
+        async with slots:
+            return await request_products_from_gemini(session, store, chunk, label)
+    
+    responses = await asyncio.gather(
+        *(run_chunk(index, chunk) for index, chunk in enumerate(chunks, 1))
+    )
     
-    # 텍스트가 너무 길면 자르기 (토큰 제한)
-    max_length = 20000
-    if len(markdown_text) > max_length:
-        markdown_text = markdown_text[:max_length]
+    products = merge_products(chunk_products for chunk_products, _ in responses)
+    errors = [error for _, error in responses if error]
     
+    if products:
+        print_success(store, len(products))
+        if errors:
+            print_progress(f"[{store}] {len(errors)}/{len(chunks)}개 청크 실패 (부분 결과 사용)", "⚠️")
+        return store, products, None
+    
+    print_progress(f"[{store}] 추출된 상품 없음", "⚠️")
+    return store, [], errors[0] if errors else None
+
+
+async def request_products_from_gemini(
+    session: aiohttp.ClientSession,
+    store: str,
+    markdown_text: str,
+    label: str
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    마크다운 청크 하나를 Gemini로 파싱
+    
+    Returns:
+        (products, error)
+    """
     # System Prompt
     prompt = f"""너는 네덜란드 마트 할인 정보를 정리하는 전문가야.
 
-입력된 텍스트는 '{store}' 마트의 할인 페이지를 마크다운으로 변환한 것이야.
+입력된 텍스트는 '{store}' 마트의 할인 페이지를 마크다운으로 변환한 것이야 (페이지의 일부 구간일 수 있어).
 
 이 텍스트에서 할인 상품 정보를 추출해서 JSON 배열로 반환해줘.
 
@@ -308,7 +477,7 @@ async def parse_products_with_gemini(
 
 **출력 (JSON 배열만):**"""
 
-    try:
+    async def send() -> Tuple[int, Dict[str, Any]]:
         async with session.post(
             f"{GEMINI_API_URL}?key={GEMINI_API_KEY}",
             headers={"Content-Type": "application/json"},
@@ -322,133 +491,254 @@ async def parse_products_with_gemini(
             },
             timeout=aiohttp.ClientTimeout(total=120)
         ) as response:
+            # 429/503은 공용 제한기가 Retry-After를 반영해 재시도
+            raise_for_throttle(response.status, response.headers)
             if response.status != 200:
-                error = f"Gemini API HTTP {response.status}"
-                print_error(store, error)
-                return store, [], error
-            
-            result = await response.json()
-            
-            # 응답에서 텍스트 추출
-            generated_text = (
-                result.get("candidates", [{}])[0]
-                .get("content", {})
-                .get("parts", [{}])[0]
-                .get("text", "")
-            )
-            
-            # JSON 파싱
-            products = parse_json_response(generated_text)
-            
-            if products:
-                print_success(store, len(products))
-            else:
-                print_progress(f"[{store}] 추출된 상품 없음", "⚠️")
-            
-            return store, products, None
+                return response.status, {}
+            return response.status, await response.json()
+
+    try:
+        status, result = await call_gemini_async(send)
+        if status != 200:
+            error = f"Gemini API HTTP {status}"
+            print_error(label, error)
+            return [], error
+        
+        # 응답에서 텍스트 추출
+        generated_text = (
+            result.get("candidates", [{}])[0]
+            .get("content", {})
+            .get("parts", [{}])[0]
+            .get("text", "")
+        )
+        
+        # JSON 파싱
+        return parse_json_response(generated_text, label=label), None
             
     except asyncio.TimeoutError:
         error = "Gemini API 시간 초과 (120초)"
-        print_error(store, error)
-        return store, [], error
+        print_error(label, error)
+        return [], error
     except Exception as e:
         error = str(e)
-        print_error(store, error)
-        return store, [], error
+        print_error(label, error)
+        return [], error
 
 
-def parse_json_response(text: str) -> List[Dict[str, Any]]:
-    """Gemini 응답에서 JSON 배열 추출"""
-    # 코드 블록 제거
-    text = re.sub(r'```json\s*', '', text)
-    text = re.sub(r'```\s*', '', text)
-    text = text.strip()
-    
-    # JSON 배열 찾기
-    match = re.search(r'\[[\s\S]*\]', text)
-    if match:
-        try:
-            return json.loads(match.group())
-        except json.JSONDecodeError:
-            pass
-    
-    # 직접 파싱 시도
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        return []
+def parse_json_response(text: str, label: str = '') -> List[Dict[str, Any]]:
+    """Gemini 응답에서 JSON 배열 추출 (maxOutputTokens로 잘린 응답은 완전한 객체만 복구)"""
+    return [item for item in parse_json_array(text, label=label).items if isinstance(item, dict)]
 
 
-async def parse_all_stores_with_gemini(
-    markdown_results: Dict[str, Tuple[Optional[str], Optional[str]]]
-) -> Dict[str, StoreResult]:
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+# 🔀 Jina → Gemini 스트리밍 파이프라인
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+@asynccontextmanager
+async def open_pipeline_resources() -> AsyncIterator[PipelineResources]:
+    """공유 세션(커넥션 풀)과 전역 Jina/Gemini 동시성 제한 생성"""
+    connector = aiohttp.TCPConnector(limit=JINA_CONCURRENCY + GEMINI_WORKERS)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        yield PipelineResources(
+            session=session,
+            jina_slots=asyncio.Semaphore(JINA_CONCURRENCY),
+            gemini_slots=asyncio.Semaphore(GEMINI_WORKERS)
+        )
+
+
+async def run_store_pipeline(
+    stores: Dict[str, str],
+    resources: PipelineResources,
+    label: str = "",
+    on_result: Optional[Callable[[StoreResult], None]] = None
+) -> Tuple[Dict[str, StoreResult], Dict[str, StageTiming]]:
     """
-    모든 마트의 마크다운을 Gemini로 파싱 (비동기)
+    마크다운이 도착하는 즉시 Gemini 파싱을 시작하는 생산자/소비자 파이프라인
+
+    각 마트의 Jina 응답은 큐에 바로 들어가고, GEMINI_WORKERS개의 워커가
+    큐에서 꺼내 파싱합니다. 느린 마트 하나가 다른 마트의 파싱을 막지 않습니다.
+    동시 요청 수는 resources의 전역 제한을 따르므로 여러 주차를 함께
+    실행해도 Jina/Gemini 예산은 하나입니다.
+
+    Args:
+        on_result: 마트 하나가 끝날 때마다 호출 (샤드 저장 등)
+
+    Returns:
+        ({store: StoreResult}, {store: StageTiming})
     """
     print("\n" + "=" * 60)
-    print("🤖 Step 2: Gemini API로 상품 정보 추출")
+    print(f"🔀 Step 1-2: Jina Reader 수집 → Gemini 파싱 (파이프라인) {label}".rstrip())
     print("=" * 60 + "\n")
-    
-    results = {}
-    
-    # 마크다운이 있는 마트만 처리
-    stores_with_data = {
-        store: markdown 
-        for store, (markdown, error) in markdown_results.items() 
-        if markdown
-    }
-    
-    if not stores_with_data:
-        print("⚠️ 파싱할 데이터가 없습니다.")
-        return results
-    
-    connector = aiohttp.TCPConnector(limit=3)  # Gemini API 동시 호출 제한
-    async with aiohttp.ClientSession(connector=connector) as session:
-        tasks = [
-            parse_products_with_gemini(session, store, markdown)
-            for store, markdown in stores_with_data.items()
-        ]
-        
-        responses = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        for response in responses:
-            if isinstance(response, Exception):
-                continue
-            store, products, error = response
-            results[store] = StoreResult(
-                store=store,
-                success=len(products) > 0,
-                products=products,
-                error=error,
-                scraped_at=datetime.now().isoformat()
+
+    results: Dict[str, StoreResult] = {}
+    compactions: Dict[str, CompactionStats] = {}
+    rule_confidences: Dict[str, float] = {}
+    timings: Dict[str, StageTiming] = {store: StageTiming(store=store) for store in stores}
+    queue: asyncio.Queue = asyncio.Queue()
+    session = resources.session
+    pipeline_start = time.perf_counter()
+
+    def finish(
+        store: str,
+        products: List[Dict[str, Any]],
+        error: Optional[str],
+        extractor: str = "gemini"
+    ):
+        results[store] = StoreResult(
+            store=store,
+            success=len(products) > 0,
+            products=products,
+            error=error,
+            scraped_at=datetime.now().isoformat(),
+            compaction=compactions[store].to_dict() if store in compactions else None,
+            extractor=extractor,
+            rule_confidence=rule_confidences.get(store)
+        )
+        timings[store].finished_at = time.perf_counter() - pipeline_start
+        if on_result:
+            try:
+                on_result(results[store])
+            except Exception as e:
+                print_error(store, f"결과 저장 실패 - {e}")
+
+    async def produce(store: str, url: str):
+        """Jina 마크다운 수집 후 큐에 전달"""
+        timing = timings[store]
+        wait_start = time.perf_counter()
+        async with resources.jina_slots:
+            run_start = time.perf_counter()
+            timing.fetch_wait = run_start - wait_start
+            _, markdown, error = await fetch_markdown_from_jina(session, store, url)
+            timing.fetch_run = time.perf_counter() - run_start
+
+        if markdown:
+            # Gemini 입력 토큰 절감: 링크/이미지/보일러플레이트 제거
+            markdown, stats = compact_markdown(markdown, store)
+            compactions[store] = stats
+            print_progress(
+                f"[{store}] 마크다운 압축 {stats.before_chars:,}자 → {stats.after_chars:,}자 "
+                f"(~{stats.before_tokens:,} → ~{stats.after_tokens:,} 토큰, {stats.saved_ratio:.0%} 절감)",
+                "🗜️"
             )
-    
-    # 실패한 마트 결과 추가
-    for store, (markdown, error) in markdown_results.items():
+
+            # 구조가 규칙적인 페이지는 Gemini 없이 바로 완료
+            extraction = extract_products_by_rules(markdown)
+            rule_confidences[store] = extraction.confidence
+            if extraction.is_confident:
+                print_progress(
+                    f"[{store}] 규칙 기반 추출 {len(extraction.products)}개 "
+                    f"(신뢰도 {extraction.confidence:.2f}) - Gemini 생략", "⚡"
+                )
+                print_success(store, len(extraction.products))
+                finish(store, extraction.products, None, extractor="rules")
+                return
+            print_progress(f"[{store}] 규칙 기반 신뢰도 낮음 ({extraction.confidence:.2f}) → Gemini 파싱", "🔎")
+
+            await queue.put((store, markdown, time.perf_counter()))
+        else:
+            finish(store, [], error or "Jina Reader 실패")
+
+    async def consume():
+        """큐에서 마크다운을 꺼내 Gemini로 파싱"""
+        while True:
+            item = await queue.get()
+            try:
+                if item is None:
+                    return
+                store, markdown, enqueued_at = item
+                timing = timings[store]
+                run_start = time.perf_counter()
+                timing.parse_wait = run_start - enqueued_at
+                try:
+                    _, products, error = await parse_products_with_gemini(
+                        session, store, markdown, slots=resources.gemini_slots
+                    )
+                except Exception as e:
+                    products, error = [], str(e)
+                timing.parse_run = time.perf_counter() - run_start
+                finish(store, products, error)
+            finally:
+                queue.task_done()
+
+    workers = [asyncio.create_task(consume()) for _ in range(GEMINI_WORKERS)]
+
+    await asyncio.gather(
+        *(produce(store, url) for store, url in stores.items()),
+        return_exceptions=True
+    )
+
+    # 생산 종료 신호
+    for _ in workers:
+        await queue.put(None)
+    await asyncio.gather(*workers)
+
+    # 예외로 결과가 없는 마트 처리
+    for store in stores:
         if store not in results:
-            results[store] = StoreResult(
-                store=store,
-                success=False,
-                products=[],
-                error=error or "Jina Reader 실패",
-                scraped_at=datetime.now().isoformat()
-            )
-    
-    return results
+            finish(store, [], "파이프라인 오류")
+
+    get_latency_history().save()
+    print_stage_timings(timings, label)
+    print_compaction_summary(compactions, label)
+    return results, timings
+
+
+def print_stage_timings(timings: Dict[str, StageTiming], label: str = ""):
+    """마트별 단계 시간과 크리티컬 패스 출력"""
+    print(f"\n⏱️ 단계별 소요 시간 (대기/실행, 초) {label}".rstrip())
+    print(f"   {'마트':<14}{'Jina 대기':>10}{'Jina 실행':>10}{'파싱 대기':>10}{'파싱 실행':>10}{'완료':>8}")
+    for t in sorted(timings.values(), key=lambda t: t.finished_at):
+        print(
+            f"   {t.store:<14}{t.fetch_wait:>10.1f}{t.fetch_run:>10.1f}"
+            f"{t.parse_wait:>10.1f}{t.parse_run:>10.1f}{t.finished_at:>8.1f}"
+        )
+
+    if timings:
+        critical = max(timings.values(), key=lambda t: t.finished_at)
+        print(
+            f"🧭 크리티컬 패스: [{critical.store}] {critical.finished_at:.1f}초 "
+            f"(Jina {critical.fetch_wait + critical.fetch_run:.1f}초 → "
+            f"Gemini {critical.parse_wait + critical.parse_run:.1f}초)"
+        )
+
+
+def print_compaction_summary(compactions: Dict[str, CompactionStats], label: str = ""):
+    """마트별 마크다운 압축 결과와 합계 출력"""
+    if not compactions:
+        return
+
+    print(f"\n🗜️ 마크다운 압축 (문자 / 추정 토큰) {label}".rstrip())
+    for store, stats in compactions.items():
+        print(
+            f"   {store:<14}{stats.before_chars:>9,} → {stats.after_chars:>8,}자"
+            f"{stats.before_tokens:>9,} → {stats.after_tokens:>8,} 토큰  {stats.saved_ratio:>4.0%} 절감"
+        )
+
+    before = sum(stats.before_tokens for stats in compactions.values())
+    after = sum(stats.after_tokens for stats in compactions.values())
+    saved = 1 - after / before if before else 0.0
+    print(f"   합계: ~{before:,} → ~{after:,} 토큰 ({saved:.0%} 절감)")
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📁 결과 저장
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def save_results(store_results: Dict[str, StoreResult], week_type: str = 'current') -> Dict[str, Any]:
+def save_results(
+    store_results: Dict[str, StoreResult],
+    week_type: str = 'current',
+    compact_variants: Optional[bool] = None
+) -> Dict[str, Any]:
     """
     결과를 JSON 파일로 저장
     
     Args:
         store_results: 마트별 스크래핑 결과
         week_type: 'current' (이번 주) 또는 'next' (다음 주)
+        compact_variants: 배포용 .min.json / .json.gz 함께 생성 (기본: COMPACT_OUTPUT)
     """
+    if compact_variants is None:
+        compact_variants = COMPACT_OUTPUT
     print("\n" + "=" * 60)
     print(f"💾 Step 3: 결과 저장 ({week_type} week)")
     print("=" * 60 + "\n")
@@ -458,8 +748,6 @@ def save_results(store_results: Dict[str, StoreResult], week_type: str = 'curren
     else:
         start_date, end_date = get_week_dates()
     
-    today = datetime.now()
-    
     # 모든 상품 수집
     all_products = []
     successful_stores = []
@@ -494,12 +782,7 @@ def save_results(store_results: Dict[str, StoreResult], week_type: str = 'curren
             failed_stores.append(store)
     
     # 통합 결과
-    if week_type == 'next':
-        # 다음 주의 주차 계산
-        next_monday = datetime.strptime(start_date, '%Y-%m-%d')
-        week_number = f"{next_monday.year}-{next_monday.isocalendar()[1]:02d}"
-    else:
-        week_number = f"{today.year}-{today.isocalendar()[1]:02d}"
+    week_number = get_week_number(week_type)
     
     combined_result = {
         'scraped_at': datetime.now().isoformat(),
@@ -523,38 +806,34 @@ def save_results(store_results: Dict[str, StoreResult], week_type: str = 'curren
                 'success': result.success,
                 'product_count': len(result.products),
                 'error': result.error,
+                'compaction': result.compaction,
+                'extractor': result.extractor,
+                'rule_confidence': result.rule_confidence,
                 'products': result.products
             }
             for store, result in store_results.items()
         }
     }
     
-    # 파일 저장
+    # 파일 저장 (한 번 직렬화, 원자적 저장, 내용이 같으면 생략)
     if week_type == 'next':
         # 다음 주 데이터 저장
-        next_sales_path = DATA_DIR / "next_sales.json"
-        with open(next_sales_path, 'w', encoding='utf-8') as f:
-            json.dump(combined_result, f, ensure_ascii=False, indent=2)
-        print(f"📁 저장 완료: {next_sales_path}")
+        write_json_outputs(
+            combined_result, DATA_DIR / "next_sales.json",
+            compact_variants=compact_variants
+        )
     else:
         # 이번 주 데이터 저장
         # 1. 상세 결과
-        all_stores_path = DATA_DIR / "all_stores_sales.json"
-        with open(all_stores_path, 'w', encoding='utf-8') as f:
-            json.dump(detailed_result, f, ensure_ascii=False, indent=2)
-        print(f"📁 저장 완료: {all_stores_path}")
+        write_json_outputs(detailed_result, DATA_DIR / "all_stores_sales.json")
         
         # 2. 앱용 통합 결과 (current_sales.json)
-        current_sales_path = DATA_DIR / "current_sales.json"
-        with open(current_sales_path, 'w', encoding='utf-8') as f:
-            json.dump(combined_result, f, ensure_ascii=False, indent=2)
-        print(f"📁 저장 완료: {current_sales_path}")
-        
-        # 3. 기존 호환용 (weekly_sales.json)
-        weekly_sales_path = DATA_DIR / "weekly_sales.json"
-        with open(weekly_sales_path, 'w', encoding='utf-8') as f:
-            json.dump(combined_result, f, ensure_ascii=False, indent=2)
-        print(f"📁 저장 완료: {weekly_sales_path}")
+        # 3. 기존 호환용 (weekly_sales.json) - 같은 바이트의 별도 복사본
+        write_json_outputs(
+            combined_result, DATA_DIR / "current_sales.json",
+            aliases=[DATA_DIR / "weekly_sales.json"],
+            compact_variants=compact_variants
+        )
     
     return combined_result
 
@@ -563,13 +842,25 @@ def save_results(store_results: Dict[str, StoreResult], week_type: str = 'curren
 # 🚀 메인 실행
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-async def scrape_week(week_type: str = 'current') -> Dict[str, Any]:
+async def scrape_week(
+    week_type: str = 'current',
+    resources: Optional[PipelineResources] = None,
+    only_failed: bool = False
+) -> Dict[str, Any]:
     """
     특정 주차의 세일 데이터 스크래핑
     
+    마트별 결과는 끝나는 즉시 샤드로 저장하고, 통합 파일은 샤드를 모아 만듭니다.
+    
     Args:
         week_type: 'current' (이번 주) 또는 'next' (다음 주)
+        resources: 공유 세션/동시성 제한 (없으면 이 주차 전용으로 생성)
+        only_failed: 샤드가 없거나 실패한 마트만 다시 수집
     """
+    if resources is None:
+        async with open_pipeline_resources() as own_resources:
+            return await scrape_week(week_type, own_resources, only_failed)
+
     start_time = time.time()
     
     print("\n" + "=" * 60)
@@ -584,29 +875,53 @@ async def scrape_week(week_type: str = 'current') -> Dict[str, Any]:
     if week_type == 'next':
         # 다음 주 URL로 변환 (가능한 경우)
         next_week_urls = {}
-        for store, url in STORES.items():
-            # AH는 다음 주 URL이 다름 (명시적으로 설정)
-            if store == "Albert Heijn":
-                next_week_urls[store] = "https://www.ah.nl/bonus/volgende-week"
+        for store in STORES:
+            next_week_urls[store] = week_url(store, 'next')
+            if next_week_urls[store] != STORES[store]:
                 print_progress(f"[{store}] 다음 주 URL: {next_week_urls[store]}", "🔗")
-            # 다른 마트는 URL에 "volgende-week" 추가 시도
-            elif "aanbiedingen" in url:
-                # URL 끝에 /volgende-week 추가
-                next_week_urls[store] = url.rstrip('/') + "/volgende-week"
-                print_progress(f"[{store}] 다음 주 URL: {next_week_urls[store]}", "🔗")
-            else:
-                # 기본 URL 유지
-                next_week_urls[store] = url
         stores_to_scrape = next_week_urls
         print(f"\n📋 다음 주 크롤링 대상 URL:")
         for store, url in stores_to_scrape.items():
             print(f"   - {store}: {url}")
     
-    # Step 1: Jina Reader로 마크다운 가져오기 (비동기)
-    markdown_results = await fetch_all_stores_markdown(stores_to_scrape)
-    
-    # Step 2: Gemini로 파싱 (비동기)
-    store_results = await parse_all_stores_with_gemini(markdown_results)
+    week_number = get_week_number(week_type)
+    if only_failed:
+        # 형식이 맞지 않는 샤드(예: 이전 버전)도 다시 수집
+        shards = load_shards(week_type, week_number)
+        failed = set(stores_needing_rerun(week_type, week_number, stores_to_scrape))
+        rerun = [
+            store for store in stores_to_scrape
+            if store in failed or store_result_from_shard(shards[store]) is None
+        ]
+        skipped = [store for store in stores_to_scrape if store not in rerun]
+        if skipped:
+            print_progress(f"이미 성공한 마트 건너뜀: {', '.join(skipped)}", "⏭️")
+        stores_to_scrape = {store: stores_to_scrape[store] for store in rerun}
+    
+    # Step 1-2: Jina Reader 수집 → Gemini 파싱 (파이프라인, 마트별 샤드 즉시 저장)
+    pipeline_results: Dict[str, StoreResult] = {}
+    if stores_to_scrape:
+        pipeline_results, _ = await run_store_pipeline(
+            stores_to_scrape, resources, label=f"[{week_type} week]",
+            on_result=lambda result: write_shard(week_type, week_number, asdict(result))
+        )
+    else:
+        print_progress("다시 수집할 마트 없음 - 샤드로 통합 파일만 재생성", "✅")
+    
+    # 샤드 + 이번 실행 결과로 통합 (샤드 저장에 실패한 마트는 메모리 결과 사용)
+    shards = load_shards(week_type, week_number)
+    store_results: Dict[str, StoreResult] = {}
+    for store in STORES:
+        shard_result = store_result_from_shard(shards[store]) if store in shards else None
+        if store in pipeline_results:
+            store_results[store] = pipeline_results[store]
+        elif shard_result:
+            store_results[store] = shard_result
+        elif store in shards:
+            print_progress(f"[{store}] 샤드 형식 오류 - 실패로 처리", "⚠️")
+            store_results[store] = StoreResult(store=store, success=False, products=[], error="샤드 형식 오류")
+        else:
+            store_results[store] = StoreResult(store=store, success=False, products=[], error="결과 없음")
     
     # Step 3: 결과 저장
     final_result = save_results(store_results, week_type)
@@ -626,7 +941,7 @@ async def scrape_week(week_type: str = 'current') -> Dict[str, Any]:
     return final_result
 
 
-async def main():
+async def main(only_failed: bool = False):
     """메인 비동기 실행 함수 (이번 주 + 다음 주 모두)"""
     total_start_time = time.time()
     
@@ -637,11 +952,12 @@ async def main():
     print(f"🏪 타겟 마트: {', '.join(STORES.keys())}")
     print("=" * 70)
     
-    # 이번 주 스크래핑
-    current_result = await scrape_week('current')
-    
-    # 다음 주 스크래핑
-    next_result = await scrape_week('next')
+    # 이번 주 + 다음 주 동시 스크래핑 (하나의 세션과 전역 동시성 제한 공유)
+    async with open_pipeline_resources() as resources:
+        current_result, next_result = await asyncio.gather(
+            scrape_week('current', resources, only_failed),
+            scrape_week('next', resources, only_failed)
+        )
     
     # 전체 요약
     total_elapsed = time.time() - total_start_time
@@ -661,10 +977,24 @@ async def main():
     }
 
 
-def run():
+def run(only_failed: bool = False):
     """동기 실행 래퍼 (비개발자용)"""
-    return asyncio.run(main())
+    return asyncio.run(main(only_failed))
 
 
 if __name__ == "__main__":
-    run()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="네덜란드 마트 통합 할인 정보 스크래퍼")
+    parser.add_argument(
+        '--only-failed', action='store_true',
+        help='샤드가 없거나 실패한 마트만 다시 수집한 뒤 통합 파일 재생성'
+    )
+    parser.add_argument(
+        '--compact-output', action='store_true',
+        help='배포용 .min.json / .json.gz 변형도 함께 생성'
+    )
+    args = parser.parse_args()
+    if args.compact_output:
+        COMPACT_OUTPUT = True
+    run(only_failed=args.only_failed)
@@ -7,6 +7,7 @@ import json
 import time
 import base64
 import re
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
@@ -17,6 +18,12 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.utils.vision_cache import get_vision_cache
+from scraper.gemini_limiter import call_gemini
+from scraper.json_salvage import parse_json_array
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -25,8 +32,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -168,9 +173,15 @@ def validate_products(products, supermarket_name):
 
 def analyze_image(image_path, supermarket_name, slug):
     """Gemini Vision으로 이미지 분석 (개선 버전)"""
+    # 같은 세일 주차에 거의 같은 전단지를 이미 분석했으면 그 결과 사용 (지각 해시)
+    cache = get_vision_cache(f"reclamefolder_{slug}", week=get_next_monday().strftime('%Y-%m-%d'))
     try:
-        with open(image_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
+        raw_image = Path(image_path).read_bytes()
+        cached = cache.lookup(raw_image)
+        if cached:
+            print(f"  ♻️ 캐시 적중: {len(cached)}개 상품, AI 분석 생략")
+            return cached
+        image_data = base64.b64encode(raw_image).decode('utf-8')
         
         prompt = f"""이 이미지는 네덜란드 슈퍼마켓 **{supermarket_name}**의 세일 전단지입니다.
 
@@ -200,7 +211,7 @@ def analyze_image(image_path, supermarket_name, slug):
 ]
 ```"""
 
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -211,20 +222,10 @@ def analyze_image(image_path, supermarket_name, slug):
                     ]
                 )
             ]
-        )
-        
-        response_text = response.text.strip()
+        ))
         
-        # JSON 추출
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(1)
-        elif response_text.startswith('```'):
-            response_text = response_text.strip('`').strip()
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
-        
-        products_data = json.loads(response_text)
+        # JSON 추출 (잘린 응답은 완전한 객체만 사용)
+        products_data = parse_json_array(response.text, label=supermarket_name).items
         
         products = []
         for item in products_data:
@@ -240,6 +241,9 @@ def analyze_image(image_path, supermarket_name, slug):
                         'supermarket': supermarket_name
                     })
         
+        if products:
+            cache.store(raw_image, products)
+            cache.save()
         return products
         
     except Exception as e:
@@ -303,10 +307,6 @@ def main():
             successful_markets.append(name)
         else:
             failed_markets.append(name)
-        
-        # API 제한 방지를 위해 대기 (중요!)
-        print("⏳ 다음 마트 대기 중...")
-        time.sleep(8)  # 더 긴 대기 시간
     
     # 결과 저장
     if all_products:
@@ -21,7 +21,6 @@ Gemini API 사용량을 최소화하기 위해 불필요한 스크래핑을 방
 import json
 import sys
 import time
-import requests
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
@@ -29,6 +28,10 @@ from typing import Dict, List, Tuple, Optional
 PROJECT_ROOT = Path(__file__).parent.parent
 DATA_DIR = PROJECT_ROOT / "data"
 
+sys.path.insert(0, str(PROJECT_ROOT))
+from scraper.jina_cache import fetch_jina_markdown
+from scraper.store_urls import STORE_URLS, week_url
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 📋 마트별 세일 시작일 설정
@@ -48,31 +51,22 @@ STORE_SALE_START_DAY: Dict[str, int] = {
 # 요일 이름 매핑
 WEEKDAY_NAMES = ['월요일', '화요일', '수요일', '목요일', '금요일', '토요일', '일요일']
 
-# 마트별 URL (세일 정보 확인용)
-STORE_URLS: Dict[str, str] = {
-    'Albert Heijn': 'https://www.ah.nl/bonus',
-    'ALDI': 'https://www.aldi.nl/aanbiedingen.html',
-    'Plus': 'https://www.plus.nl/aanbiedingen',
-    'Hoogvliet': 'https://www.hoogvliet.com/aanbiedingen',
-    'Coop': 'https://www.coop.nl/aanbiedingen',
-    'Jumbo': 'https://www.jumbo.com/aanbiedingen',
-    'Dirk': 'https://www.dirk.nl/aanbiedingen',
-    'Lidl': 'https://www.lidl.nl/c/aanbiedingen',
-}
-
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 # 🔍 세일 정보 업데이트 확인
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 
-def check_sale_info_updated(store_name: str, week_type: str = 'current', max_retries: int = 3) -> Tuple[bool, str]:
+def check_sale_info_updated(store_name: str, week_type: str = 'current', max_retries: int = 3, revalidate: bool = False) -> Tuple[bool, str]:
     """
     세일 정보가 웹사이트에 업데이트되었는지 확인
     
+    Jina 캐시를 공유하므로 확인 직후의 실제 스크래핑은 업스트림을 다시 호출하지 않습니다.
+    
     Args:
         store_name: 마트 이름
         week_type: 'current' 또는 'next'
         max_retries: 최대 재시도 횟수
+        revalidate: True면 캐시 TTL을 무시하고 항상 업스트림에 재검증
     
     Returns:
         (is_updated, message)
@@ -80,24 +74,15 @@ def check_sale_info_updated(store_name: str, week_type: str = 'current', max_ret
     if store_name not in STORE_URLS:
         return True, "URL 정보 없음 (스킵)"
     
-    url = STORE_URLS[store_name]
-    
-    # 다음 주 확인을 위한 URL 변환
-    if week_type == 'next':
-        if store_name == 'Albert Heijn':
-            url = 'https://www.ah.nl/bonus/volgende-week'
-        elif 'aanbiedingen' in url:
-            url = url.rstrip('/') + '/volgende-week'
-    
-    # Jina Reader로 간단히 확인
-    jina_url = f"https://r.jina.ai/{url}"
+    # 파이프라인과 같은 URL (Jina 캐시 항목 공유)
+    url = week_url(store_name, week_type)
     
+    # Jina Reader로 간단히 확인 (재시도는 캐시를 건너뛰고 재검증)
     for attempt in range(max_retries):
         try:
-            response = requests.get(jina_url, timeout=15)
-            if response.status_code == 200:
-                content = response.text.lower()
-                
+            max_age = 0 if (revalidate or attempt > 0) else None
+            content = fetch_jina_markdown(url, timeout=15, max_age=max_age).lower()
+            if content:
                 # 세일 정보가 있는지 확인 (날짜, 상품명 등)
                 today = datetime.now()
                 if week_type == 'next':
@@ -166,7 +151,7 @@ def wait_for_sale_update(store_name: str, week_type: str = 'current', max_wait_m
             return False, f"최대 대기 시간({max_wait_minutes}분) 초과"
         
         check_count += 1
-        is_updated, message = check_sale_info_updated(store_name, week_type, max_retries=1)
+        is_updated, message = check_sale_info_updated(store_name, week_type, max_retries=1, revalidate=True)
         
         print(f"   [{check_count}회 확인] {message}")
         
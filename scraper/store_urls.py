@@ -0,0 +1,37 @@
+"""
+마트별 세일 페이지 URL (단일 정의)
+
+Jina 캐시는 타겟 URL을 키로 쓰므로, 스마트 스케줄러의 업데이트 확인과
+scrape_all_stores 파이프라인이 같은 URL을 써야 캐시 항목을 공유합니다.
+두 곳 모두 이 모듈의 STORE_URLS / week_url 을 사용합니다.
+"""
+
+from typing import Dict
+
+STORE_URLS: Dict[str, str] = {
+    'Albert Heijn': 'https://www.ah.nl/bonus',
+    'Dirk': 'https://www.dirk.nl/aanbiedingen',
+    'Lidl': 'https://www.lidl.nl/c/aanbiedingen/a10008785',
+    'ALDI': 'https://www.aldi.nl/aanbiedingen.html',
+    'Plus': 'https://www.plus.nl/aanbiedingen',
+    'Coop': 'https://www.coop.nl/aanbiedingen',
+    'Hoogvliet': 'https://www.hoogvliet.com/aanbiedingen',
+    'Jumbo': 'https://www.jumbo.com/aanbiedingen',
+}
+
+# AH는 다음 주 페이지 주소가 규칙과 다름
+NEXT_WEEK_URLS: Dict[str, str] = {
+    'Albert Heijn': 'https://www.ah.nl/bonus/volgende-week',
+}
+
+
+def week_url(store: str, week_type: str = 'current') -> str:
+    """마트의 이번 주/다음 주 세일 페이지 URL (다음 주는 가능하면 /volgende-week)"""
+    url = STORE_URLS[store]
+    if week_type != 'next':
+        return url
+    if store in NEXT_WEEK_URLS:
+        return NEXT_WEEK_URLS[store]
+    if 'aanbiedingen' in url:
+        return url.rstrip('/') + '/volgende-week'
+    return url
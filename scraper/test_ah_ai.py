@@ -6,6 +6,7 @@ import json
 import time
 import base64
 import re
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
@@ -16,6 +17,10 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scraper.gemini_limiter import call_gemini
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -24,8 +29,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -107,7 +110,7 @@ def analyze_image(image_path):
 JSON 배열로만 응답 (다른 텍스트 없이):
 [{"name": "상품명", "price": "€X.XX", "discount": "할인조건"}]"""
 
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -118,7 +121,7 @@ JSON 배열로만 응답 (다른 텍스트 없이):
                     ]
                 )
             ]
-        )
+        ))
         
         response_text = response.text.strip()
         
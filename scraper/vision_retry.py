@@ -0,0 +1,165 @@
+"""
+Vision 분석 재시도 실행기
+
+재귀 호출 + 고정 sleep 대신, 한 번 만든 요청(인코딩된 이미지 포함)을
+시도별 시간 제한, 전체 시간 제한, 지수 대기 + 지터로 반복합니다.
+
+요청은 비동기 클라이언트(client.aio.models.generate_content)로 보내므로 시간 초과 시
+실제 호출도 취소됩니다 (스레드에서 돌던 호출이 뒤에 남아 토큰이 두 번 과금되지 않음).
+호출 간격과 429 정지는 공용 Gemini 제한기가 맡고, 재시도 여부는 이 실행기만 결정합니다.
+request 안에서 call_gemini/call_gemini_async로 다시 감싸면 재시도가 겹치므로 감싸지 않습니다.
+
+오류 분류:
+- quota:   429/503, RESOURCE_EXHAUSTED → 공용 제한기 정지(Retry-After/지수 대기) 후 재요청
+- network: 타임아웃/연결 오류/5xx      → 대기 후 재요청
+- parse:   응답은 왔지만 파싱 실패     → 재요청하지 않고 salvage 함수로 복구 (없으면 실패)
+- empty:   정상 응답인데 상품 없음     → retry_empty=True일 때만 재요청
+- fatal:   그 밖의 오류(잘못된 요청 등) → 즉시 중단
+
+잘린 JSON 응답은 parse 단계에서 scraper.json_salvage.parse_json_array 가
+완전한 객체만 살려 주므로 재요청하지 않습니다.
+
+사용 예:
+    async def request():
+        return (await aio_client.models.generate_content(...)).text
+
+    products = run_vision_request_sync(
+        request,
+        parse=lambda text: parse_products(parse_json_array(text).items),
+        label="Dirk",
+    )
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+from scraper.gemini_limiter import AdaptiveRateLimiter, get_gemini_limiter, throttle_info
+
+T = TypeVar('T')
+
+ERROR_QUOTA = 'quota'
+ERROR_NETWORK = 'network'
+ERROR_PARSE = 'parse'
+ERROR_EMPTY = 'empty'
+ERROR_FATAL = 'fatal'
+
+
+@dataclass
+class RetryPolicy:
+    """재시도 한도/대기 설정"""
+    attempts: int = 3
+    attempt_timeout: float = 90.0    # 요청 한 번의 상한 (초)
+    total_timeout: float = 240.0     # 모든 시도 + 대기의 상한 (초)
+    base_delay: float = 2.0
+    max_delay: float = 30.0
+    jitter: float = 0.5              # 대기 시간 ±비율
+
+    def delay(self, attempt: int) -> float:
+        """network/empty 재시도 전 대기 (quota는 공용 제한기가 정지 시간을 정함)"""
+        delay = min(self.base_delay * (2 ** (attempt - 1)), self.max_delay)
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+
+DEFAULT_POLICY = RetryPolicy()
+
+
+def classify_error(exc: BaseException) -> str:
+    """요청 단계 예외 분류 (quota / network / fatal)"""
+    if throttle_info(exc) is not None:
+        return ERROR_QUOTA
+    text = str(exc)
+    if 'RESOURCE_EXHAUSTED' in text or 'quota' in text.lower():
+        return ERROR_QUOTA
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ConnectionError)):
+        return ERROR_NETWORK
+    name = type(exc).__name__
+    if any(word in name for word in ('Timeout', 'Connect', 'Network', 'ServerError', 'Unavailable')):
+        return ERROR_NETWORK
+    status = getattr(exc, 'code', None) or getattr(exc, 'status_code', None)
+    if isinstance(status, int) and status >= 500:
+        return ERROR_NETWORK
+    return ERROR_FATAL
+
+
+async def run_vision_request(
+    request: Callable[[], Awaitable[Any]],
+    parse: Callable[[Any], T],
+    salvage: Optional[Callable[[Any], T]] = None,
+    policy: RetryPolicy = DEFAULT_POLICY,
+    retry_empty: bool = False,
+    label: str = '',
+    limiter: Optional[AdaptiveRateLimiter] = None,
+) -> Optional[T]:
+    """
+    Vision 요청 실행 (비동기)
+
+    Args:
+        request: 응답(텍스트 등)을 반환하는 코루틴 함수. 시간 초과 시 취소되고,
+                 시도마다 다시 호출되므로 이미지 인코딩은 바깥에서 한 번만 해 두고
+                 닫아(closure) 쓰면 됩니다.
+        parse: 응답 → 결과. 예외가 나면 parse 오류로 보고 salvage 사용
+        salvage: 깨진 응답에서 결과 복구 (없으면 parse 오류 시 None)
+        retry_empty: 결과가 비어 있으면 재요청
+        limiter: 호출 간격/429 정지를 맡는 제한기 (기본: 프로세스 공용 Gemini 제한기)
+    Returns:
+        결과, 모든 시도 실패/시간 초과 시 None (작업 취소는 그대로 전파)
+    """
+    limiter = limiter or get_gemini_limiter()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + policy.total_timeout
+    prefix = f"[{label}] " if label else ""
+
+    for attempt in range(1, policy.attempts + 1):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            print(f"⏰ {prefix}Vision 전체 시간 초과 ({policy.total_timeout:.0f}초)")
+            return None
+
+        try:
+            # 제한기 대기(429 정지 포함)는 전체 시간 안에서, 요청 자체는 시도별 시간 안에서
+            await asyncio.wait_for(limiter.acquire_async(), timeout=remaining)
+            raw = await asyncio.wait_for(
+                request(), timeout=max(0.0, min(policy.attempt_timeout, deadline - loop.time()))
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            kind = ERROR_NETWORK if isinstance(e, asyncio.TimeoutError) else classify_error(e)
+            print(f"⚠️ {prefix}Vision {kind} 오류 ({attempt}/{policy.attempts}): {str(e)[:80]}")
+            if kind == ERROR_QUOTA:
+                # 공용 제한기를 정지시켜 다른 호출도 함께 쉬게 함 (다음 acquire가 대기)
+                info = throttle_info(e)
+                limiter.on_throttle(info[1] if info else None)
+            if kind == ERROR_FATAL or attempt == policy.attempts:
+                return None
+            if kind != ERROR_QUOTA:
+                await asyncio.sleep(max(0.0, min(policy.delay(attempt), deadline - loop.time())))
+            continue
+        limiter.on_success()
+
+        try:
+            result = parse(raw)
+        except Exception as e:
+            # 응답은 받았으므로 재요청 대신 복구
+            try:
+                recovered = salvage(raw) if salvage else None
+            except Exception:
+                recovered = None
+            count = len(recovered) if isinstance(recovered, list) else 0
+            print(f"🩹 {prefix}응답 {ERROR_PARSE} 실패 ({str(e)[:60]}) → {count}개 항목 복구")
+            return recovered or None
+
+        if result or not retry_empty:
+            return result
+        print(f"⚠️ {prefix}Vision 결과 없음 ({attempt}/{policy.attempts})")
+        if attempt < policy.attempts:
+            await asyncio.sleep(max(0.0, min(policy.delay(attempt), deadline - loop.time())))
+
+    return None
+
+
+def run_vision_request_sync(*args, **kwargs):
+    """run_vision_request 동기 버전 (실행 중인 이벤트 루프가 없는 스레드에서 호출)"""
+    return asyncio.run(run_vision_request(*args, **kwargs))
@@ -20,6 +20,7 @@ import logging
 import os
 import time
 import re
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
@@ -29,6 +30,10 @@ from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeo
 
 # Playwright 브라우저 경로 설정 (로컬 설치 경로 우선 사용)
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.utils.request_blocking import RequestBlocker
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -124,6 +129,8 @@ class WeeklyScraper:
             context = browser.new_context(
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
             )
+            # HTML만 파싱하므로 이미지까지 차단
+            blocker = RequestBlocker(supermarket, url, block_images=True).install(context)
             page = context.new_page()
             
             try:
@@ -185,6 +192,11 @@ class WeeklyScraper:
             except Exception as e:
                 logger.error(f"  ❌ Playwright 크롤링 실패: {str(e)}", exc_info=True)
             finally:
+                stats = blocker.summary()
+                logger.info(
+                    f"  - 요청 차단: {stats['blocked']}건 (허용 {stats['allowed']}건, "
+                    f"약 {stats['saved_bytes'] / 1024:.0f}KB 절약 추정)"
+                )
                 browser.close()
                 
         return products
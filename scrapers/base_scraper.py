@@ -2,12 +2,26 @@
 기본 크롤러 클래스
 각 마트의 strategy에 따라 다른 방식으로 크롤링
 """
+import asyncio
 import os
-import time
 from pathlib import Path
-from playwright.sync_api import sync_playwright, Page
+from typing import Optional
+from playwright.async_api import async_playwright
 from datetime import datetime, timedelta
 from .store_config import SCRAPING_CONFIG
+from .utils.consent_state import ConsentState
+from .utils.network_harvest import NetworkHarvester
+from .utils.page_readiness import ReadinessLog
+from .utils.request_blocking import RequestBlocker
+from .utils.scroll_harvest import ScrollBudget, ScrollHarvester
+from .utils.selector_stats import SelectorStats
+
+MAX_CARDS = 50  # 카드별 locator 방식(대체 경로)의 최대 수집 카드 수
+
+# 상품 필드 → store_config 선택자 키
+CARD_FIELDS = (('name', 'title'), ('price', 'price'), ('discount', 'discount'))
+# 할인 없는 카드도 정상이므로 일치 없음을 실패로 기록하지 않는 선택자 키
+OPTIONAL_KEYS = ('discount',)
 
 class BaseScraper:
     """슈퍼마켓 크롤러 기본 클래스"""
@@ -19,6 +33,10 @@ class BaseScraper:
         self.strategy = store_config['strategy']
         self.selectors = store_config['selectors']
         self.project_root = project_root
+        self.readiness = ReadinessLog(self.name, card_selector=self.selectors.get('product_card'))
+        self.harvester = NetworkHarvester(self.name)
+        # 선택자 후보별 적중 통계 (잘 맞던 선택자부터 시도)
+        self.selector_stats = SelectorStats(self.name)
         
         # Playwright 브라우저 경로 설정
         local_browsers = project_root / "pw-browsers"
@@ -26,66 +44,19 @@ class BaseScraper:
             os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(local_browsers)
     
     def scrape(self) -> list:
-        """메인 크롤링 메서드"""
+        """
+        메인 크롤링 메서드 (마트 전용 브라우저를 띄워 scrape_async 실행)
+        
+        단계는 모두 scrape_async에 있고, 여기서는 브라우저 수명과 출력만 담당합니다.
+        """
         print(f"\n{'='*70}")
         print(f"🛒 {self.name} 크롤링 시작")
         print(f"{'='*70}")
         print(f"🔗 URL: {self.url}")
         print(f"📋 Strategy: {self.strategy}")
         
-        products = []
-        
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch(
-                    headless=SCRAPING_CONFIG['headless']
-                )
-                context = browser.new_context(
-                    user_agent=SCRAPING_CONFIG['user_agent'],
-                    viewport=SCRAPING_CONFIG['viewport']
-                )
-                
-                page = context.new_page()
-                
-                # 1. 페이지 로드
-                print("📄 페이지 로딩 중...")
-                page.goto(self.url, timeout=SCRAPING_CONFIG['timeout'])
-                page.wait_for_load_state("networkidle")
-                time.sleep(SCRAPING_CONFIG['wait_after_load'])
-                
-                # 2. 쿠키 동의 처리
-                self._handle_cookie_consent(page)
-                
-                # 3. Strategy별 처리
-                if self.strategy == "direct_url":
-                    print("✅ Direct URL - 바로 데이터 수집")
-                    products = self._scrape_direct(page)
-                    
-                elif self.strategy == "click_next_week":
-                    print("🖱️  'Volgende week' 버튼 클릭 시도...")
-                    if self._click_next_week_button(page):
-                        products = self._scrape_direct(page)
-                    else:
-                        print("⚠️ 다음 주 버튼을 찾을 수 없습니다. 현재 페이지 데이터 수집...")
-                        products = self._scrape_direct(page)
-                        
-                elif self.strategy == "click_category":
-                    print("🖱️  카테고리 버튼 클릭 시도...")
-                    if self._click_category_button(page):
-                        products = self._scrape_direct(page)
-                    else:
-                        print("⚠️ 카테고리 버튼을 찾을 수 없습니다.")
-                        products = self._scrape_direct(page)
-                        
-                elif self.strategy == "default":
-                    print("✅ Default - 바로 데이터 수집")
-                    products = self._scrape_direct(page)
-                
-                # 4. 스크린샷 저장 (디버그용)
-                self._save_screenshot(page)
-                
-                browser.close()
-                
+            products = asyncio.run(self._scrape_own_browser())
         except Exception as e:
             print(f"❌ 크롤링 실패: {str(e)}")
             return []
@@ -97,182 +68,264 @@ class BaseScraper:
         
         return products
     
-    def _handle_cookie_consent(self, page: Page):
-        """쿠키 동의 처리"""
+    async def _scrape_own_browser(self) -> list:
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=SCRAPING_CONFIG['headless'])
+            try:
+                return await self.scrape_async(browser)
+            finally:
+                await browser.close()
+    
+    async def scrape_async(self, browser) -> list:
+        """
+        공유 브라우저에서 크롤링 (비동기 Playwright, 마트 전용 컨텍스트)
+        
+        오류는 그대로 전파해 호출한 쪽(scrape() 또는 scrapers/main_scraper)이
+        시간 제한/재시도를 관리합니다.
+        """
+        print(f"🛒 [{self.name}] 크롤링 시작 ({self.strategy}) - {self.url}")
+        consent = ConsentState(self.url, store=self.name)
+        context = await browser.new_context(
+            user_agent=SCRAPING_CONFIG['user_agent'],
+            viewport=SCRAPING_CONFIG['viewport'],
+            **consent.context_options()
+        )
+        # 텍스트만 수집하므로 이미지도 차단
+        blocker = await RequestBlocker(self.name, self.url, block_images=True).install_async(context)
         try:
-            cookie_texts = [
-                'accepteren', 'accept', 'akkoord', 'agree', 
-                'toestaan', 'alle cookies'
-            ]
+            page = await context.new_page()
+            # 로딩 중 JSON 응답 기록 (1차 추출 단계)
+            self.harvester = NetworkHarvester(self.name).attach_async(page)
             
-            for text in cookie_texts:
-                try:
-                    buttons = page.get_by_role("button", name=text).all()
-                    for button in buttons:
-                        if button.is_visible():
-                            button.click()
-                            time.sleep(2)
-                            print("🍪 쿠키 동의 완료")
-                            return
-                except:
-                    pass
-        except:
-            pass
+            # 1. 페이지 로드
+            await page.goto(self.url, timeout=SCRAPING_CONFIG['timeout'])
+            await page.wait_for_load_state("networkidle")
+            # 상품 카드 수/DOM 변경이 멈추면 진행 (wait_after_load는 상한)
+            self.readiness = ReadinessLog(self.name, card_selector=self.selectors.get('product_card'))
+            await self.readiness.wait_async(page, SCRAPING_CONFIG['wait_after_load'])
+            
+            # 2. 쿠키 동의 처리 (저장된 동의 상태가 유효하면 생략)
+            if await consent.needs_banner_async(page):
+                await consent.save_async(context, accepted=await self._handle_cookie_consent(page))
+            
+            # 3. Strategy별 처리 (버튼을 못 찾으면 현재 페이지 데이터 수집)
+            if self.strategy == "click_next_week":
+                await self.harvester.drain()
+                self.harvester.reset()  # 이번 주 응답 제외
+                if not await self._click_next_week_button(page):
+                    print(f"⚠️ [{self.name}] 다음 주 버튼을 찾을 수 없습니다. 현재 페이지 데이터 수집...")
+            elif self.strategy == "click_category":
+                await self.harvester.drain()
+                self.harvester.reset()
+                if not await self._click_category_button(page):
+                    print(f"⚠️ [{self.name}] 카테고리 버튼을 찾을 수 없습니다.")
+            
+            products = await self._scrape_direct(page)
+            
+            # 4. 스크린샷 저장 (디버그용)
+            await self._save_screenshot(page)
+            self.readiness.report()
+            return products
+        finally:
+            blocker.report()
+            self.selector_stats.save()
+            self.selector_stats.report()
+            await context.close()
     
-    def _click_next_week_button(self, page: Page) -> bool:
-        """'다음 주' 버튼 클릭"""
-        selectors = self.selectors.get('next_week_btn', '').split(', ')
-        
-        for selector in selectors:
+    async def _handle_cookie_consent(self, page) -> bool:
+        """쿠키 동의 처리 (동의 버튼을 눌렀으면 True)"""
+        for text in ['accepteren', 'accept', 'akkoord', 'agree', 'toestaan', 'alle cookies']:
             try:
-                # CSS selector 시도
-                element = page.locator(selector).first
-                if element.count() > 0 and element.is_visible():
-                    element.click()
-                    time.sleep(SCRAPING_CONFIG['wait_after_click'])
-                    print(f"  ✅ 버튼 클릭 성공: {selector}")
-                    return True
-            except:
+                for button in await page.get_by_role("button", name=text).all():
+                    if await button.is_visible():
+                        await button.click()
+                        await self.readiness.wait_async(page, 2, quiet_ms=500)
+                        print(f"🍪 [{self.name}] 쿠키 동의 완료")
+                        return True
+            except Exception:
                 pass
-        
-        # 텍스트로 직접 찾기
-        try:
-            texts = ['Volgende week', 'volgende week', 'Volgende']
-            for text in texts:
-                element = page.get_by_text(text, exact=False).first
-                if element.count() > 0 and element.is_visible():
-                    element.click()
-                    time.sleep(SCRAPING_CONFIG['wait_after_click'])
-                    print(f"  ✅ 버튼 클릭 성공: '{text}'")
-                    return True
-        except:
-            pass
-        
         return False
     
-    def _click_category_button(self, page: Page) -> bool:
-        """카테고리 버튼 클릭 (Lidl 등)"""
-        selectors = self.selectors.get('category_btn', '').split(', ')
-        
-        for selector in selectors:
+    async def _click_first_visible(self, page, key: str, texts: tuple = ()) -> bool:
+        """store_config 선택자(key) → 텍스트 순으로 처음 보이는 요소 클릭"""
+        selectors = self._split_selectors(key)
+        candidates = [(selector, page.locator(selector).first) for selector in selectors]
+        candidates += [(f"'{text}'", page.get_by_text(text, exact=False).first) for text in texts]
+        for label, element in candidates:
             try:
-                element = page.locator(selector).first
-                if element.count() > 0 and element.is_visible():
-                    element.click()
-                    time.sleep(SCRAPING_CONFIG['wait_after_click'])
-                    print(f"  ✅ 카테고리 클릭 성공: {selector}")
+                if await element.count() > 0 and await element.is_visible():
+                    await element.click()
+                    self._record_probe(key, selectors, label if label in selectors else None)
+                    await self.readiness.wait_async(page, SCRAPING_CONFIG['wait_after_click'])
+                    print(f"  ✅ [{self.name}] 클릭 성공: {label}")
                     return True
-            except:
+            except Exception:
                 pass
-        
+        self._record_probe(key, selectors, None)
         return False
     
-    def _scrape_direct(self, page: Page) -> list:
+    async def _click_next_week_button(self, page) -> bool:
+        """'다음 주' 버튼 클릭"""
+        return await self._click_first_visible(
+            page, 'next_week_btn', ('Volgende week', 'volgende week', 'Volgende')
+        )
+    
+    async def _click_category_button(self, page) -> bool:
+        """카테고리 버튼 클릭 (Lidl 등)"""
+        return await self._click_first_visible(page, 'category_btn')
+    
+    async def _scrape_direct(self, page) -> list:
         """실제 상품 데이터 수집"""
-        products = []
-        
         # 대기할 요소가 있으면 대기
         if 'wait_for' in self.config:
             try:
-                page.wait_for_selector(
-                    self.config['wait_for'], 
-                    timeout=10000
-                )
-            except:
-                print("  ⚠️ 대기 요소를 찾을 수 없습니다.")
+                await page.wait_for_selector(self.config['wait_for'], timeout=10000)
+            except Exception:
+                print(f"  ⚠️ [{self.name}] 대기 요소를 찾을 수 없습니다.")
         
-        # 상품 카드 찾기
-        product_selectors = self.selectors.get('product_card', '').split(', ')
-        product_cards = []
+        # 1차: 페이지가 받은 JSON(API) 응답에서 추출, 부족하면 DOM 카드 파싱
+        await self.harvester.drain()
+        harvested = self.harvester.usable_products()
+        if harvested:
+            return harvested
         
+        # 스크롤하며 모든 카드 일괄 추출 (실패하면 카드별 locator 방식)
+        bulk = await self._extract_products_bulk(page)
+        if bulk is not None:
+            return bulk
+        
+        # 대체 경로: 카드별 locator 방식
+        product_selectors = self._split_selectors('product_card')
         for selector in product_selectors:
             try:
-                cards = page.locator(selector).all()
-                if len(cards) > 0:
-                    product_cards = cards
-                    print(f"  📦 {len(cards)}개 상품 카드 발견: {selector}")
-                    break
-            except:
-                pass
+                cards = await page.locator(selector).all()
+            except Exception:
+                continue
+            if not cards:
+                continue
+            self._record_probe('product_card', product_selectors, selector, len(cards))
+            print(f"  📦 [{self.name}] {len(cards)}개 상품 카드 발견: {selector}")
+            products = []
+            for card in cards[:MAX_CARDS]:
+                try:
+                    product = await self._extract_product_info(card)
+                except Exception:
+                    continue
+                if product.get('name'):
+                    product['supermarket'] = self.name
+                    products.append(product)
+            return products
         
-        if not product_cards:
-            print("  ⚠️ 상품 카드를 찾을 수 없습니다.")
-            return []
+        self._record_probe('product_card', product_selectors, None)
+        print(f"  ⚠️ [{self.name}] 상품 카드를 찾을 수 없습니다.")
+        return []
+    
+    def _split_selectors(self, key: str) -> list:
+        """store_config 대체 선택자 목록 (학습된 적중 순서)"""
+        declared = [s for s in self.selectors.get(key, '').split(', ') if s]
+        return self.selector_stats.order(key, declared)
+    
+    def _record_probe(self, key: str, selectors: list, hit: Optional[str], count: int = 1):
+        """순서대로 시도한 선택자 중 hit가 맞았음을 기록 (None이면 모두 실패, 선택 필드는 기록 안 함)"""
+        if hit is None and key in OPTIONAL_KEYS:
+            return
+        self.selector_stats.record(key, selectors, {hit: count} if hit else {}, exhausted=hit is None)
+    
+    def _record_bulk_hits(self, harvester: ScrollHarvester):
+        """
+        스크롤 수집 중 집계한 카드/필드 선택자 적중 기록
+
+        필드 선택자는 카드별 대체 경로와 같은 단위로, 수집된 카드 하나당 한 번씩 기록합니다
+        (연속 실패는 SelectorStats가 실행 단위로 계산).
+        """
+        self._record_probe('product_card', harvester.card_selectors, harvester.selector, max(harvester.emitted, 1))
+        if not harvester.selector:
+            return
+        for field, key in CARD_FIELDS:
+            for selector, cards in harvester.field_hits.get(field, {}).items():
+                for _ in range(cards):
+                    self._record_probe(key, harvester.fields[field], selector)
+            for _ in range(harvester.field_misses[field]):
+                self._record_probe(key, harvester.fields[field], None)
+    
+    def _scroll_harvester(self, budget: Optional[ScrollBudget] = None) -> ScrollHarvester:
+        return ScrollHarvester(
+            self.name,
+            card_selectors=self._split_selectors('product_card'),
+            fields={field: self._split_selectors(key) for field, key in CARD_FIELDS},
+            budget=budget or ScrollBudget(
+                max_steps=SCRAPING_CONFIG['scroll_max_steps'],
+                max_seconds=SCRAPING_CONFIG['scroll_max_seconds'],
+                max_products=SCRAPING_CONFIG['max_products'],
+            ),
+            readiness=self.readiness,
+        )
+    
+    async def _extract_products_bulk(self, page, budget: Optional[ScrollBudget] = None) -> Optional[list]:
+        """
+        새 카드가 나오는 동안 스크롤하며 모든 상품 카드를 브라우저 안에서 추출
+        (스크롤 한 번에 page.evaluate 1회, 카드 키로 중복 제거)
         
-        # 각 상품 카드에서 정보 추출
-        for i, card in enumerate(product_cards[:50], 1):  # 최대 50개
-            try:
-                product = self._extract_product_info(card)
-                if product and product.get('name'):
+        Args:
+            budget: 스크롤 한도 (없으면 SCRAPING_CONFIG 기준)
+        
+        Returns:
+            상품 목록, 카드를 못 찾았거나 평가에 실패하면 None (locator 방식으로 대체)
+        """
+        harvester = self._scroll_harvester(budget)
+        products = []
+        try:
+            async for product in harvester.harvest_async(page):
+                if product.get('name'):
                     product['supermarket'] = self.name
                     products.append(product)
-                    print(f"  {i}. {product['name'][:50]}")
-            except Exception as e:
-                continue
+        except Exception as e:
+            print(f"  ⚠️ [{self.name}] 스크롤 추출 실패, 카드별 추출로 진행: {str(e)[:80]}")
+            return None
+        self._record_bulk_hits(harvester)
+        if not harvester.selector:
+            return None
         
+        print(f"  📦 [{self.name}] 상품 카드 선택자: {harvester.selector}")
+        harvester.report()
         return products
     
-    def _extract_product_info(self, card) -> dict:
-        """개별 상품 카드에서 정보 추출"""
-        product = {
-            'name': None,
-            'price': None,
-            'discount': None
-        }
-        
-        # 상품명 추출
-        title_selectors = self.selectors.get('title', '').split(', ')
-        for selector in title_selectors:
-            try:
-                element = card.locator(selector).first
-                if element.count() > 0:
-                    product['name'] = element.inner_text().strip()
-                    break
-            except:
-                pass
+    async def _extract_product_info(self, card) -> dict:
+        """개별 상품 카드에서 정보 추출 (일괄 추출이 실패했을 때의 대체 경로)"""
+        product = {}
+        for field, key in CARD_FIELDS:
+            product[field] = None
+            selectors = self._split_selectors(key)
+            hit = None
+            for selector in selectors:
+                try:
+                    element = card.locator(selector).first
+                    if await element.count() > 0:
+                        product[field] = (await element.inner_text()).strip()
+                        hit = selector
+                        break
+                except Exception:
+                    pass
+            self._record_probe(key, selectors, hit)
         
         # 상품명을 못 찾으면 카드 전체 텍스트에서 첫 줄 사용
         if not product['name']:
             try:
-                text = card.inner_text().strip()
-                lines = [line.strip() for line in text.split('\n') if line.strip()]
-                if lines:
-                    product['name'] = lines[0]
-            except:
-                pass
-        
-        # 가격 추출
-        price_selectors = self.selectors.get('price', '').split(', ')
-        for selector in price_selectors:
-            try:
-                element = card.locator(selector).first
-                if element.count() > 0:
-                    product['price'] = element.inner_text().strip()
-                    break
-            except:
-                pass
-        
-        # 할인 정보 추출
-        discount_selectors = self.selectors.get('discount', '').split(', ')
-        for selector in discount_selectors:
-            try:
-                element = card.locator(selector).first
-                if element.count() > 0:
-                    product['discount'] = element.inner_text().strip()
-                    break
-            except:
+                lines = [line.strip() for line in (await card.inner_text()).split('\n') if line.strip()]
+                product['name'] = lines[0] if lines else None
+            except Exception:
                 pass
         
         return product
     
-    def _save_screenshot(self, page: Page):
+    async def _save_screenshot(self, page):
         """스크린샷 저장 (디버그용)"""
         try:
             screenshot_dir = self.project_root / "data" / "screenshots"
             screenshot_dir.mkdir(parents=True, exist_ok=True)
             
             filename = f"{self.name.lower().replace(' ', '_')}_official.png"
-            page.screenshot(path=str(screenshot_dir / filename), full_page=True)
-            print(f"📸 스크린샷 저장: {filename}")
-        except:
+            await page.screenshot(path=str(screenshot_dir / filename), full_page=True)
+            print(f"📸 [{self.name}] 스크린샷 저장: {filename}")
+        except Exception:
             pass
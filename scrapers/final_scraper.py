@@ -5,6 +5,7 @@ import os
 import json
 import time
 import base64
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
@@ -15,6 +16,12 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.utils.request_blocking import RequestBlocker
+from scraper.gemini_limiter import call_gemini
+from scraper.json_salvage import parse_json_array
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -23,8 +30,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -98,6 +103,8 @@ def capture_screenshot_ah_special(name, config):
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                 viewport={'width': 1920, 'height': 1080}
             )
+            # 광고/트래커/폰트/동영상 차단 (스크린샷 분석용이므로 이미지는 허용)
+            blocker = RequestBlocker(name, config['url']).install(context)
             
             page = context.new_page()
             
@@ -165,6 +172,7 @@ def capture_screenshot_ah_special(name, config):
             page.screenshot(path=str(screenshot_path), full_page=True)
             file_size = screenshot_path.stat().st_size / 1024
             print(f"✅ 저장 완료: {screenshot_path.name} ({file_size:.0f}KB)")
+            blocker.report()
             
             browser.close()
             return screenshot_path
@@ -187,6 +195,8 @@ def capture_screenshot_standard(name, config):
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
                 viewport={'width': 1920, 'height': 1080}
             )
+            # 광고/트래커/폰트/동영상 차단 (스크린샷 분석용이므로 이미지는 허용)
+            blocker = RequestBlocker(name, config['url']).install(context)
             
             page = context.new_page()
             
@@ -238,6 +248,7 @@ def capture_screenshot_standard(name, config):
             page.screenshot(path=str(screenshot_path), full_page=True)
             file_size = screenshot_path.stat().st_size / 1024
             print(f"✅ 저장 완료: {screenshot_path.name} ({file_size:.0f}KB)")
+            blocker.report()
             
             browser.close()
             return screenshot_path
@@ -272,7 +283,7 @@ def analyze_with_ai(screenshot_path, store_name):
   {{"name": "Hollandse aardappelen", "price": "€1.99", "discount": null}}
 ]"""
 
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -284,22 +295,10 @@ def analyze_with_ai(screenshot_path, store_name):
                 )
             ],
             config=types.GenerateContentConfig(temperature=0.3, max_output_tokens=8000)
-        )
-        
-        response_text = response.text.strip()
+        ))
         
-        # JSON 추출
-        import re
-        if '```json' in response_text:
-            json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-        elif '[' in response_text:
-            start = response_text.index('[')
-            end = response_text.rindex(']') + 1
-            response_text = response_text[start:end]
-        
-        products_data = json.loads(response_text)
+        # JSON 추출 (잘린 응답은 완전한 객체만 사용)
+        products_data = parse_json_array(response.text, label=store_name).items
         
         products = []
         for item in products_data:
@@ -389,9 +388,6 @@ def main():
                 print(f"  ⚠️ {name} 실패")
         else:
             failed.append(name)
-        
-        print("\n⏳ 다음 마트 대기...\n")
-        time.sleep(8)
     
     # 결과
     if all_products:
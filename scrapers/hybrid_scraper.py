@@ -4,10 +4,13 @@
 import os
 import json
 import time
-import base64
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 import re
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
+from playwright.async_api import async_playwright
 from datetime import datetime, timedelta
 from typing import Optional, Tuple
 from google import genai
@@ -17,6 +20,17 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scraper.json_salvage import parse_json_array
+from scraper.vision_retry import run_vision_request_sync
+from scrapers.utils.consent_state import ConsentState
+from scrapers.utils.network_harvest import NetworkHarvester
+from scrapers.utils.page_readiness import ReadinessLog
+from scrapers.utils.request_blocking import RequestBlocker
+from scrapers.utils.screenshot_tiles import Tile, TILE_WORKERS, make_tiles, merge_tile_products
+from scrapers.utils.vision_cache import get_vision_cache
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -25,8 +39,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -100,12 +112,33 @@ STORES = {
     }
 }
 
+# Albert Heijn Reclamefolder 실패 시 사용하는 공식 사이트 설정
+AH_OFFICIAL_CONFIG = {
+    'url': 'https://www.ah.nl/bonus',
+    'source': 'official',
+    'timeout': 150000,  # 120초 → 150초
+    'wait_time': 15,
+    'scroll': True,
+    'scroll_iterations': 8  # 더 많은 스크롤
+}
+
+# Albert Heijn은 Reclamefolder와 공식 사이트를 동시에 시작해 먼저 충분한 결과를 낸 쪽 사용
+# (AH_MERGE_SOURCES=1 또는 --ah-merge: 두 결과를 모두 기다려 병합)
+AH_MIN_PRODUCTS = 3
+AH_MERGE_SOURCES = os.getenv("AH_MERGE_SOURCES") == "1"
+
+# 비동기 모드: 브라우저 하나에서 동시에 처리할 마트 수
+BROWSER_CONCURRENCY = int(os.getenv("HYBRID_CONCURRENCY", "3"))
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36'
+BROWSER_VIEWPORT = {'width': 1920, 'height': 1080}
+
 def get_next_monday():
     today = datetime.now()
     return today if today.weekday() == 0 else today + timedelta(days=(7 - today.weekday()))
 
-def capture_screenshot(name, config, retry=0):
-    """스크린샷 캡처"""
+def capture_screenshot(name, config, retry=0, harvester=None):
+    """스크린샷 캡처 (harvester가 있으면 로딩 중 JSON 응답도 기록)"""
     max_retries = 2
     
     print(f"\n{'='*70}")
@@ -117,20 +150,28 @@ def capture_screenshot(name, config, retry=0):
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
+            consent = ConsentState(config['url'], store=name)
             context = browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                viewport={'width': 1920, 'height': 1080}
+                user_agent=BROWSER_USER_AGENT,
+                viewport=BROWSER_VIEWPORT,
+                **consent.context_options()
             )
+            # 스크린샷 분석용이므로 이미지는 허용
+            blocker = RequestBlocker(name, config['url']).install(context)
             
             page = context.new_page()
+            if harvester:
+                harvester.attach(page)
             
             timeout = config.get('timeout', 90000)
             page.goto(config['url'], timeout=timeout)
             page.wait_for_load_state("networkidle", timeout=timeout)
             
+            # 렌더링 대기 (wait_time은 상한, 페이지가 안정되면 바로 진행)
+            readiness = ReadinessLog(name)
             wait_time = config.get('wait_time', 5)
-            print(f"⏳ 대기: {wait_time}초")
-            time.sleep(wait_time)
+            print(f"⏳ 대기: 최대 {wait_time}초")
+            readiness.wait(page, wait_time)
             
             # 스크롤 (lazy loading 트리거)
             if config.get('scroll'):
@@ -138,28 +179,34 @@ def capture_screenshot(name, config, retry=0):
                 scroll_iterations = config.get('scroll_iterations', 5)
                 for i in range(scroll_iterations):
                     page.evaluate("window.scrollBy(0, 800)")
-                    time.sleep(1.2)  # 스크롤 간 대기 시간 증가
+                    readiness.wait(page, 1.2, quiet_ms=300)
                 # 맨 아래까지 스크롤
                 page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                time.sleep(2)
+                readiness.wait(page, 2, quiet_ms=500)
                 # 다시 위로
                 page.evaluate("window.scrollTo(0, 0)")
-                time.sleep(2)
+                readiness.wait(page, 2, quiet_ms=500)
             
-            # 쿠키 동의
-            try:
-                for text in ['accepteren', 'accept', 'akkoord', 'allow', 'agree']:
-                    try:
-                        button = page.get_by_role("button", name=re.compile(text, re.IGNORECASE)).first
-                        if button.is_visible(timeout=2000):
-                            button.click()
-                            time.sleep(2)
-                            print("🍪 쿠키 동의 완료")
-                            break
-                    except:
-                        pass
-            except:
-                pass
+            # 쿠키 동의 (저장된 동의 상태가 유효하면 생략)
+            if consent.needs_banner(page):
+                accepted = False
+                try:
+                    for text in ['accepteren', 'accept', 'akkoord', 'allow', 'agree']:
+                        try:
+                            button = page.get_by_role("button", name=re.compile(text, re.IGNORECASE)).first
+                            if button.is_visible(timeout=2000):
+                                button.click()
+                                accepted = True
+                                readiness.wait(page, 2, quiet_ms=500)
+                                print("🍪 쿠키 동의 완료")
+                                break
+                        except:
+                            pass
+                except:
+                    pass
+                consent.save(context, accepted=accepted)
+            readiness.report()
+            blocker.report()
             
             # 스크린샷
             screenshot_dir = PROJECT_ROOT / "data" / "screenshots"
@@ -179,23 +226,23 @@ def capture_screenshot(name, config, retry=0):
         if retry < max_retries:
             print(f"🔄 5초 후 재시도...")
             time.sleep(5)
-            return capture_screenshot(name, config, retry + 1)
+            if harvester:
+                harvester.reset()  # 실패한 시도의 응답은 버리고 새로 수집
+            return capture_screenshot(name, config, retry + 1, harvester)
         
         return None
 
-def analyze_with_ai(screenshot_path, store_name, retry=0):
-    """AI 분석"""
-    max_retries = 2
-    
-    print(f"🔍 AI 분석 중..." + (f" (재시도 {retry})" if retry > 0 else ""))
-    
-    try:
-        with open(screenshot_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
-        
-        # Albert Heijn용 특별 프롬프트 (Reclamefolder 페이지 구조 고려)
-        if store_name == "Albert Heijn":
-            prompt = f"""이 이미지는 네덜란드 슈퍼마켓 세일 정보 페이지입니다.
+# 타일 분석 시 프롬프트에 덧붙이는 안내
+TILE_PROMPT_NOTE = """
+
+**참고**: 이 이미지는 긴 페이지를 세로로 나눈 일부 구간입니다. 이 구간에 보이는 상품만 추출하고,
+위/아래 경계에서 잘린 상품은 이름이 읽히는 경우에만 포함하세요. 보이는 상품이 없으면 []를 출력하세요."""
+
+def build_vision_prompt(store_name, partial=False):
+    """AI 분석 프롬프트 (partial=True면 타일용 안내 추가, 최소 개수 조건 제거)"""
+    # Albert Heijn용 특별 프롬프트 (Reclamefolder 페이지 구조 고려)
+    if store_name == "Albert Heijn":
+        prompt = f"""이 이미지는 네덜란드 슈퍼마켓 세일 정보 페이지입니다.
 
 **작업**: 이미지에서 보이는 **{store_name} 관련 모든 식품 세일 상품**을 추출하세요.
 
@@ -212,8 +259,9 @@ def analyze_with_ai(screenshot_path, store_name, retry=0):
   {{"name": "Alle AH Verse pasta's", "price": "€2.39", "discount": "1+1 gratis"}},
   {{"name": "Witte druiven", "price": "€1.49", "discount": null}}
 ]"""
-        else:
-            prompt = f"""이 이미지는 네덜란드 슈퍼마켓 **{store_name}**의 세일 전단지/페이지입니다.
+    else:
+        minimum_rule = "" if partial else "- 최소 15개 이상 추출\n"
+        prompt = f"""이 이미지는 네덜란드 슈퍼마켓 **{store_name}**의 세일 전단지/페이지입니다.
 
 **작업**: 이미지에서 보이는 **모든 식품 세일 상품** 추출
 
@@ -230,8 +278,7 @@ def analyze_with_ai(screenshot_path, store_name, retry=0):
 - 옷, 가전, 기차표, 가구, 장난감, 화장품, 청소용품
 
 **필수**:
-- 최소 15개 이상 추출
-- 상품명은 네덜란드어 원문
+{minimum_rule}- 상품명은 네덜란드어 원문
 - 완전한 이름 사용
 
 **JSON만 출력**:
@@ -240,114 +287,157 @@ def analyze_with_ai(screenshot_path, store_name, retry=0):
   {{"name": "Verse kipfilet", "price": "€5.49", "discount": "25% korting"}},
   {{"name": "Hollandse aardappelen", "price": "€1.99", "discount": null}}
 ]"""
+    return prompt + TILE_PROMPT_NOTE if partial else prompt
 
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-001',
-            contents=[
-                types.Content(
-                    role='user',
-                    parts=[
-                        types.Part(text=prompt),
-                        types.Part(inline_data=types.Blob(mime_type='image/png', data=image_data))
-                    ]
-                )
-            ],
-            config=types.GenerateContentConfig(temperature=0.3, max_output_tokens=8000)
+def parse_vision_products(response_text, store_name, label=''):
+    """
+    AI 응답 텍스트 → 상품 목록 (JSON 코드 블록/앞뒤 설명문 허용)
+    
+    출력 토큰 한도로 잘린 응답은 완전한 객체까지만 사용하고,
+    JSON을 전혀 찾지 못하면 ValueError
+    """
+    result = parse_json_array(response_text, label=label)
+    if not result.items and not result.complete:
+        raise ValueError(f"JSON 배열을 찾을 수 없음: {response_text[:80]!r}")
+    
+    products = []
+    for item in result.items:
+        if isinstance(item, dict) and 'name' in item:
+            name = item['name']
+            if 3 <= len(name) <= 150:
+                products.append({
+                    'name': name,
+                    'price': item.get('price'),
+                    'discount': item.get('discount'),
+                    'supermarket': store_name
+                })
+    return products
+
+def salvage_vision_products(response_text, store_name):
+    """parse_vision_products가 실패한 응답에서 쓸 수 있는 객체만 복구 (이름이 문자열인 객체)"""
+    products = []
+    for item in parse_json_array(response_text).items:
+        name = item.get('name') if isinstance(item, dict) else None
+        if isinstance(name, str) and 3 <= len(name.strip()) <= 150:
+            products.append({
+                'name': name.strip(),
+                'price': item.get('price'),
+                'discount': item.get('discount'),
+                'supermarket': store_name
+            })
+    return products
+
+def analyze_tile(tile, store_name, partial):
+    """
+    타일 하나 분석 (실패 시 None)
+    
+    요청 내용(인코딩된 타일 포함)은 한 번만 만들고, 일시 오류는 재시도 실행기가
+    다시 보내며, 잘린 JSON 응답은 재요청 없이 완전한 객체만 사용합니다.
+    파싱에 실패한 응답도 이름이 있는 객체는 복구합니다.
+    """
+    contents = [
+        types.Content(
+            role='user',
+            parts=[
+                types.Part(text=build_vision_prompt(store_name, partial)),
+                types.Part(inline_data=types.Blob(mime_type=tile.mime_type, data=tile.data))
+            ]
         )
+    ]
+    config = types.GenerateContentConfig(temperature=0.3, max_output_tokens=8000)
+    
+    # 타일마다 새 이벤트 루프에서 실행되므로 비동기 클라이언트도 호출마다 만듦
+    aio = genai.Client(api_key=api_key).aio
+    
+    async def request():
+        # 비동기 호출이라 시간 초과 시 요청도 취소됨 (제한기/재시도는 실행기가 관리)
+        response = await aio.models.generate_content(
+            model='gemini-2.0-flash-001', contents=contents, config=config
+        )
+        return response.text
+    
+    label = f"{store_name} 타일 {tile.index + 1}"
+    return run_vision_request_sync(
+        request,
+        parse=lambda text: parse_vision_products(text, store_name, label=label),
+        salvage=lambda text: salvage_vision_products(text, store_name),
+        label=label,
+    )
+
+def analyze_with_ai(screenshot_path, store_name, week_type='next'):
+    """
+    AI 분석
+    
+    긴 스크린샷은 뷰포트 높이 타일(JPEG/WebP)로 나눠 병렬 분석하고,
+    겹침 구간 중복을 제거해 병합합니다.
+    같은 세일 주차에 이미 분석한 것과 거의 같은 타일(지각 해시)은 캐시 결과를 사용합니다.
+    상품이 하나도 없으면 같은 타일로 다시 분석합니다 (재인코딩 없음).
+    """
+    max_retries = 2
+    
+    started = time.perf_counter()
+    try:
+        tiles = make_tiles(screenshot_path)
+    except Exception as e:
+        print(f"⚠️ [{store_name}] 타일 분할 실패, 원본 사용: {str(e)[:80]}")
+        tiles = [Tile(index=0, data=Path(screenshot_path).read_bytes(), mime_type='image/png')]
+    partial = len(tiles) > 1
+    original_kb = Path(screenshot_path).stat().st_size / 1024
+    
+    sale_start, _ = get_store_sale_dates(store_name, week_type)
+    cache = get_vision_cache(f"hybrid_{store_name}_{week_type}", week=sale_start.strftime('%Y-%m-%d'))
+    
+    for attempt in range(max_retries + 1):
+        print(f"🔍 AI 분석 중..." + (f" (재시도 {attempt})" if attempt > 0 else ""))
         
-        response_text = response.text.strip()
-        
-        # JSON 추출
-        if '```json' in response_text:
-            json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-            if json_match:
-                response_text = json_match.group(1)
-        elif '```' in response_text:
-            response_text = response_text.strip('`').strip()
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
-        elif '[' in response_text:
-            start = response_text.index('[')
-            end = response_text.rindex(']') + 1
-            response_text = response_text[start:end]
+        def analyze(tile):
+            tag = f"{tile.index}/{len(tiles)}"
+            # 재시도는 빈 결과를 다시 받지 않도록 캐시를 건너뜀
+            cached = cache.lookup(tile.data, tag=tag) if attempt == 0 else None
+            if cached is not None:
+                return cached, True
+            return analyze_tile(tile, store_name, partial), False
         
-        products_data = json.loads(response_text)
+        with ThreadPoolExecutor(max_workers=min(TILE_WORKERS, len(tiles))) as pool:
+            analyzed = list(pool.map(analyze, tiles))
+        tile_results = [result for result, _ in analyzed]
+        products = merge_tile_products([result or [] for result in tile_results])
         
-        products = []
-        for item in products_data:
-            if isinstance(item, dict) and 'name' in item:
-                name = item['name']
-                if 3 <= len(name) <= 150:
-                    products.append({
-                        'name': name,
-                        'price': item.get('price'),
-                        'discount': item.get('discount'),
-                        'supermarket': store_name
-                    })
+        cached_tiles = sum(1 for _, hit in analyzed if hit)
+        sent_kb = sum(len(tile.data) for tile, (_, hit) in zip(tiles, analyzed) if not hit) / 1024
+        failed_tiles = sum(1 for result in tile_results if result is None)
+        print(
+            f"📦 [{store_name}] 타일 {len(tiles)}개 중 {len(tiles) - cached_tiles}개 전송 {sent_kb:.0f}KB "
+            f"(원본 PNG {original_kb:.0f}KB), {time.perf_counter() - started:.1f}초"
+            + (f", 캐시 적중 {cached_tiles}개" if cached_tiles else "")
+            + (f", 실패 타일 {failed_tiles}개" if failed_tiles else "")
+        )
         
         if products:
+            # 상품이 나온 분석만 캐시 (실패 타일은 저장하지 않음)
+            for tile, (result, hit) in zip(tiles, analyzed):
+                if not hit and result is not None:
+                    cache.store(tile.data, result, tag=f"{tile.index}/{len(tiles)}")
+            cache.save()
             print(f"✅ {len(products)}개 식품 추출!")
             return products
-        else:
-            raise ValueError("추출된 식품 없음")
         
-    except json.JSONDecodeError as e:
-        print(f"⚠️ JSON 오류: {str(e)[:50]}")
-        # response_text가 정의되어 있는지 확인
-        try:
-            response_text_local = response_text
-        except NameError:
-            # response_text가 없으면 재시도만 수행
-            if retry < max_retries:
-                wait_time = 5 + (retry * 2)
-                print(f"⏳ {wait_time}초 후 재시도...")
-                time.sleep(wait_time)
-                return analyze_with_ai(screenshot_path, store_name, retry + 1)
-            return []
-        
-        if retry < max_retries:
-            # 재시도 시 대기 시간 증가 (3초 → 5초)
-            wait_time = 5 + (retry * 2)  # 재시도마다 대기 시간 증가
-            print(f"⏳ {wait_time}초 후 재시도...")
-            time.sleep(wait_time)
-            return analyze_with_ai(screenshot_path, store_name, retry + 1)
-        
-        # JSON 파싱 실패 시 텍스트에서 직접 추출 시도
-        print("🔄 텍스트에서 직접 추출 시도...")
-        try:
-            # 응답 텍스트에서 JSON 배열 찾기
-            if '[' in response_text_local and ']' in response_text_local:
-                start = response_text_local.index('[')
-                end = response_text_local.rindex(']') + 1
-                json_text = response_text_local[start:end]
-                products_data = json.loads(json_text)
-                # ... (기존 products 처리 로직)
-                products = []
-                for item in products_data:
-                    if isinstance(item, dict) and 'name' in item:
-                        name = item['name']
-                        if 3 <= len(name) <= 150:
-                            products.append({
-                                'name': name,
-                                'price': item.get('price'),
-                                'discount': item.get('discount'),
-                                'supermarket': store_name
-                            })
-                if products:
-                    print(f"✅ {len(products)}개 식품 추출! (텍스트 파싱)")
-                    return products
-        except Exception as fallback_error:
-            print(f"⚠️ 텍스트 파싱도 실패: {str(fallback_error)[:50]}")
-        return []
-        
-    except Exception as e:
-        print(f"❌ AI 오류: {str(e)[:100]}")
-        if retry < max_retries:
-            wait_time = 5 + (retry * 2)
-            print(f"⏳ {wait_time}초 후 재시도...")
-            time.sleep(wait_time)
-            return analyze_with_ai(screenshot_path, store_name, retry + 1)
-        return []
+        print("⚠️ 추출된 식품 없음")
+        if attempt < max_retries:
+            print("🔄 재시도...")
+    return []
+
+def extract_store_products(screenshot_path, harvester, store_name, week_type='next'):
+    """
+    상품 추출: 1차로 페이지 로딩 중 받은 JSON 응답에서 추출하고,
+    충분하지 않을 때만 스크린샷 Vision 분석
+    """
+    products = harvester.usable_products() if harvester else []
+    if products:
+        return products
+    if screenshot_path:
+        return analyze_with_ai(screenshot_path, store_name, week_type=week_type)
+    return None
 
 def get_current_week():
     """현재 주 월요일 계산"""
@@ -470,43 +560,19 @@ def scrape_week(week_type='next'):
     failed = []
     
     for name, config in STORES.items():
-        screenshot = capture_screenshot(name, config)
-        products = None
-        
-        if screenshot:
-            products = analyze_with_ai(screenshot, name)
-        
-        # Albert Heijn 최적화:
-        # - Reclamefolder에서 3개 이상이면 사용 (로그 분석 결과: 3개도 유효)
-        # - 3개 미만이면 공식 사이트 시도
         if name == 'Albert Heijn':
-            if products and len(products) >= 3:
-                # Reclamefolder 결과가 3개 이상이면 사용
-                pass
-            elif not products or len(products) < 3:
-                print(f"\n🔄 {name} Reclamefolder 실패 (상품 {len(products) if products else 0}개), 공식 사이트 시도...")
-                official_config = {
-                    'url': 'https://www.ah.nl/bonus',
-                    'source': 'official',
-                    'timeout': 150000,  # 120초 → 150초
-                    'wait_time': 15,
-                    'scroll': True,
-                    'scroll_iterations': 8  # 더 많은 스크롤
-                }
-                screenshot2 = capture_screenshot(name, official_config)
-                if screenshot2:
-                    products2 = analyze_with_ai(screenshot2, name)
-                    if products2 and len(products2) >= 3:
-                        products = products2
-                        print(f"✅ {name} 공식 사이트에서 {len(products2)}개 추출 성공!")
-                    elif products and len(products) >= 3:
-                        # Reclamefolder 결과 사용
-                        print(f"✅ {name} Reclamefolder 결과 사용 ({len(products)}개)")
+            # Reclamefolder와 공식 사이트를 동시에 시작 (비동기 브라우저 하나 사용)
+            products, screenshot_ok = asyncio.run(race_ah_sources_standalone(week_type))
+        else:
+            harvester = NetworkHarvester(name)
+            screenshot = capture_screenshot(name, config, harvester=harvester)
+            products = extract_store_products(screenshot, harvester, name, week_type)
+            screenshot_ok = screenshot is not None
         
         # 마트별 최소 상품 수 (로그 분석 기반)
         # Albert Heijn: 3개 (Reclamefolder에서 3개도 유효)
         # 나머지: 5개 (안정적인 크롤링을 위해)
-        min_products = 3 if name == 'Albert Heijn' else 5
+        min_products = AH_MIN_PRODUCTS if name == 'Albert Heijn' else 5
         
         if products and len(products) >= min_products:
             all_products.extend(products)
@@ -514,7 +580,7 @@ def scrape_week(week_type='next'):
             print(f"  💚 {name} 성공!")
         else:
             failed.append(name)
-            if not screenshot:
+            if not screenshot_ok:
                 print(f"  ❌ {name} 실패 (스크린샷 실패)")
             else:
                 print(f"  ⚠️ {name} 실패 (상품 부족: {len(products) if products else 0}개, 최소 {min_products}개 필요)")
@@ -525,6 +591,10 @@ def scrape_week(week_type='next'):
         print(f"\n⏳ 다음 마트 대기... ({wait_between_stores}초)\n")
         time.sleep(wait_between_stores)
     
+    return report_week_results(label, week_type, all_products, successful, failed)
+
+def report_week_results(label, week_type, all_products, successful, failed):
+    """주차 결과 저장 및 요약 출력"""
     # 결과 저장
     if all_products:
         save_results(all_products, successful, failed, week_type)
@@ -548,29 +618,290 @@ def scrape_week(week_type='next'):
         print(f"\n❌ {label} 모든 마트 실패")
         return False
 
-def main(week_type='both'):
-    """메인 실행"""
+# 비동기 모드: 브라우저 하나 + 마트별 컨텍스트 + 동시 처리
+
+def capture_deadline(config):
+    """마트 하나의 캡처 전체 상한 (초): 페이지 타임아웃 + 대기/스크롤 여유"""
+    return config.get('timeout', 90000) / 1000 + config.get('wait_time', 5) + 30
+
+async def capture_screenshot_async(browser, name, config, tag='hybrid', harvester=None):
+    """
+    스크린샷 캡처 (비동기, 공유 브라우저에서 마트 전용 컨텍스트 사용)
+    
+    실패 시 새 컨텍스트로 최대 2회 재시도하며,
+    시도마다 capture_deadline() 안에 끝나지 않으면 타임아웃 처리합니다.
+    harvester가 있으면 페이지 로딩 중 JSON 응답도 기록합니다.
+    """
+    max_retries = 2
+    slug = name.lower().replace(' ', '_')
+    
+    for retry in range(max_retries + 1):
+        print(f"📸 [{name}] 스크린샷 캡처" + (f" (재시도 {retry})" if retry > 0 else "") + f" - {config['url']}")
+        if harvester and retry > 0:
+            harvester.reset()  # 실패한 시도의 응답은 버리고 새로 수집
+        consent = ConsentState(config['url'], store=name)
+        context = await browser.new_context(
+            user_agent=BROWSER_USER_AGENT, viewport=BROWSER_VIEWPORT, **consent.context_options()
+        )
+        blocker = await RequestBlocker(name, config['url']).install_async(context)
+        try:
+            return await asyncio.wait_for(
+                _capture_page_async(context, name, config, f"{slug}_{tag}", consent, harvester),
+                timeout=capture_deadline(config)
+            )
+        except asyncio.TimeoutError:
+            print(f"❌ [{name}] 캡처 시간 초과 ({capture_deadline(config):.0f}초)")
+        except Exception as e:
+            print(f"❌ [{name}] 오류: {str(e)[:100]}")
+        finally:
+            blocker.report()
+            await context.close()
+    
+    return None
+
+async def _capture_page_async(context, name, config, file_stem, consent, harvester=None):
+    page = await context.new_page()
+    if harvester:
+        harvester.attach_async(page)
+    
+    timeout = config.get('timeout', 90000)
+    await page.goto(config['url'], timeout=timeout)
+    await page.wait_for_load_state("networkidle", timeout=timeout)
+    
+    # 렌더링 대기 (wait_time은 상한, 페이지가 안정되면 바로 진행)
+    readiness = ReadinessLog(name)
+    await readiness.wait_async(page, config.get('wait_time', 5))
+    
+    # 스크롤 (lazy loading 트리거)
+    if config.get('scroll'):
+        for _ in range(config.get('scroll_iterations', 5)):
+            await page.evaluate("window.scrollBy(0, 800)")
+            await readiness.wait_async(page, 1.2, quiet_ms=300)
+        await page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+        await readiness.wait_async(page, 2, quiet_ms=500)
+        await page.evaluate("window.scrollTo(0, 0)")
+        await readiness.wait_async(page, 2, quiet_ms=500)
+    
+    # 쿠키 동의 (저장된 동의 상태가 유효하면 생략)
+    if await consent.needs_banner_async(page):
+        accepted = False
+        for text in ['accepteren', 'accept', 'akkoord', 'allow', 'agree']:
+            try:
+                button = page.get_by_role("button", name=re.compile(text, re.IGNORECASE)).first
+                if await button.is_visible(timeout=2000):
+                    await button.click()
+                    accepted = True
+                    await readiness.wait_async(page, 2, quiet_ms=500)
+                    print(f"🍪 [{name}] 쿠키 동의 완료")
+                    break
+            except Exception:
+                pass
+        await consent.save_async(context, accepted=accepted)
+    readiness.report()
+    if harvester:
+        await harvester.drain()
+    
+    screenshot_dir = PROJECT_ROOT / "data" / "screenshots"
+    screenshot_dir.mkdir(exist_ok=True)
+    screenshot_path = screenshot_dir / f"{file_stem}.png"
+    
+    await page.screenshot(path=str(screenshot_path), full_page=True)
+    file_size = screenshot_path.stat().st_size / 1024
+    print(f"✅ [{name}] 저장: {screenshot_path.name} ({file_size:.0f}KB)")
+    return screenshot_path
+
+async def capture_and_extract_async(browser, slots, name, config, week_type, tag):
+    """
+    소스 하나 처리: 캡처(+ JSON 응답 기록) → 상품 추출
+    
+    Returns:
+        (products, screenshot_ok)
+    """
+    harvester = NetworkHarvester(name)
+    async with slots:
+        screenshot = await capture_screenshot_async(browser, name, config, tag=tag, harvester=harvester)
+    # AI 분석은 동기 SDK 호출이므로 스레드에서 실행 (공용 제한기가 속도 관리)
+    products = await asyncio.to_thread(extract_store_products, screenshot, harvester, name, week_type)
+    return products, screenshot is not None
+
+async def race_ah_sources_async(browser, slots, week_type, merge=None):
+    """
+    Albert Heijn: Reclamefolder와 공식 사이트(ah.nl/bonus)를 동시에 처리
+    
+    기본은 먼저 AH_MIN_PRODUCTS개 이상을 낸 소스를 사용하고 나머지는 취소합니다.
+    (이미 시작된 AI 분석 스레드는 끝까지 실행되지만 결과는 버림)
+    merge=True(기본값 AH_MERGE_SOURCES)면 두 소스를 모두 기다려 중복 없이 병합합니다.
+    
+    Returns:
+        (products, screenshot_ok)
+    """
+    name = 'Albert Heijn'
+    merge = AH_MERGE_SOURCES if merge is None else merge
+    started = time.perf_counter()
+    sources = {
+        'Reclamefolder': (STORES[name], f"{week_type}_hybrid"),
+        '공식 사이트': (AH_OFFICIAL_CONFIG, f"{week_type}_official_hybrid"),
+    }
+    tasks = {
+        asyncio.create_task(capture_and_extract_async(browser, slots, name, config, week_type, tag)): label
+        for label, (config, tag) in sources.items()
+    }
+    print(f"🏁 [{name}] {' + '.join(sources)} 동시 시작" + (" (병합 모드)" if merge else ""))
+    
+    results = {}
+    pending = set(tasks)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                label = tasks[task]
+                try:
+                    results[label] = task.result()
+                except Exception as e:
+                    print(f"❌ [{name}] {label} 실패: {str(e)[:100]}")
+                    results[label] = (None, False)
+                    continue
+                products = results[label][0] or []
+                print(f"📥 [{name}] {label}: {len(products)}개 ({time.perf_counter() - started:.0f}초)")
+                if not merge and len(products) >= AH_MIN_PRODUCTS:
+                    if pending:
+                        print(f"✅ [{name}] {label} 결과 사용, {', '.join(tasks[t] for t in pending)} 취소")
+                    return products, True
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+    
+    screenshot_ok = any(ok for _, ok in results.values())
+    if merge:
+        products = merge_tile_products([results.get(label, (None, False))[0] or [] for label in sources])
+        print(f"🔀 [{name}] 두 소스 병합: {len(products)}개 ({time.perf_counter() - started:.0f}초)")
+        return products, screenshot_ok
+    # 둘 다 기준 미달: 더 많이 나온 쪽 사용
+    products = max((result[0] or [] for result in results.values()), key=len, default=[])
+    return products, screenshot_ok
+
+async def race_ah_sources_standalone(week_type, merge=None):
+    """순차 모드용: 브라우저를 따로 띄워 race_ah_sources_async 실행"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            return await race_ah_sources_async(browser, asyncio.Semaphore(2), week_type, merge)
+        finally:
+            await browser.close()
+
+async def process_store_async(browser, slots, name, config, week_type):
+    """
+    마트 하나 처리: 캡처(+ JSON 응답 기록) → 상품 추출
+    (Albert Heijn은 두 소스를 동시에 처리)
+    
+    Returns:
+        (products, screenshot_ok)
+    """
+    if name == 'Albert Heijn':
+        return await race_ah_sources_async(browser, slots, week_type)
+    return await capture_and_extract_async(browser, slots, name, config, week_type, f"{week_type}_hybrid")
+
+async def scrape_week_async(browser, slots, week_type='next'):
+    """특정 주차 크롤링 (비동기, 마트 동시 처리)"""
+    if week_type == 'current':
+        week_monday = get_current_week()
+        label = "이번 주"
+    else:
+        week_monday = get_next_monday()
+        label = "다음 주"
+    
+    print(f"\n📅 {label} 주차: {week_monday.year}-{week_monday.isocalendar()[1]:02d}주")
+    print(f"🎯 대상: {len(STORES)}개 마트 (동시 {BROWSER_CONCURRENCY}개)\n")
+    
+    outcomes = await asyncio.gather(
+        *(process_store_async(browser, slots, name, config, week_type) for name, config in STORES.items()),
+        return_exceptions=True
+    )
+    
+    all_products = []
+    successful = []
+    failed = []
+    for name, outcome in zip(STORES, outcomes):
+        if isinstance(outcome, BaseException):
+            print(f"  ❌ {name} 실패 ({str(outcome)[:100]})")
+            failed.append(name)
+            continue
+        
+        products, screenshot_ok = outcome
+        min_products = AH_MIN_PRODUCTS if name == 'Albert Heijn' else 5
+        if products and len(products) >= min_products:
+            all_products.extend(products)
+            successful.append(name)
+            print(f"  💚 {label} {name} 성공!")
+        else:
+            failed.append(name)
+            if not screenshot_ok:
+                print(f"  ❌ {label} {name} 실패 (스크린샷 실패)")
+            else:
+                print(f"  ⚠️ {label} {name} 실패 (상품 부족: {len(products) if products else 0}개, 최소 {min_products}개 필요)")
+    
+    return report_week_results(label, week_type, all_products, successful, failed)
+
+async def scrape_weeks_async(week_types):
+    """여러 주차를 브라우저 하나로 동시에 크롤링"""
+    start = time.perf_counter()
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            slots = asyncio.Semaphore(BROWSER_CONCURRENCY)
+            results = await asyncio.gather(
+                *(scrape_week_async(browser, slots, week_type) for week_type in week_types)
+            )
+        finally:
+            await browser.close()
+    print(f"\n⏱️ 전체 소요 시간: {(time.perf_counter() - start) / 60:.1f}분")
+    return results
+
+def main(week_type='both', use_async=True):
+    """
+    메인 실행
+    
+    Args:
+        week_type: 'current', 'next', 'both'
+        use_async: True면 브라우저 하나로 마트/주차를 동시에 처리 (기본),
+                   False면 기존 순차 모드
+    """
     print("\n" + "="*70)
     print("🍳 What2Cook NL 시스템 가동")
     print("🤖 하이브리드 크롤러 (현재 주 + 다음 주)")
-    print("   - Albert Heijn: Reclamefolder (이전 작동 방식)")
+    print("   - Albert Heijn: Reclamefolder + 공식 사이트 동시 (먼저 충분한 쪽 사용)")
     print("   - 나머지: 공식 사이트")
     print("="*70)
     
-    if week_type == 'both' or week_type == 'current':
-        print("\n" + "="*70)
-        print("📦 1단계: 이번 주 세일 크롤링")
-        print("="*70)
-        scrape_week('current')
+    week_types = ['current', 'next'] if week_type == 'both' else [week_type]
     
-    if week_type == 'both' or week_type == 'next':
-        print("\n" + "="*70)
-        print("📦 2단계: 다음 주 세일 크롤링")
-        print("="*70)
-        scrape_week('next')
+    if use_async:
+        print(f"\n⚡ 비동기 모드: 브라우저 1개, 동시 {BROWSER_CONCURRENCY}개 마트, 주차 {', '.join(week_types)}")
+        asyncio.run(scrape_weeks_async(week_types))
+    else:
+        for step, wt in enumerate(week_types, 1):
+            print("\n" + "="*70)
+            print(f"📦 {step}단계: {'이번 주' if wt == 'current' else '다음 주'} 세일 크롤링")
+            print("="*70)
+            scrape_week(wt)
     
     print("\n✅ 크롤링 완료!")
     print("✅ 다음: python3 recipe_matcher.py")
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="하이브리드 크롤러")
+    parser.add_argument('--week', choices=['current', 'next', 'both'], default='both')
+    parser.add_argument('--sync', action='store_true', help='기존 순차 모드 (마트마다 브라우저 실행)')
+    parser.add_argument('--concurrency', type=int, help=f'동시 처리 마트 수 (기본 {BROWSER_CONCURRENCY})')
+    parser.add_argument('--ah-merge', action='store_true',
+                        help='Albert Heijn: 먼저 끝난 소스 대신 두 소스 결과를 모두 병합')
+    args = parser.parse_args()
+    if args.concurrency:
+        BROWSER_CONCURRENCY = args.concurrency
+    if args.ah_merge:
+        AH_MERGE_SOURCES = True
+    main(args.week, use_async=not args.sync)
@@ -2,18 +2,44 @@
 메인 크롤러
 모든 슈퍼마켓을 크롤링하고 weekly_sales.json에 저장
 """
+import asyncio
 import json
+import os
 import sys
+import time
+from dataclasses import dataclass, field
 from pathlib import Path
 from datetime import datetime, timedelta
+from playwright.async_api import async_playwright
 
 # 프로젝트 루트 경로 추가
 PROJECT_ROOT = Path(__file__).parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 
-from scrapers.store_config import STORES, PRIORITY_STORES, VALIDATION_CONFIG
+from scrapers.store_config import STORES, PRIORITY_STORES, SCRAPING_CONFIG, VALIDATION_CONFIG
 from scrapers.base_scraper import BaseScraper
 
+# 동시에 처리할 마트 수 (브라우저 하나에 마트별 컨텍스트, --concurrency 로도 설정)
+STORE_CONCURRENCY = int(os.getenv("STORE_CONCURRENCY", "3"))
+# 마트 한 번 시도의 상한 (초, --deadline 으로도 설정)
+STORE_DEADLINE = float(os.getenv("STORE_DEADLINE", "180"))
+RETRY_DELAY = 3  # 재시도 전 대기 (초)
+MAX_ATTEMPTS = max(0, SCRAPING_CONFIG['max_retries']) + 1  # 첫 시도 + 재시도
+
+
+@dataclass
+class StoreOutcome:
+    """마트 하나의 크롤링 결과 (검증 후 상품)"""
+    name: str
+    products: list = field(default_factory=list)
+    attempts: int = 0
+    error: str = ''
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return len(self.products) >= VALIDATION_CONFIG['min_products']
+
 
 def get_next_monday():
     """다음 월요일 날짜 계산 (월요일이면 당일)"""
@@ -51,6 +77,88 @@ def validate_products(products: list, store_name: str) -> list:
     return validated
 
 
+async def scrape_store_async(browser, slots, store_config: dict) -> StoreOutcome:
+    """
+    마트 하나 크롤링 (공유 브라우저, 시도마다 STORE_DEADLINE 상한)
+    
+    예외/시간 초과/상품 없음이면 SCRAPING_CONFIG['max_retries']회까지 다시 시도하고
+    (첫 시도 포함 최대 max_retries + 1회), 끝나는 즉시 validate_products로 검증합니다.
+    """
+    name = store_config['name']
+    outcome = StoreOutcome(name)
+    started = time.perf_counter()
+    
+    for attempt in range(1, MAX_ATTEMPTS + 1):
+        outcome.attempts = attempt
+        products = []
+        async with slots:
+            try:
+                scraper = BaseScraper(store_config, PROJECT_ROOT)
+                products = await asyncio.wait_for(scraper.scrape_async(browser), timeout=STORE_DEADLINE)
+                outcome.error = '' if products else '상품 없음'
+            except asyncio.TimeoutError:
+                outcome.error = f"시간 초과 ({STORE_DEADLINE:.0f}초)"
+            except Exception as e:
+                outcome.error = str(e)[:100]
+        
+        if products:
+            outcome.products = validate_products(products, name)
+            if not outcome.ok:
+                outcome.error = f"최소 상품 수({VALIDATION_CONFIG['min_products']}) 미달"
+            break
+        
+        print(f"  ⚠️ [{name}] {outcome.error} ({attempt}/{MAX_ATTEMPTS})")
+        if attempt < MAX_ATTEMPTS:
+            await asyncio.sleep(RETRY_DELAY)
+    
+    outcome.elapsed = time.perf_counter() - started
+    return outcome
+
+
+async def scrape_stores_async(stores: dict) -> list:
+    """여러 마트를 브라우저 하나로 동시에 크롤링 (끝나는 순서대로 결과 출력)"""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=SCRAPING_CONFIG['headless'])
+        try:
+            slots = asyncio.Semaphore(STORE_CONCURRENCY)
+            tasks = [asyncio.create_task(scrape_store_async(browser, slots, config)) for config in stores.values()]
+            outcomes = []
+            for finished in asyncio.as_completed(tasks):
+                outcome = await finished
+                outcomes.append(outcome)
+                status = f"✅ {len(outcome.products)}개 상품" if outcome.ok else f"❌ {outcome.error}"
+                print(f"🏁 [{outcome.name}] {status} (시도 {outcome.attempts}회, {outcome.elapsed:.0f}초)")
+            return outcomes
+        finally:
+            await browser.close()
+
+
+def scrape_stores_sequential(stores: dict) -> list:
+    """기존 순차 모드: 마트마다 브라우저를 띄워 하나씩 크롤링"""
+    outcomes = []
+    for store_id, store_config in stores.items():
+        outcome = StoreOutcome(store_config['name'], attempts=1)
+        try:
+            # 크롤러 생성 및 실행
+            scraper = BaseScraper(store_config, PROJECT_ROOT)
+            products = scraper.scrape()
+            
+            if products:
+                # 데이터 검증
+                outcome.products = validate_products(products, store_config['name'])
+                if not outcome.ok:
+                    print(f"  ⚠️ 최소 상품 수({VALIDATION_CONFIG['min_products']})를 만족하지 못했습니다.")
+            
+        except Exception as e:
+            print(f"❌ {store_config['name']} 오류: {str(e)}")
+        outcomes.append(outcome)
+        
+        # 다음 마트 대기
+        print("\n⏳ 다음 마트 대기 중...\n")
+        time.sleep(3)
+    return outcomes
+
+
 def save_results(all_products: list, successful_stores: list, failed_stores: list):
     """결과를 weekly_sales.json에 저장"""
     next_monday = get_next_monday()
@@ -87,8 +195,14 @@ def save_results(all_products: list, successful_stores: list, failed_stores: lis
     print(f"\n💾 {output_path.name} 저장 완료")
 
 
-def main(priority_only=False):
-    """메인 실행 함수"""
+def main(priority_only=False, use_async=True):
+    """
+    메인 실행 함수
+    
+    Args:
+        priority_only: 우선순위 마트만 크롤링
+        use_async: True면 브라우저 하나로 마트를 동시에 처리 (기본), False면 기존 순차 모드
+    """
     print("\n" + "="*70)
     print("🍳 What2Cook NL 시스템 가동")
     print("🤖 슈퍼마켓 크롤러 시작 (공식 사이트)")
@@ -106,37 +220,20 @@ def main(priority_only=False):
         stores_to_scrape = STORES
         print(f"🎯 전체 {len(STORES)}개 마트 크롤링\n")
     
-    all_products = []
-    successful_stores = []
-    failed_stores = []
+    start = time.perf_counter()
+    if use_async:
+        print(f"⚡ 동시 {STORE_CONCURRENCY}개 마트, 마트당 {STORE_DEADLINE:.0f}초 제한, 최대 {MAX_ATTEMPTS}회 시도\n")
+        outcomes = asyncio.run(scrape_stores_async(stores_to_scrape))
+    else:
+        outcomes = scrape_stores_sequential(stores_to_scrape)
+    print(f"\n⏱️ 전체 소요 시간: {(time.perf_counter() - start) / 60:.1f}분")
     
-    for store_id, store_config in stores_to_scrape.items():
-        try:
-            # 크롤러 생성 및 실행
-            scraper = BaseScraper(store_config, PROJECT_ROOT)
-            products = scraper.scrape()
-            
-            if products:
-                # 데이터 검증
-                validated = validate_products(products, store_config['name'])
-                
-                if validated and len(validated) >= VALIDATION_CONFIG['min_products']:
-                    all_products.extend(validated)
-                    successful_stores.append(store_config['name'])
-                else:
-                    print(f"  ⚠️ 최소 상품 수({VALIDATION_CONFIG['min_products']})를 만족하지 못했습니다.")
-                    failed_stores.append(store_config['name'])
-            else:
-                failed_stores.append(store_config['name'])
-            
-        except Exception as e:
-            print(f"❌ {store_config['name']} 오류: {str(e)}")
-            failed_stores.append(store_config['name'])
-        
-        # 다음 마트 대기
-        import time
-        print("\n⏳ 다음 마트 대기 중...\n")
-        time.sleep(3)
+    # 설정 순서대로 집계
+    order = [config['name'] for config in stores_to_scrape.values()]
+    outcomes.sort(key=lambda outcome: order.index(outcome.name))
+    all_products = [p for outcome in outcomes if outcome.ok for p in outcome.products]
+    successful_stores = [outcome.name for outcome in outcomes if outcome.ok]
+    failed_stores = [outcome.name for outcome in outcomes if not outcome.ok]
     
     # 결과 저장
     if all_products:
@@ -179,8 +276,15 @@ if __name__ == "__main__":
         action='store_true',
         help='우선순위 마트만 크롤링 (AH, Dirk, Aldi)'
     )
+    parser.add_argument('--sequential', action='store_true', help='기존 순차 모드 (마트마다 브라우저 실행)')
+    parser.add_argument('--concurrency', type=int, help=f'동시 처리 마트 수 (기본 {STORE_CONCURRENCY})')
+    parser.add_argument('--deadline', type=float, help=f'마트 한 번 시도의 상한 초 (기본 {STORE_DEADLINE:.0f})')
     
     args = parser.parse_args()
+    if args.concurrency:
+        STORE_CONCURRENCY = args.concurrency
+    if args.deadline:
+        STORE_DEADLINE = args.deadline
     
-    success = main(priority_only=args.priority)
+    success = main(priority_only=args.priority, use_async=not args.sequential)
     sys.exit(0 if success else 1)
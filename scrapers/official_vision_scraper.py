@@ -6,6 +6,7 @@ import os
 import json
 import time
 import base64
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
@@ -16,6 +17,10 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scraper.gemini_limiter import call_gemini
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -24,8 +29,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -173,7 +176,7 @@ def analyze_with_ai(screenshot_path, store_name):
 ]
 ```"""
 
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -184,7 +187,7 @@ def analyze_with_ai(screenshot_path, store_name):
                     ]
                 )
             ]
-        )
+        ))
         
         response_text = response.text.strip()
         
@@ -281,10 +284,6 @@ def main():
                 failed.append(name)
         else:
             failed.append(name)
-        
-        # 대기
-        print("\n⏳ 다음 마트 대기...\n")
-        time.sleep(5)
     
     # 결과
     if all_products:
@@ -6,6 +6,7 @@ import os
 import json
 import time
 import base64
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from datetime import datetime, timedelta
@@ -16,6 +17,16 @@ from dotenv import load_dotenv
 # 환경 설정
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scrapers.utils.consent_state import ConsentState
+from scrapers.utils.network_harvest import NetworkHarvester
+from scrapers.utils.page_readiness import ReadinessLog
+from scrapers.utils.request_blocking import RequestBlocker
+from scrapers.utils.vision_cache import get_vision_cache
+from scraper.json_salvage import parse_json_array
+from scraper.vision_retry import run_vision_request_sync
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -24,8 +35,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -89,8 +98,8 @@ def get_next_monday():
     today = datetime.now()
     return today if today.weekday() == 0 else today + timedelta(days=(7 - today.weekday()))
 
-def capture_screenshot(name, config, retry=0):
-    """마트 페이지 스크린샷 캡처 (재시도 로직)"""
+def capture_screenshot(name, config, retry=0, harvester=None):
+    """마트 페이지 스크린샷 캡처 (재시도 로직, harvester가 있으면 JSON 응답도 기록)"""
     max_retries = 2
     
     print(f"\n{'='*70}")
@@ -101,12 +110,18 @@ def capture_screenshot(name, config, retry=0):
     try:
         with sync_playwright() as p:
             browser = p.chromium.launch(headless=True)
+            consent = ConsentState(config['url'], store=name)
             context = browser.new_context(
                 user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
-                viewport={'width': 1920, 'height': 1080}
+                viewport={'width': 1920, 'height': 1080},
+                **consent.context_options()
             )
+            # 광고/트래커/폰트/동영상 차단 (스크린샷 분석용이므로 이미지는 허용)
+            blocker = RequestBlocker(name, config['url']).install(context)
             
             page = context.new_page()
+            if harvester:
+                harvester.attach(page)
             
             # 타임아웃 설정
             timeout = config.get('timeout', 90000)
@@ -115,29 +130,37 @@ def capture_screenshot(name, config, retry=0):
             page.goto(config['url'], timeout=timeout)
             page.wait_for_load_state("networkidle", timeout=timeout)
             
+            # 렌더링 대기 (wait_time은 상한, 페이지가 안정되면 바로 진행)
+            readiness = ReadinessLog(name)
             wait_time = config.get('wait_time', 6)
-            print(f"⏳ 페이지 렌더링 대기: {wait_time}초")
-            time.sleep(wait_time)
+            print(f"⏳ 페이지 렌더링 대기: 최대 {wait_time}초")
+            readiness.wait(page, wait_time)
             
-            # 쿠키 동의
-            try:
-                for text in ['accepteren', 'accept', 'akkoord', 'toestaan', 'alle cookies']:
-                    try:
-                        button = page.get_by_role("button", name=text, exact=False).first
-                        if button.is_visible(timeout=2000):
-                            button.click()
-                            time.sleep(2)
-                            print("🍪 쿠키 동의 완료")
-                            break
-                    except:
-                        pass
-            except:
-                pass
+            # 쿠키 동의 (저장된 동의 상태가 유효하면 생략)
+            if consent.needs_banner(page):
+                accepted = False
+                try:
+                    for text in ['accepteren', 'accept', 'akkoord', 'toestaan', 'alle cookies']:
+                        try:
+                            button = page.get_by_role("button", name=text, exact=False).first
+                            if button.is_visible(timeout=2000):
+                                button.click()
+                                accepted = True
+                                readiness.wait(page, 2, quiet_ms=500)
+                                print("🍪 쿠키 동의 완료")
+                                break
+                        except:
+                            pass
+                except:
+                    pass
+                consent.save(context, accepted=accepted)
             
             # '다음 주' 버튼 클릭 시도
             if config.get('click_next_week'):
                 print("🖱️  '다음 주' 버튼 클릭 시도...")
                 clicked = False
+                if harvester:
+                    harvester.reset()  # 이번 주 응답 제외
                 
                 # 여러 방법으로 시도
                 try:
@@ -148,7 +171,7 @@ def capture_screenshot(name, config, retry=0):
                             for element in elements:
                                 if element.is_visible(timeout=1000):
                                     element.click()
-                                    time.sleep(4)
+                                    readiness.wait(page, 4)
                                     print(f"  ✅ '{text}' 클릭 성공")
                                     clicked = True
                                     break
@@ -163,7 +186,7 @@ def capture_screenshot(name, config, retry=0):
                             link = page.locator("a[href*='volgende']").first
                             if link.is_visible(timeout=1000):
                                 link.click()
-                                time.sleep(4)
+                                readiness.wait(page, 4)
                                 print("  ✅ 'volgende' 링크 클릭 성공")
                                 clicked = True
                         except:
@@ -175,6 +198,9 @@ def capture_screenshot(name, config, retry=0):
                 if not clicked:
                     print("  ⚠️ 다음 주 버튼을 찾을 수 없습니다 (현재 페이지 사용)")
             
+            readiness.report()
+            blocker.report()
+            
             # 스크린샷
             screenshot_dir = PROJECT_ROOT / "data" / "screenshots"
             screenshot_dir.mkdir(exist_ok=True)
@@ -194,21 +220,73 @@ def capture_screenshot(name, config, retry=0):
         if retry < max_retries:
             print(f"🔄 {5}초 후 재시도...")
             time.sleep(5)
-            return capture_screenshot(name, config, retry + 1)
+            if harvester:
+                harvester.reset()  # 실패한 시도의 응답은 버리고 새로 수집
+            return capture_screenshot(name, config, retry + 1, harvester)
         
         return None
 
-def analyze_with_ai(screenshot_path, store_name, retry=0):
-    """Gemini Vision으로 스크린샷 분석 (재시도 로직)"""
-    max_retries = 2
+def filter_food_products(products_data, store_name):
+    """Vision 응답 항목 → 식품 상품 목록 (비식품/이상한 이름 제외)"""
+    if not isinstance(products_data, list):
+        raise ValueError("JSON은 배열이어야 합니다")
+    
+    products = []
+    for item in products_data:
+        if isinstance(item, dict) and 'name' in item:
+            name = item['name']
+            name_lower = name.lower()
+            
+            # 비식품 필터링 (강화)
+            non_food = [
+                'gordijn', 'dekbed', 'ticket', 'trein', 'toiletblok', 
+                'speelgoed', 'kleding', 'jurk', 'broek', 'shirt',
+                'vtwonen', 'home creation', 'servies', 'handdoek',
+                'lamp', 'stoel', 'tafel', 'kussen'
+            ]
+            
+            if any(kw in name_lower for kw in non_food):
+                continue
+            
+            # 이름 길이 체크
+            if len(name) < 3 or len(name) > 150:
+                continue
+            
+            products.append({
+                'name': name,
+                'price': item.get('price'),
+                'discount': item.get('discount'),
+                'supermarket': store_name
+            })
+    return products
+
+def parse_vision_response(response_text, store_name):
+    """Vision 응답 텍스트 → 식품 상품 목록 (잘린 응답은 완전한 객체만, JSON이 없으면 예외)"""
+    result = parse_json_array(response_text, label=store_name)
+    if not result.items and not result.complete:
+        raise ValueError(f"JSON 배열을 찾을 수 없음: {response_text[:80]!r}")
+    return filter_food_products(result.items, store_name)
+
+def analyze_with_ai(screenshot_path, store_name):
+    """
+    Gemini Vision으로 스크린샷 분석
     
-    print(f"🔍 AI 분석 중..." + (f" (재시도 {retry}/{max_retries})" if retry > 0 else ""))
+    이미지 인코딩/프롬프트는 한 번만 만들고, 재시도 실행기가 시도별·전체 시간 제한과
+    지수 대기로 다시 요청합니다. 잘린 JSON 응답은 재요청 없이 완전한 객체만 사용합니다.
+    """
+    print(f"🔍 AI 분석 중...")
     
-    try:
-        with open(screenshot_path, 'rb') as f:
-            image_data = base64.b64encode(f.read()).decode('utf-8')
-        
-        prompt = f"""이 이미지는 네덜란드 슈퍼마켓 **{store_name}**의 공식 세일 페이지 스크린샷입니다.
+    # 같은 세일 주차에 거의 같은 화면을 이미 분석했으면 그 결과 사용
+    cache = get_vision_cache(f"official_v2_{store_name}", week=get_next_monday().strftime('%Y-%m-%d'))
+    raw_image = Path(screenshot_path).read_bytes()
+    cached = cache.lookup(raw_image)
+    if cached:
+        print(f"♻️ 캐시 적중 (지각 해시): {len(cached)}개 식품, AI 분석 생략")
+        return cached
+    
+    image_data = base64.b64encode(raw_image).decode('utf-8')
+    
+    prompt = f"""이 이미지는 네덜란드 슈퍼마켓 **{store_name}**의 공식 세일 페이지 스크린샷입니다.
 
 **중요 작업**:
 1. 이미지에서 보이는 **모든 식품 세일 상품**을 추출하세요
@@ -231,105 +309,46 @@ def analyze_with_ai(screenshot_path, store_name, retry=0):
   {{"name": "Hollandse aardappelen 2kg", "price": "€1.99", "discount": null}},
   {{"name": "Verse tomaten", "price": "€2.49", "discount": "1+1 gratis"}}
 ]"""
-
-        response = client.models.generate_content(
-            model='gemini-2.0-flash-001',
-            contents=[
-                types.Content(
-                    role='user',
-                    parts=[
-                        types.Part(text=prompt),
-                        types.Part(inline_data=types.Blob(mime_type='image/png', data=image_data))
-                    ]
-                )
-            ],
-            config=types.GenerateContentConfig(
-                temperature=0.3,  # 더 일관된 출력
-                max_output_tokens=8000
-            )
+    
+    contents = [
+        types.Content(
+            role='user',
+            parts=[
+                types.Part(text=prompt),
+                types.Part(inline_data=types.Blob(mime_type='image/png', data=image_data))
+            ]
         )
-        
-        response_text = response.text.strip()
-        
-        # JSON 추출 (여러 방법 시도)
-        import re
-        
-        # 방법 1: ```json 코드 블록
-        json_match = re.search(r'```json\s*(.*?)\s*```', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(1)
-        # 방법 2: ``` 코드 블록
-        elif '```' in response_text:
-            response_text = response_text.strip('`').strip()
-            if response_text.startswith('json'):
-                response_text = response_text[4:].strip()
-        # 방법 3: [ 로 시작하는 부분 찾기
-        elif '[' in response_text:
-            start = response_text.index('[')
-            end = response_text.rindex(']') + 1
-            response_text = response_text[start:end]
-        
-        # JSON 파싱
-        products_data = json.loads(response_text)
-        
-        if not isinstance(products_data, list):
-            raise ValueError("JSON은 배열이어야 합니다")
-        
-        products = []
-        for item in products_data:
-            if isinstance(item, dict) and 'name' in item:
-                name = item['name']
-                name_lower = name.lower()
-                
-                # 비식품 필터링 (강화)
-                non_food = [
-                    'gordijn', 'dekbed', 'ticket', 'trein', 'toiletblok', 
-                    'speelgoed', 'kleding', 'jurk', 'broek', 'shirt',
-                    'vtwonen', 'home creation', 'servies', 'handdoek',
-                    'lamp', 'stoel', 'tafel', 'kussen'
-                ]
-                
-                if any(kw in name_lower for kw in non_food):
-                    continue
-                
-                # 이름 길이 체크
-                if len(name) < 3 or len(name) > 150:
-                    continue
-                
-                products.append({
-                    'name': name,
-                    'price': item.get('price'),
-                    'discount': item.get('discount'),
-                    'supermarket': store_name
-                })
-        
-        if products:
-            print(f"✅ {len(products)}개 식품 추출!")
-            return products
-        else:
-            raise ValueError("추출된 식품이 없습니다")
-        
-    except json.JSONDecodeError as e:
-        print(f"⚠️ JSON 파싱 오류: {str(e)[:100]}")
-        print(f"  응답 시작: {response_text[:200] if 'response_text' in locals() else 'N/A'}")
-        
-        # 재시도
-        if retry < max_retries:
-            print(f"🔄 {3}초 후 AI 재분석...")
-            time.sleep(3)
-            return analyze_with_ai(screenshot_path, store_name, retry + 1)
-        
-        return []
-        
-    except Exception as e:
-        print(f"❌ AI 분석 오류: {str(e)[:100]}")
-        
-        if retry < max_retries:
-            print(f"🔄 {3}초 후 AI 재분석...")
-            time.sleep(3)
-            return analyze_with_ai(screenshot_path, store_name, retry + 1)
-        
-        return []
+    ]
+    generate_config = types.GenerateContentConfig(
+        temperature=0.3,  # 더 일관된 출력
+        max_output_tokens=8000
+    )
+    
+    # run_vision_request_sync는 새 이벤트 루프에서 실행되므로 비동기 클라이언트도 여기서 만듦
+    aio = genai.Client(api_key=api_key).aio
+    
+    async def request():
+        # 비동기 호출이라 시간 초과 시 요청도 취소됨 (제한기/재시도는 실행기가 관리)
+        response = await aio.models.generate_content(
+            model='gemini-2.0-flash-001', contents=contents, config=generate_config
+        )
+        return response.text
+    
+    products = run_vision_request_sync(
+        request,
+        parse=lambda text: parse_vision_response(text, store_name),
+        retry_empty=True,
+        label=store_name,
+    )
+    
+    if products:
+        cache.store(raw_image, products)
+        cache.save()
+        print(f"✅ {len(products)}개 식품 추출!")
+        return products
+    
+    print("❌ AI 분석 실패: 추출된 식품이 없습니다")
+    return []
 
 def save_results(all_products, successful, failed):
     """결과 저장"""
@@ -387,12 +406,15 @@ def main(only_failed=False):
     failed = []
     
     for name, config in stores_to_scrape.items():
-        # 1. 스크린샷 캡처
-        screenshot = capture_screenshot(name, config)
+        # 1. 스크린샷 캡처 (+ 로딩 중 JSON 응답 기록)
+        harvester = NetworkHarvester(name)
+        screenshot = capture_screenshot(name, config, harvester=harvester)
         
         if screenshot:
-            # 2. AI 분석
-            products = analyze_with_ai(screenshot, name)
+            # 2. JSON 응답에서 충분히 나오면 사용, 아니면 AI 분석
+            products = harvester.usable_products()
+            if not products:
+                products = analyze_with_ai(screenshot, name)
             
             if products and len(products) >= 5:
                 all_products.extend(products)
@@ -404,10 +426,6 @@ def main(only_failed=False):
         else:
             failed.append(name)
             print(f"  ❌ {name} 실패 (스크린샷 실패)")
-        
-        # 대기
-        print("\n⏳ 다음 마트 대기 (API 제한 방지)...\n")
-        time.sleep(8)
     
     # 결과
     if all_products:
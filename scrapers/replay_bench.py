@@ -0,0 +1,353 @@
+"""
+저장된 HTML 재생 벤치마크 (오프라인)
+data/ 에 저장해 둔 페이지를 로컬 HTTP 서버로 다시 띄우고, DOM 기반 추출기를
+같은 입력으로 반복 실행해 추출 상품 수, 소요 시간, 처리량(상품/초)을 비교합니다.
+외부 요청은 모두 차단하므로 네트워크/사이트 변경과 무관하게 재현됩니다.
+
+추출기:
+- base_scraper:   BaseScraper._extract_products_bulk 스크롤 1회 평가 (비동기 Playwright, store_config 선택자)
+- weekly_soup:    WeeklyScraper._extract_products_from_soup (BeautifulSoup)
+- ah_bonus_soup:  scraper/scrape_ah_bonus.extract_products_from_soup (BeautifulSoup)
+- ah_scraper_dom: AHScraper._extract_products (비동기 Playwright locator)
+
+시간은 페이지 로딩을 뺀 추출 호출만 측정하며, 반복 실행의 중앙값을 사용합니다.
+의존성(Playwright/bs4)이 없거나 실행에 실패한 추출기(브라우저 없음 등)는 건너뜁니다.
+
+사용법:
+    python3 scrapers/replay_bench.py
+    python3 scrapers/replay_bench.py --only weekly_soup ah_bonus_soup --repeat 5
+    python3 scrapers/replay_bench.py --save data/cache/replay_baseline.json
+    python3 scrapers/replay_bench.py --baseline data/cache/replay_baseline.json   # 느려지거나 상품이 줄면 종료 코드 1
+"""
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+DATA_DIR = PROJECT_ROOT / "data"
+
+# 재생할 저장 페이지 (이름 → data/ 파일)
+FIXTURES = {
+    'ah_bonus': 'ah_bonus_page.html',
+    'ah_folder': 'ah_folder_page.html',
+    'ah_test': 'ah_test.html',
+    'debug_page': 'debug_page.html',
+}
+
+# BaseScraper 재생에 쓸 store_config 마트 (저장 페이지가 모두 AH/Reclamefolder)
+REPLAY_STORE = 'ah'
+
+DEFAULT_REPEAT = 3
+REGRESSION_TOLERANCE = 0.25     # 기준 대비 이 비율 이상 느려지면 회귀
+
+
+@dataclass
+class BenchResult:
+    """추출기 x 저장 페이지 한 조합의 측정 결과"""
+    extractor: str
+    fixture: str
+    products: int = 0
+    seconds: float = 0.0        # 반복 실행 중앙값 (추출 호출만)
+    runs: int = 0
+    skipped: str = ''
+
+    @property
+    def throughput(self) -> float:
+        return self.products / self.seconds if self.seconds > 0 else 0.0
+
+
+class ReplayServer:
+    """저장된 페이지를 내려주는 로컬 HTTP 서버 (그 외 경로는 404)"""
+
+    def __init__(self, fixtures: Dict[str, str]):
+        pages = {f"/{name}": (DATA_DIR / filename).read_bytes() for name, filename in fixtures.items()}
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = pages.get(urlparse(self.path).path)
+                self.send_response(200 if body is not None else 404)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body or b'')))
+                self.end_headers()
+                self.wfile.write(body or b'')
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def url(self, fixture: str) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/{fixture}"
+
+    def fetch(self, fixture: str) -> str:
+        with urllib.request.urlopen(self.url(fixture)) as response:
+            return response.read().decode('utf-8', errors='replace')
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@contextlib.contextmanager
+def quiet(verbose: bool):
+    """추출기 진행 출력/로그 숨김 (--verbose면 그대로)"""
+    if verbose:
+        yield
+        return
+    logging.disable(logging.INFO)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        logging.disable(logging.NOTSET)
+
+
+async def _offline_route(route):
+    """로컬 재생 서버 외의 요청은 모두 차단"""
+    if urlparse(route.request.url).hostname == '127.0.0.1':
+        await route.continue_()
+    else:
+        await route.abort('blockedbyclient')
+
+
+def _measure(run: Callable[[], list], repeat: int, verbose: bool) -> tuple:
+    times, products = [], []
+    for _ in range(repeat):
+        with quiet(verbose):
+            start = time.perf_counter()
+            products = run()
+            times.append(time.perf_counter() - start)
+    return len(products or []), statistics.median(times)
+
+
+def bench_soup(name: str, extract: Callable, server: ReplayServer, fixtures: List[str],
+               repeat: int, verbose: bool) -> List[BenchResult]:
+    """BeautifulSoup 추출기: 파싱 + 추출 시간 측정"""
+    from bs4 import BeautifulSoup
+
+    results = []
+    for fixture in fixtures:
+        html = server.fetch(fixture)
+        count, seconds = _measure(lambda: extract(BeautifulSoup(html, 'html.parser')), repeat, verbose)
+        results.append(BenchResult(name, fixture, count, seconds, repeat))
+    return results
+
+
+def bench_weekly_soup(server, fixtures, repeat, verbose):
+    from scraper.weekly_scraper import WeeklyScraper
+
+    scraper = WeeklyScraper()
+    return bench_soup(
+        'weekly_soup',
+        lambda soup: scraper._extract_products_from_soup(soup, 'Albert Heijn', 'replay'),
+        server, fixtures, repeat, verbose,
+    )
+
+
+def bench_ah_bonus_soup(server, fixtures, repeat, verbose):
+    from scraper.scrape_ah_bonus import extract_products_from_soup
+
+    return bench_soup('ah_bonus_soup', extract_products_from_soup, server, fixtures, repeat, verbose)
+
+
+def bench_base_scraper(server, fixtures, repeat, verbose):
+    """
+    BaseScraper._extract_products_bulk (비동기): 매 반복마다 페이지를 다시 열고 카드 추출만 측정
+
+    스크롤 수집 전체를 재면 스크롤마다 렌더링 대기(SCROLL_QUIET_MS 이상)가 시간 대부분을
+    차지하므로, 대기 없이 끝나는 스크롤 1회(page.evaluate 1회)만 측정합니다.
+    """
+    from playwright.async_api import async_playwright
+    from scrapers.base_scraper import BaseScraper
+    from scrapers.store_config import SCRAPING_CONFIG, STORES
+    from scrapers.utils.scroll_harvest import ScrollBudget
+    from scrapers.utils.selector_stats import SelectorStats
+
+    async def run(stats_dir: str) -> List[BenchResult]:
+        results = []
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                for fixture in fixtures:
+                    config = {**STORES[REPLAY_STORE], 'url': server.url(fixture)}
+                    times, count = [], 0
+                    for _ in range(repeat):
+                        context = await browser.new_context(viewport=SCRAPING_CONFIG['viewport'])
+                        await context.route("**/*", _offline_route)
+                        try:
+                            page = await context.new_page()
+                            await page.goto(config['url'])
+                            scraper = BaseScraper(config, PROJECT_ROOT)
+                            scraper.selector_stats = SelectorStats(scraper.name, stats_dir=Path(stats_dir) / fixture)
+                            with quiet(verbose):
+                                start = time.perf_counter()
+                                products = await scraper._extract_products_bulk(page, ScrollBudget(max_steps=1))
+                                count = len(products or [])
+                                times.append(time.perf_counter() - start)
+                        finally:
+                            await context.close()
+                    results.append(BenchResult('base_scraper', fixture, count, statistics.median(times), repeat))
+            finally:
+                await browser.close()
+        return results
+
+    # 선택자 학습 기록은 임시 디렉터리에 (실제 통계를 건드리지 않고 매번 같은 순서로 시작)
+    with tempfile.TemporaryDirectory() as stats_dir:
+        return asyncio.run(run(stats_dir))
+
+
+def bench_ah_scraper_dom(server, fixtures, repeat, verbose):
+    """AHScraper._extract_products (비동기 locator 방식)"""
+    from playwright.async_api import async_playwright
+    from scraper.ah_scraper import AHScraper
+
+    async def run() -> List[BenchResult]:
+        results = []
+        scraper = AHScraper()
+        async with async_playwright() as p:
+            browser = await p.chromium.launch(headless=True)
+            try:
+                for fixture in fixtures:
+                    times, count = [], 0
+                    for _ in range(repeat):
+                        context = await browser.new_context()
+                        await context.route("**/*", _offline_route)
+                        try:
+                            page = await context.new_page()
+                            await page.goto(server.url(fixture))
+                            with quiet(verbose):
+                                start = time.perf_counter()
+                                count = len(await scraper._extract_products(page))
+                                times.append(time.perf_counter() - start)
+                        finally:
+                            await context.close()
+                    results.append(BenchResult('ah_scraper_dom', fixture, count, statistics.median(times), repeat))
+            finally:
+                await browser.close()
+        return results
+
+    return asyncio.run(run())
+
+
+EXTRACTORS: Dict[str, Callable] = {
+    'base_scraper': bench_base_scraper,
+    'weekly_soup': bench_weekly_soup,
+    'ah_bonus_soup': bench_ah_bonus_soup,
+    'ah_scraper_dom': bench_ah_scraper_dom,
+}
+
+
+def run_bench(extractors: Optional[List[str]] = None, fixtures: Optional[List[str]] = None,
+              repeat: int = DEFAULT_REPEAT, verbose: bool = False) -> List[BenchResult]:
+    """선택한 추출기 x 저장 페이지 조합 실행"""
+    extractors = extractors or list(EXTRACTORS)
+    fixtures = fixtures or [name for name, filename in FIXTURES.items() if (DATA_DIR / filename).exists()]
+    results = []
+    with ReplayServer({name: FIXTURES[name] for name in fixtures}) as server:
+        for name in extractors:
+            print(f"⏱️ {name} 실행 중... (저장 페이지 {len(fixtures)}개 x {repeat}회)")
+            try:
+                results.extend(EXTRACTORS[name](server, fixtures, repeat, verbose))
+            except Exception as e:
+                # 의존성 누락(ImportError)이나 브라우저/페이지 오류는 이 추출기만 건너뛰고 계속
+                print(f"  ⏭️ {name} 건너뜀: {e}")
+                results.extend(BenchResult(name, fixture, skipped=str(e)) for fixture in fixtures)
+    return results
+
+
+def print_report(results: List[BenchResult]):
+    """추출기/저장 페이지별 상품 수, 시간, 처리량 표 출력"""
+    print("\n" + "=" * 78)
+    print(f"{'추출기':<16}{'저장 페이지':<14}{'상품':>6}{'시간(ms)':>12}{'상품/초':>12}")
+    print("=" * 78)
+    for r in results:
+        if r.skipped:
+            print(f"{r.extractor:<16}{r.fixture:<14}{'-':>6}{'건너뜀':>12}")
+            continue
+        print(f"{r.extractor:<16}{r.fixture:<14}{r.products:>6}{r.seconds * 1000:>12.1f}{r.throughput:>12.1f}")
+    print("=" * 78)
+
+
+def compare_baseline(results: List[BenchResult], baseline_path: Path,
+                     tolerance: float = REGRESSION_TOLERANCE) -> List[str]:
+    """
+    기준 결과 대비 회귀 (상품 수 감소 / tolerance 이상 느려짐) 목록
+
+    기준에는 결과가 있는데 이번에 건너뛴 추출기(의존성 누락, 실행 실패)도 회귀로 봅니다.
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {(b['extractor'], b['fixture']): b for b in json.load(f)['results']}
+    regressions = []
+    for r in results:
+        base = baseline.get((r.extractor, r.fixture))
+        if not base or base.get('skipped'):
+            continue
+        label = f"{r.extractor}/{r.fixture}"
+        if r.skipped:
+            regressions.append(f"{label}: 건너뜀 ({r.skipped})")
+            continue
+        if r.products < base['products']:
+            regressions.append(f"{label}: 상품 {base['products']} → {r.products}개")
+        if base['seconds'] > 0 and r.seconds > base['seconds'] * (1 + tolerance):
+            regressions.append(f"{label}: {base['seconds'] * 1000:.1f} → {r.seconds * 1000:.1f}ms")
+    return regressions
+
+
+def save_results(results: List[BenchResult], path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'measured_at': datetime.now().isoformat(),
+            'results': [asdict(r) for r in results],
+        }, f, ensure_ascii=False, indent=2)
+    print(f"💾 결과 저장: {path}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="저장된 HTML로 DOM 추출기 오프라인 벤치마크")
+    parser.add_argument('--only', nargs='+', choices=list(EXTRACTORS), help='실행할 추출기')
+    parser.add_argument('--fixtures', nargs='+', choices=list(FIXTURES), help='재생할 저장 페이지')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help=f'반복 횟수 (기본 {DEFAULT_REPEAT}, 중앙값 사용)')
+    parser.add_argument('--save', type=Path, help='결과를 JSON으로 저장 (이후 --baseline 으로 비교)')
+    parser.add_argument('--baseline', type=Path, help='기준 결과 JSON과 비교해 회귀면 종료 코드 1')
+    parser.add_argument('--tolerance', type=float, default=REGRESSION_TOLERANCE,
+                        help=f'허용 속도 저하 비율 (기본 {REGRESSION_TOLERANCE})')
+    parser.add_argument('--verbose', action='store_true', help='추출기 진행 출력 표시')
+    args = parser.parse_args()
+
+    results = run_bench(args.only, args.fixtures, max(1, args.repeat), args.verbose)
+    print_report(results)
+    if args.save:
+        save_results(results, args.save)
+    if args.baseline:
+        regressions = compare_baseline(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n❌ 회귀 {len(regressions)}건:")
+            for line in regressions:
+                print(f"   - {line}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 회귀 없음")
@@ -138,6 +138,9 @@ SCRAPING_CONFIG = {
     "wait_after_load": 5,  # 페이지 로드 후 대기 (초)
     "wait_after_click": 3,  # 버튼 클릭 후 대기 (초)
     "max_retries": 3,  # 최대 재시도 횟수
+    "scroll_max_steps": 40,  # 무한 스크롤 수집 최대 스크롤 횟수
+    "scroll_max_seconds": 60,  # 무한 스크롤 수집 시간 상한 (초)
+    "max_products": 500,  # 마트당 최대 수집 상품 수
     "headless": True,  # 헤드리스 모드
     "viewport": {
         "width": 1920,
@@ -6,6 +6,7 @@ import json
 import time
 import base64
 import re
+import sys
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from google import genai
@@ -14,6 +15,10 @@ from dotenv import load_dotenv
 
 load_dotenv()
 PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from scraper.gemini_limiter import call_gemini
+
 LOCAL_BROWSERS_PATH = PROJECT_ROOT / "pw-browsers"
 if LOCAL_BROWSERS_PATH.exists():
     os.environ['PLAYWRIGHT_BROWSERS_PATH'] = str(LOCAL_BROWSERS_PATH)
@@ -21,8 +26,6 @@ if LOCAL_BROWSERS_PATH.exists():
 api_key = os.getenv("GEMINI_API_KEY")
 if not api_key:
     try:
-        import sys
-        sys.path.insert(0, str(PROJECT_ROOT))
         import config
         api_key = config.GEMINI_API_KEY
     except:
@@ -107,7 +110,7 @@ def test_reclamefolder():
 [{"name": "상품명", "price": "가격", "discount": "할인정보"}]"""
 
     try:
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -118,7 +121,7 @@ def test_reclamefolder():
                     ]
                 )
             ]
-        )
+        ))
         
         print(f"\n📋 AI 응답:\n{response.text[:1000]}")
         
@@ -200,7 +203,7 @@ def test_ah_bonus():
 [{"name": "상품명", "price": "가격", "discount": "할인정보"}]"""
 
     try:
-        response = client.models.generate_content(
+        response = call_gemini(lambda: client.models.generate_content(
             model='gemini-2.0-flash-001',
             contents=[
                 types.Content(
@@ -211,7 +214,7 @@ def test_ah_bonus():
                     ]
                 )
             ]
-        )
+        ))
         
         print(f"\n📋 AI 응답:\n{response.text[:1500]}")
         
@@ -9,6 +9,14 @@ from .date_parser import (
     fallback_dates,
     format_date_badge
 )
+from .consent_state import ConsentState
+from .network_harvest import NetworkHarvester
+from .page_readiness import ReadinessLog, ReadinessResult
+from .request_blocking import RequestBlocker
+from .scroll_harvest import ScrollBudget, ScrollHarvester
+from .selector_stats import SelectorStats
+from .screenshot_tiles import Tile, make_tiles, merge_tile_products
+from .vision_cache import VisionCache, get_vision_cache, image_hash
 
 __all__ = [
     'parse_dutch_date',
@@ -16,5 +24,19 @@ __all__ = [
     'get_current_week_range',
     'get_next_week_range',
     'fallback_dates',
-    'format_date_badge'
+    'format_date_badge',
+    'ConsentState',
+    'NetworkHarvester',
+    'ReadinessLog',
+    'ReadinessResult',
+    'RequestBlocker',
+    'ScrollBudget',
+    'ScrollHarvester',
+    'SelectorStats',
+    'Tile',
+    'make_tiles',
+    'merge_tile_products',
+    'VisionCache',
+    'get_vision_cache',
+    'image_hash'
 ]
@@ -0,0 +1,153 @@
+"""
+쿠키 동의 상태 저장/재사용
+사이트마다 한 번 쿠키 배너를 처리한 뒤 Playwright storage_state(쿠키 + localStorage)를
+data/cache/consent/<도메인>.json 에 저장하고, 이후 컨텍스트는 그 상태로 시작합니다.
+배너 처리 루프(버튼 문구별 탐색 + 클릭 후 대기)는 저장된 상태가 없거나,
+상태로 시작했는데도 배너가 다시 보일 때(만료/거부)만 실행합니다.
+
+사용 예:
+    consent = ConsentState(config['url'], store=name)
+    context = browser.new_context(..., **consent.context_options())
+    page = context.new_page()
+    page.goto(...)
+    if consent.needs_banner(page):
+        accepted = ...기존 쿠키 버튼 처리 (클릭했으면 True)...
+        consent.save(context, accepted=accepted)
+
+동의 버튼을 누르지 못했고 동의 쿠키도 없으면 저장하지 않습니다
+(동의하지 않은 상태를 저장해 두면 다음 실행이 배너 처리를 건너뜀).
+"""
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATE_DIR = PROJECT_ROOT / "data" / "cache" / "consent"
+
+CONSENT_ENABLED = os.getenv("CONSENT_STATE", "1") != "0"
+MAX_AGE_DAYS = int(os.getenv("CONSENT_MAX_AGE_DAYS", "30"))
+
+# 배너가 다시 떴는지 한 번에 확인하는 버튼 문구 (각 크롤러의 문구 목록 합집합)
+CONSENT_BUTTON_PATTERN = re.compile(
+    r"accepteren|accept|akkoord|agree|allow|toestaan|alle cookies", re.IGNORECASE
+)
+
+# 동의 관리 도구(CMP)가 남기는 쿠키/localStorage 키
+CONSENT_KEY_PATTERN = re.compile(
+    r"consent|euconsent|optanon|cookielaw|didomi|cookiebot|cookie_?(accept|pref|policy|notice)|^cc_|cmp",
+    re.IGNORECASE
+)
+
+
+def _site(url: str) -> str:
+    host = (urlparse(url).hostname or 'unknown').lower()
+    return '.'.join(host.split('.')[-2:])
+
+
+class ConsentState:
+    """사이트(등록 도메인) 하나의 저장된 동의 상태"""
+
+    def __init__(self, url: str, store: Optional[str] = None, state_dir: Path = STATE_DIR):
+        self.site = _site(url)
+        self.store = store or self.site
+        self.path = Path(state_dir) / f"{self.site}.json"
+        self.restored = False
+
+    def _is_fresh(self) -> bool:
+        try:
+            age = time.time() - self.path.stat().st_mtime
+        except OSError:
+            return False
+        return age < MAX_AGE_DAYS * 86400
+
+    def context_options(self) -> Dict[str, Any]:
+        """new_context()에 넘길 옵션 (저장된 상태가 있으면 storage_state)"""
+        self.restored = CONSENT_ENABLED and self._is_fresh()
+        return {'storage_state': str(self.path)} if self.restored else {}
+
+    def _banner_visible(self, visible: bool) -> bool:
+        if not self.restored:
+            return True
+        if visible:
+            print(f"🍪 [{self.store}] 저장된 동의 상태가 거부됨, 배너 다시 처리")
+            self.restored = False
+            return True
+        print(f"🍪 [{self.store}] 저장된 동의 상태 사용 (배너 처리 생략)")
+        return False
+
+    def needs_banner(self, page) -> bool:
+        """배너 처리가 필요한지 (동기 Playwright, 대기 없이 현재 화면만 확인)"""
+        if not self.restored:
+            return True
+        try:
+            visible = page.get_by_role("button", name=CONSENT_BUTTON_PATTERN).first.is_visible()
+        except Exception:
+            visible = False
+        return self._banner_visible(visible)
+
+    async def needs_banner_async(self, page) -> bool:
+        """배너 처리가 필요한지 (비동기 Playwright)"""
+        if not self.restored:
+            return True
+        try:
+            visible = await page.get_by_role("button", name=CONSENT_BUTTON_PATTERN).first.is_visible()
+        except Exception:
+            visible = False
+        return self._banner_visible(visible)
+
+    @staticmethod
+    def _has_consent(state: Dict[str, Any]) -> bool:
+        """storage_state에 동의 쿠키/localStorage 항목이 있는지"""
+        names = [cookie.get('name', '') for cookie in state.get('cookies', [])]
+        for origin in state.get('origins', []):
+            names.extend(item.get('name', '') for item in origin.get('localStorage', []))
+        return any(CONSENT_KEY_PATTERN.search(name) for name in names)
+
+    def _store(self, state: Dict[str, Any], accepted: bool):
+        if not accepted and not self._has_consent(state):
+            print(f"🍪 [{self.store}] 동의 버튼/쿠키 없음 → 동의 상태 저장 안 함")
+            return
+        self._write(state)
+
+    def _write(self, state: Dict[str, Any]):
+        """임시 파일에 쓴 뒤 rename (동시에 같은 사이트를 처리해도 파일이 깨지지 않음)"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(state, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def save(self, context, accepted: bool = False):
+        """
+        배너 처리 후 상태 저장 (동기 Playwright)
+
+        Args:
+            accepted: 동의 버튼 클릭에 성공했는지 (False면 동의 쿠키가 있을 때만 저장)
+        """
+        if not CONSENT_ENABLED:
+            return
+        try:
+            self._store(context.storage_state(), accepted)
+        except Exception as e:
+            print(f"⚠️ [{self.store}] 동의 상태 저장 실패: {str(e)[:80]}")
+
+    async def save_async(self, context, accepted: bool = False):
+        """배너 처리 후 상태 저장 (비동기 Playwright)"""
+        if not CONSENT_ENABLED:
+            return
+        try:
+            self._store(await context.storage_state(), accepted)
+        except Exception as e:
+            print(f"⚠️ [{self.store}] 동의 상태 저장 실패: {str(e)[:80]}")
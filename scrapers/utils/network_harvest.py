@@ -0,0 +1,238 @@
+"""
+네트워크 응답 수집기 (1차 추출 단계)
+페이지 로딩/스크롤 중 오는 JSON(XHR/fetch, GraphQL) 응답을 기록해 두고
+엔드포인트별 필드 매핑으로 상품을 뽑아냅니다. 구조화된 API 데이터는
+스크린샷 + Vision(OCR) 보다 빠르고 정확하며 Gemini 호출도 들지 않으므로,
+여기서 충분한 상품이 나오면 Vision 분석을 건너뜁니다.
+
+- STORE_ENDPOINTS: 마트별 엔드포인트 매핑 (URL 패턴 + 필드 경로 후보)
+- 매핑이 없거나 맞지 않는 응답은 GENERIC_MAPPING으로 시도: 이름 + 가격 + 할인/프로모션 필드가
+  모두 있는 객체만 상품으로 인정 (추천 위젯/레시피/매장 찾기 등의 JSON이 세일 상품으로 섞이지 않도록)
+- 경로는 점 표기 ('price.now.amount'), 후보 중 처음으로 값이 있는 것을 사용
+
+사용 예:
+    harvester = NetworkHarvester(name)
+    harvester.attach(page)              # 비동기: harvester.attach_async(page)
+    page.goto(url) ...
+    products = harvester.usable_products()  # 비동기: await harvester.drain() 후 호출
+"""
+import asyncio
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+HARVEST_MIN_PRODUCTS = 5         # 이보다 적으면 Vision 단계로 넘김
+MAX_RESPONSES = 200              # 페이지 하나에서 기록할 최대 응답 수
+MAX_BODY_BYTES = 5_000_000       # 이보다 큰 응답은 무시
+MAX_DEPTH = 15
+
+
+@dataclass
+class EndpointMapping:
+    """엔드포인트 하나의 상품 필드 매핑"""
+    url_pattern: str
+    name_paths: Tuple[str, ...] = ('title', 'name', 'productName')
+    price_paths: Tuple[str, ...] = ('price.now', 'price.amount', 'price', 'currentPrice', 'priceInfo.amount')
+    discount_paths: Tuple[str, ...] = ('discountLabel', 'bonusLabel', 'shield.text', 'promotion.label', 'promotionText')
+    cents: bool = False                 # 숫자 가격이 센트 단위인지 (AH GraphQL)
+    require_price: bool = True          # False면 가격 대신 할인 문구만 있어도 상품으로 인정
+    require_discount: bool = False      # True면 할인/프로모션 필드가 있는 객체만 상품으로 인정
+
+    def matches(self, url: str) -> bool:
+        return re.search(self.url_pattern, url, re.IGNORECASE) is not None
+
+
+# 마트별 매핑이 없는 응답: 이름, 가격, 할인/프로모션 필드가 같은 객체 안에 모두 있어야 상품으로 간주
+GENERIC_MAPPING = EndpointMapping(
+    url_pattern=r'.',
+    discount_paths=(
+        'discountLabel', 'bonusLabel', 'shield.text', 'promotion.label', 'promotionText',
+        'promotion', 'promotions', 'promoLabel', 'offerLabel', 'discount',
+    ),
+    require_discount=True,
+)
+
+STORE_ENDPOINTS: Dict[str, List[EndpointMapping]] = {
+    # scraper/scrape_ah_api.py, scrape_ah_graphql.py 에서 확인한 Bonus GraphQL 응답 구조
+    'Albert Heijn': [
+        EndpointMapping(
+            url_pattern=r'ah\.nl/(gql|graphql|bonus)',
+            name_paths=('title', 'name'),
+            price_paths=('price.now.amount', 'price.amount', 'price.now', 'priceInfo.amount', 'price'),
+            discount_paths=('discountLabel', 'bonusLabel', 'shield.text', 'shield.label', 'bonusMechanism'),
+            cents=True,
+            require_price=False,
+        ),
+    ],
+}
+
+
+def _get_path(data: Dict[str, Any], path: str) -> Any:
+    value: Any = data
+    for key in path.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def _first(data: Dict[str, Any], paths: Sequence[str]) -> Any:
+    for path in paths:
+        value = _get_path(data, path)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def format_price(value: Any, cents: bool = False) -> Optional[str]:
+    """숫자/문자열/객체 가격 → '€1.99' (cents=True면 숫자를 센트 단위로 봄)"""
+    if isinstance(value, dict):
+        value = _first(value, ('amount', 'now', 'value', 'unitPrice'))
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        if cents:
+            value = value / 100
+        return f"€{value:.2f}"
+    if isinstance(value, str):
+        match = re.search(r'(\d+)[,.](\d{2})', value)
+        if match:
+            return f"€{match.group(1)}.{match.group(2)}"
+    return None
+
+
+def _discount_text(value: Any) -> Optional[str]:
+    if isinstance(value, bool) or (isinstance(value, (int, float)) and value <= 0):
+        return None
+    if isinstance(value, dict):
+        value = _first(value, ('text', 'label', 'title'))
+    if isinstance(value, list):
+        value = ' '.join(str(v) for v in value if isinstance(v, (str, int, float)))
+    return str(value).strip() if value not in (None, '') else None
+
+
+def extract_products(data: Any, mapping: EndpointMapping, store: str) -> List[Dict[str, Any]]:
+    """JSON 전체를 훑어 매핑에 맞는 객체를 상품으로 변환"""
+    products: List[Dict[str, Any]] = []
+
+    def walk(node: Any, depth: int):
+        if depth > MAX_DEPTH:
+            return
+        if isinstance(node, dict):
+            name = _first(node, mapping.name_paths)
+            if isinstance(name, str) and 3 <= len(name.strip()) <= 150:
+                price = format_price(_first(node, mapping.price_paths), mapping.cents)
+                discount = _discount_text(_first(node, mapping.discount_paths))
+                if mapping.require_discount and not discount:
+                    price = None
+                if price or (discount and not mapping.require_price):
+                    products.append({
+                        'name': name.strip(),
+                        'price': price,
+                        'discount': discount,
+                        'supermarket': store,
+                    })
+                    return
+            for key, value in node.items():
+                if key not in ('__typename', '__ref', 'id'):
+                    walk(value, depth + 1)
+        elif isinstance(node, list):
+            for item in node:
+                walk(item, depth + 1)
+
+    walk(data, 0)
+    return products
+
+
+@dataclass
+class NetworkHarvester:
+    """마트 하나의 페이지 로딩 중 JSON 응답 기록/상품 추출"""
+    store: str
+    min_products: int = HARVEST_MIN_PRODUCTS
+    responses: List[Tuple[str, Any]] = field(default_factory=list, init=False)
+    _tasks: List[Any] = field(default_factory=list, init=False, repr=False)
+    _generation: int = field(default=0, init=False, repr=False)
+
+    def _wanted(self, response) -> bool:
+        if len(self.responses) >= MAX_RESPONSES or response.status != 200:
+            return False
+        if response.request.resource_type not in ('xhr', 'fetch'):
+            return False
+        headers = response.headers
+        if 'json' not in headers.get('content-type', ''):
+            return False
+        length = headers.get('content-length')
+        return not (length and length.isdigit() and int(length) > MAX_BODY_BYTES)
+
+    def _on_response(self, response):
+        try:
+            if self._wanted(response):
+                self.responses.append((response.url, response.json()))
+        except Exception:
+            pass
+
+    async def _read_async(self, response):
+        generation = self._generation
+        try:
+            if self._wanted(response):
+                data = await response.json()
+                # 본문을 읽는 동안 reset()됐으면 (이전 시도/이번 주 응답) 버림
+                if generation == self._generation:
+                    self.responses.append((response.url, data))
+        except Exception:
+            pass
+
+    def attach(self, page):
+        """동기 Playwright 페이지에 응답 기록 등록 (goto 전에 호출)"""
+        page.on('response', self._on_response)
+        return self
+
+    def attach_async(self, page):
+        """비동기 Playwright 페이지에 응답 기록 등록 (goto 전에 호출)"""
+        page.on('response', lambda response: self._tasks.append(
+            asyncio.ensure_future(self._read_async(response))
+        ))
+        return self
+
+    async def drain(self):
+        """읽는 중인 응답 본문을 모두 기다림 (비동기)"""
+        while self._tasks:
+            tasks, self._tasks = self._tasks, []
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def reset(self):
+        """
+        지금까지 기록한 응답 버림 (예: '다음 주' 탭 클릭 전 이번 주 응답 제외,
+        재시도 전 실패한 시도의 응답 제외). 읽는 중이던 응답도 버려집니다.
+        """
+        self.responses.clear()
+        self._tasks.clear()
+        self._generation += 1
+
+    def _mapping_for(self, url: str) -> EndpointMapping:
+        for mapping in STORE_ENDPOINTS.get(self.store, []):
+            if mapping.matches(url):
+                return mapping
+        return GENERIC_MAPPING
+
+    def products(self) -> List[Dict[str, Any]]:
+        """기록한 응답에서 추출한 상품 (이름 기준 중복 제거)"""
+        seen = set()
+        products = []
+        for url, data in self.responses:
+            for product in extract_products(data, self._mapping_for(url), self.store):
+                key = re.sub(r'[^a-z0-9]+', ' ', product['name'].lower()).strip()
+                if key and key not in seen:
+                    seen.add(key)
+                    products.append(product)
+        return products
+
+    def usable_products(self) -> List[Dict[str, Any]]:
+        """Vision 단계를 건너뛸 만큼 충분한 상품 (부족하면 빈 목록)"""
+        products = self.products()
+        if len(products) >= self.min_products:
+            print(f"📡 [{self.store}] 네트워크 응답 {len(self.responses)}개에서 {len(products)}개 상품 추출 (Vision 생략)")
+            return products
+        if self.responses:
+            print(f"📡 [{self.store}] 네트워크 응답 {len(self.responses)}개, 상품 {len(products)}개 → Vision 분석으로 진행")
+        return []
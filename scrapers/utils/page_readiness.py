@@ -0,0 +1,141 @@
+"""
+페이지 준비 상태 감지 유틸리티
+고정 sleep 대신 페이지 안에서 상품 카드 수, DOM 변경, 로딩 중인 이미지를 관찰해
+페이지가 더 이상 바뀌지 않으면 바로 다음 단계로 넘어갑니다.
+기존 대기 시간은 상한(max_wait)으로만 사용합니다.
+"""
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+# 상품 카드 선택자를 모를 때 개수 변화 관찰에 쓰는 일반 선택자
+GENERIC_CARD_SELECTOR = "article, [class*='product'], [data-testhook*='product']"
+
+# DOM 변경이 이 시간(ms) 동안 없으면 안정된 것으로 판단
+DEFAULT_QUIET_MS = 800
+POLL_MS = 200
+
+# 페이지 안에서 실행되는 감지 스크립트 (안정되거나 max_ms가 지나면 resolve)
+READINESS_SCRIPT = """
+({maxMs, quietMs, pollMs, selector, requireCards}) => new Promise(resolve => {
+    const start = performance.now();
+    let lastChange = start;
+    let mutations = 0;
+    const observer = new MutationObserver(records => {
+        mutations += records.length;
+        lastChange = performance.now();
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+
+    const cardCount = () => document.querySelectorAll(selector).length;
+    const pendingImages = () => Array.from(document.images).filter(img => {
+        if (img.complete || !(img.currentSrc || img.src)) return false;
+        const rect = img.getBoundingClientRect();
+        return rect.bottom > 0 && rect.top < window.innerHeight * 2;
+    }).length;
+
+    let lastCount = -1;
+    const tick = () => {
+        const now = performance.now();
+        const cards = cardCount();
+        const pending = pendingImages();
+        const stable = now - lastChange >= quietMs
+            && pending === 0
+            && cards === lastCount
+            && (!requireCards || cards > 0);
+        lastCount = cards;
+        if (stable || now - start >= maxMs) {
+            observer.disconnect();
+            resolve({waited: (now - start) / 1000, cards, pending, mutations, stable});
+            return;
+        }
+        setTimeout(tick, pollMs);
+    };
+    setTimeout(tick, pollMs);
+})
+"""
+
+
+@dataclass
+class ReadinessResult:
+    """대기 1회 결과"""
+    waited: float
+    max_wait: float
+    stable: bool
+    cards: int = 0
+    pending_images: int = 0
+
+
+@dataclass
+class ReadinessLog:
+    """
+    마트 하나의 대기 기록 (고정 sleep 기준 대비 절약 시간 집계)
+
+    사용 예:
+        readiness = ReadinessLog("Dirk")
+        readiness.wait(page, max_wait=8)
+        readiness.report()
+    """
+    store: str
+    card_selector: Optional[str] = None
+    quiet_ms: int = DEFAULT_QUIET_MS
+    results: List[ReadinessResult] = field(default_factory=list)
+
+    def _args(self, max_wait: float, quiet_ms: Optional[int]) -> dict:
+        return {
+            'maxMs': max_wait * 1000,
+            'quietMs': self.quiet_ms if quiet_ms is None else quiet_ms,
+            'pollMs': POLL_MS,
+            'selector': self.card_selector or GENERIC_CARD_SELECTOR,
+            'requireCards': bool(self.card_selector),
+        }
+
+    def _record(self, raw: Optional[dict], max_wait: float) -> ReadinessResult:
+        raw = raw or {}
+        result = ReadinessResult(
+            waited=float(raw.get('waited', max_wait)),
+            max_wait=max_wait,
+            stable=bool(raw.get('stable')),
+            cards=int(raw.get('cards', 0)),
+            pending_images=int(raw.get('pending', 0)),
+        )
+        self.results.append(result)
+        return result
+
+    def wait(self, page, max_wait: float, quiet_ms: Optional[int] = None) -> ReadinessResult:
+        """페이지가 안정될 때까지 대기 (동기 Playwright, 최대 max_wait초)"""
+        try:
+            raw = page.evaluate(READINESS_SCRIPT, self._args(max_wait, quiet_ms))
+        except Exception:
+            # 평가 중 페이지 이동 등: 기존 방식대로 상한만큼 대기
+            page.wait_for_timeout(max_wait * 1000)
+            raw = None
+        return self._record(raw, max_wait)
+
+    async def wait_async(self, page, max_wait: float, quiet_ms: Optional[int] = None) -> ReadinessResult:
+        """페이지가 안정될 때까지 대기 (비동기 Playwright, 최대 max_wait초)"""
+        try:
+            raw = await page.evaluate(READINESS_SCRIPT, self._args(max_wait, quiet_ms))
+        except Exception:
+            await page.wait_for_timeout(max_wait * 1000)
+            raw = None
+        return self._record(raw, max_wait)
+
+    @property
+    def waited(self) -> float:
+        return sum(r.waited for r in self.results)
+
+    @property
+    def baseline(self) -> float:
+        return sum(r.max_wait for r in self.results)
+
+    def report(self):
+        """고정 대기 대비 절약 시간 출력"""
+        if not self.results:
+            return
+        saved = self.baseline - self.waited
+        early = sum(1 for r in self.results if r.stable)
+        print(
+            f"⚡ [{self.store}] 준비 감지 대기 {self.waited:.1f}초 "
+            f"(고정 대기 {self.baseline:.1f}초 대비 {saved:.1f}초 절약, "
+            f"{early}/{len(self.results)}회 조기 종료)"
+        )
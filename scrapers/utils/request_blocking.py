@@ -0,0 +1,159 @@
+"""
+Playwright 요청 차단 프로필
+상품 렌더링에 필요한 리소스(문서, 스크립트, 스타일, XHR/fetch, 필요시 이미지)만
+허용하고 광고/트래커/폰트/동영상 등은 context.route 단계에서 차단합니다.
+트래커가 계속 요청을 보내면 wait_for_load_state("networkidle")가 늦게 끝나므로
+대기 시간도 함께 줄어듭니다.
+
+- 마트 URL과 같은 도메인(1st party)은 호스트 규칙으로 차단하지 않음 (리소스 종류만 적용)
+- 3rd party 도메인은 트래커/광고 목록에 있으면 차단, 3rd party iframe 문서도 차단
+- 차단 건수와 절약 바이트(리소스 종류별 평균 크기 기준 추정)를 집계
+- BLOCK_REQUESTS=0 이면 차단하지 않음
+"""
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Set
+from urllib.parse import urlparse
+
+BLOCKING_ENABLED = os.getenv("BLOCK_REQUESTS", "1") != "0"
+
+# 상품 렌더링에 필요한 리소스 종류 (이미지는 프로필에 따라 추가)
+ALLOWED_RESOURCE_TYPES = {'document', 'script', 'stylesheet', 'xhr', 'fetch'}
+
+# 광고/분석/세션 녹화/A-B 테스트/동영상 임베드
+TRACKER_HOSTS = (
+    'google-analytics.com', 'googletagmanager.com', 'googleadservices.com',
+    'googlesyndication.com', 'doubleclick.net', 'adservice.google.com',
+    'facebook.net', 'facebook.com', 'hotjar.com', 'clarity.ms', 'bat.bing.com',
+    'analytics.tiktok.com', 'snap.licdn.com', 'ct.pinterest.com', 'criteo.com',
+    'criteo.net', 'adnxs.com', 'taboola.com', 'outbrain.com', 'go-mpulse.net',
+    'nr-data.net', 'newrelic.com', 'sentry.io', 'datadoghq.com', 'segment.io',
+    'optimizely.com', 'cdn.optimizely.com', 'mouseflow.com', 'youtube.com',
+    'ytimg.com', 'vimeo.com', 'salesforceliveagent.com', 'adsrvr.org',
+)
+
+# 차단한 요청의 크기 추정치 (bytes, 리소스 종류별 평균)
+ESTIMATED_BYTES = {
+    'font': 40_000,
+    'media': 500_000,
+    'image': 60_000,
+    'script': 80_000,
+    'stylesheet': 20_000,
+    'document': 30_000,
+    'xhr': 5_000,
+    'fetch': 5_000,
+}
+DEFAULT_ESTIMATED_BYTES = 2_000
+
+
+def _host(url: str) -> str:
+    return (urlparse(url).hostname or '').lower()
+
+
+def _site(host: str) -> str:
+    """등록 도메인 근사값 (마지막 두 라벨, 예: static.ah.nl → ah.nl)"""
+    return '.'.join(host.split('.')[-2:])
+
+
+def _matches(host: str, domains: Iterable[str]) -> bool:
+    return any(host == d or host.endswith('.' + d) for d in domains)
+
+
+@dataclass
+class RequestBlocker:
+    """
+    마트 하나의 요청 차단 프로필
+
+    사용 예:
+        blocker = RequestBlocker("Dirk", url, block_images=True)
+        blocker.install(context)        # 비동기: await blocker.install_async(context)
+        ...
+        blocker.report()
+    """
+    store: str
+    url: str = ''
+    block_images: bool = False          # 텍스트만 쓰는 크롤러는 True, 스크린샷 분석은 False
+    allowed_hosts: Set[str] = field(default_factory=set)   # 트래커 목록보다 우선 허용
+    blocked_hosts: Set[str] = field(default_factory=set)   # 마트별 추가 차단
+    blocked: Counter = field(default_factory=Counter)
+    allowed: int = 0
+    saved_bytes: int = 0
+
+    def __post_init__(self):
+        first_party = _host(self.url)
+        if first_party:
+            self.allowed_hosts = set(self.allowed_hosts) | {_site(first_party)}
+
+    def classify(self, url: str, resource_type: str, is_frame: bool = False) -> Optional[str]:
+        """차단 사유 (허용이면 None)"""
+        host = _host(url)
+        if not host:
+            return None
+        if _matches(host, self.blocked_hosts):
+            return 'store-rule'
+        first_party = _matches(host, self.allowed_hosts)
+        if not first_party and _matches(host, TRACKER_HOSTS):
+            return 'tracker'
+        if resource_type == 'document' and is_frame and not first_party:
+            return 'third-party-frame'
+        if resource_type == 'image' and not self.block_images:
+            return None
+        if resource_type not in ALLOWED_RESOURCE_TYPES:
+            return resource_type
+        return None
+
+    def _decide(self, request) -> Optional[str]:
+        try:
+            is_frame = request.is_navigation_request() and request.frame.parent_frame is not None
+        except Exception:
+            is_frame = False
+        reason = self.classify(request.url, request.resource_type, is_frame)
+        if reason:
+            self.blocked[reason] += 1
+            self.saved_bytes += ESTIMATED_BYTES.get(request.resource_type, DEFAULT_ESTIMATED_BYTES)
+        else:
+            self.allowed += 1
+        return reason
+
+    def _handle(self, route):
+        if self._decide(route.request):
+            route.abort('blockedbyclient')
+        else:
+            route.continue_()
+
+    async def _handle_async(self, route):
+        if self._decide(route.request):
+            await route.abort('blockedbyclient')
+        else:
+            await route.continue_()
+
+    def install(self, context):
+        """동기 Playwright 브라우저 컨텍스트에 차단 라우트 등록"""
+        if BLOCKING_ENABLED:
+            context.route("**/*", self._handle)
+        return self
+
+    async def install_async(self, context):
+        """비동기 Playwright 브라우저 컨텍스트에 차단 라우트 등록"""
+        if BLOCKING_ENABLED:
+            await context.route("**/*", self._handle_async)
+        return self
+
+    @property
+    def total_blocked(self) -> int:
+        return sum(self.blocked.values())
+
+    def summary(self) -> Dict[str, int]:
+        return {'allowed': self.allowed, 'blocked': self.total_blocked,
+                'saved_bytes': self.saved_bytes, **dict(self.blocked)}
+
+    def report(self):
+        """차단 건수/절약 바이트 출력"""
+        if not self.total_blocked:
+            return
+        reasons = ', '.join(f"{reason} {count}" for reason, count in self.blocked.most_common())
+        print(
+            f"🛡️ [{self.store}] 요청 {self.total_blocked}건 차단 ({reasons}), "
+            f"허용 {self.allowed}건, 약 {self.saved_bytes / 1024:.0f}KB 절약 (추정)"
+        )
@@ -0,0 +1,124 @@
+"""
+스크린샷 타일 분할 유틸리티
+full_page 스크린샷을 뷰포트 높이 타일(약간 겹침)로 자르고 축소/JPEG(WebP) 재인코딩해
+Gemini Vision 요청 크기를 줄이고 긴 페이지의 해상도 손실을 막습니다.
+타일별 추출 결과는 겹침 구간 중복을 제거하며 병합합니다.
+
+Pillow가 없으면 기존처럼 원본 PNG 한 장을 그대로 사용합니다.
+"""
+import io
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# 타일 설정 (뷰포트 1920x1080 기준)
+TILE_HEIGHT = 1080
+TILE_OVERLAP = 120          # 타일 경계에 걸친 상품이 잘리지 않도록 겹치는 높이 (px)
+TILE_MAX_WIDTH = 1280       # 이보다 넓으면 비율 유지하며 축소
+TILE_FORMAT = os.getenv("TILE_FORMAT", "JPEG").upper()  # JPEG 또는 WEBP
+TILE_QUALITY = int(os.getenv("TILE_QUALITY", "80"))
+TILE_WORKERS = 4            # 타일 병렬 분석 수
+
+MIME_TYPES = {'JPEG': 'image/jpeg', 'WEBP': 'image/webp', 'PNG': 'image/png'}
+
+
+@dataclass
+class Tile:
+    """분석 단위 이미지"""
+    index: int
+    data: bytes
+    mime_type: str
+    top: int = 0
+    bottom: int = 0
+
+
+def make_tiles(
+    screenshot_path: Path,
+    tile_height: int = TILE_HEIGHT,
+    overlap: int = TILE_OVERLAP,
+    max_width: int = TILE_MAX_WIDTH,
+    fmt: str = TILE_FORMAT,
+    quality: int = TILE_QUALITY
+) -> List[Tile]:
+    """
+    스크린샷을 겹치는 타일로 분할 후 재인코딩
+
+    Returns:
+        타일 목록 (위에서 아래 순서). Pillow가 없으면 원본 PNG 1장
+    """
+    raw = Path(screenshot_path).read_bytes()
+    if Image is None:
+        return [Tile(index=0, data=raw, mime_type='image/png')]
+
+    with Image.open(io.BytesIO(raw)) as image:
+        image = image.convert('RGB')
+        width, height = image.size
+        step = max(tile_height - overlap, 1)
+
+        tiles = []
+        top = 0
+        while True:
+            bottom = min(top + tile_height, height)
+            crop = image.crop((0, top, width, bottom))
+            if width > max_width:
+                crop = crop.resize((max_width, round(crop.height * max_width / width)), Image.LANCZOS)
+
+            buffer = io.BytesIO()
+            crop.save(buffer, format=fmt, quality=quality, optimize=True)
+            tiles.append(Tile(
+                index=len(tiles),
+                data=buffer.getvalue(),
+                mime_type=MIME_TYPES.get(fmt, 'image/jpeg'),
+                top=top,
+                bottom=bottom,
+            ))
+
+            if bottom >= height:
+                break
+            top += step
+
+    return tiles
+
+
+def _product_key(product: Dict[str, Any]) -> str:
+    name = str(product.get('name') or product.get('product_name') or '')
+    return re.sub(r'[^a-z0-9]+', ' ', name.lower()).strip()
+
+
+def merge_tile_products(tile_products: Sequence[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    타일별 상품 목록 병합
+
+    겹침 구간에 걸친 상품은 인접한 두 타일에 모두 나오므로, 바로 앞 타일에
+    같은 이름이 있으면 중복으로 보고 제외합니다. 멀리 떨어진 타일의 같은 이름
+    상품(다른 묶음/용량 등)은 유지합니다. 가격이 없던 항목은 중복의 값으로 채웁니다.
+    """
+    merged: List[Dict[str, Any]] = []
+    previous: Dict[str, Dict[str, Any]] = {}
+
+    for products in tile_products:
+        current: Dict[str, Dict[str, Any]] = {}
+        for product in products or []:
+            key = _product_key(product)
+            if not key:
+                continue
+            duplicate = previous.get(key) or current.get(key)
+            if duplicate is not None:
+                for field_name, value in product.items():
+                    if duplicate.get(field_name) in (None, '') and value not in (None, ''):
+                        duplicate[field_name] = value
+                current.setdefault(key, duplicate)
+                continue
+            item = dict(product)
+            merged.append(item)
+            current[key] = item
+        previous = current
+
+    return merged
@@ -0,0 +1,216 @@
+"""
+무한 스크롤 상품 수집기
+고정 횟수 스크롤 + 앞 50개 카드 대신, 새 카드가 나타나는 동안 계속 스크롤하며
+화면에 렌더링된 카드를 그때그때 추출합니다.
+
+- 스크롤 한 번마다 page.evaluate 1회: 아직 보지 않은 카드만 추출한 뒤 한 화면 아래로 스크롤
+- 싼 카드 키(상품 id 또는 링크 + 카드 텍스트)로 먼저 중복을 확인하고 새 카드만 필드 선택자를 탐색
+  (이미 본 카드는 스크롤마다 다시 추출하지 않으며, 필드 적중도 카드당 한 번만 집계)
+- 가상 스크롤로 카드가 다시 그려져도 키가 같으면 한 번만 수집
+- 맨 아래에서 새 카드가 stall_steps번 연속 없거나 예산(스크롤 수/시간/상품 수)을 넘으면 종료
+- 카드 선택자가 no_match_steps번 스크롤하도록 하나도 안 맞으면 예산을 쓰지 않고 바로 종료
+- 상품은 제너레이터로 바로 내보내므로 긴 페이지에서도 수집기는 카드 키만 보관
+
+사용 예:
+    harvester = ScrollHarvester("Jumbo", card_selectors, fields, readiness=readiness)
+    for product in harvester.harvest(page):     # 비동기: async for ... in harvester.harvest_async(page)
+        ...
+    harvester.report()
+"""
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Set
+
+from .page_readiness import ReadinessLog
+
+# 스크롤 후 새 카드 렌더링 대기 (초, 페이지가 안정되면 바로 진행)
+SCROLL_SETTLE_WAIT = 1.5
+SCROLL_QUIET_MS = 300
+
+# 보지 않은 카드 추출 + 한 화면 스크롤 (페이지 안의 키 집합은 reset 때 새로 만듦)
+SCROLL_STEP_JS = """
+({cardSelectors, fields, reset}) => {
+    if (reset || !window.__scrollHarvestSeen) window.__scrollHarvestSeen = new Set();
+    const seen = window.__scrollHarvestSeen;
+    const query = (root, selector) => {
+        try { return root.querySelectorAll(selector); } catch (e) { return []; }
+    };
+    // 필드별로 맞은 선택자를 카드에 남김 (선택자 적중률은 실제로 수집된 카드만 파이썬 쪽에서 집계)
+    const firstText = (card, selectors, hit) => {
+        for (const selector of selectors) {
+            const element = query(card, selector)[0];
+            if (element) {
+                hit.selector = selector;
+                return (element.innerText || '').trim();
+            }
+        }
+        return null;
+    };
+    // 필드 추출 전에 보는 싼 키: 상품 id 속성 또는 상품 링크 + 카드 텍스트
+    // (id 값이 카드마다 같아도 텍스트로 구분, textContent는 레이아웃 계산 없음)
+    const cardKey = (card) => {
+        let id = '';
+        for (const attr of ['data-product-id', 'data-productid', 'data-sku', 'data-id', 'id']) {
+            if (card.getAttribute(attr)) { id = card.getAttribute(attr); break; }
+        }
+        if (!id) {
+            const link = card.querySelector('a[href]');
+            id = link ? link.getAttribute('href') : '';
+        }
+        const text = (card.textContent || '').replace(/\\s+/g, ' ').trim().slice(0, 200);
+        return text ? id + '|' + text : null;
+    };
+
+    let selector = null;
+    let cards = [];
+    for (const candidate of cardSelectors) {
+        cards = Array.from(query(document, candidate));
+        if (cards.length) { selector = candidate; break; }
+    }
+
+    const products = [];
+    for (const card of cards) {
+        // 본 카드는 필드 추출 없이 건너뜀 (아직 내용이 없는 자리표시 카드는 다음 스크롤에 다시 확인)
+        const key = cardKey(card);
+        if (!key || seen.has(key)) continue;
+        seen.add(key);
+
+        const product = {fieldSelectors: {}};
+        for (const [name, selectors] of Object.entries(fields)) {
+            const hit = {selector: null};
+            product[name] = firstText(card, selectors, hit);
+            product.fieldSelectors[name] = hit.selector;
+        }
+        if (!product.name) {
+            const lines = (card.innerText || '').split('\\n').map(line => line.trim()).filter(Boolean);
+            product.name = lines.length ? lines[0] : null;
+        }
+        product.key = key;
+        products.push(product);
+    }
+
+    const scroller = document.scrollingElement || document.documentElement;
+    const atBottom = scroller.scrollTop + window.innerHeight >= scroller.scrollHeight - 2;
+    window.scrollBy(0, Math.round(window.innerHeight * 0.9));
+    return {selector, total: cards.length, products, atBottom};
+}
+"""
+
+
+@dataclass
+class ScrollBudget:
+    """스크롤 수집 한도"""
+    max_steps: int = 40             # 최대 스크롤 횟수
+    max_seconds: float = 60.0       # 수집 전체 시간 상한
+    max_products: int = 500         # 최대 상품 수
+    stall_steps: int = 2            # 맨 아래에서 새 카드 없이 이만큼 연속이면 종료
+    no_match_steps: int = 3         # 카드 선택자가 하나도 안 맞은 채 이만큼 스크롤하면 종료
+
+
+@dataclass
+class ScrollHarvester:
+    """마트 하나의 무한 스크롤 카드 수집"""
+    store: str
+    card_selectors: List[str]
+    fields: Dict[str, List[str]]
+    budget: ScrollBudget = field(default_factory=ScrollBudget)
+    readiness: Optional[ReadinessLog] = None
+    steps: int = 0
+    emitted: int = 0
+    selector: Optional[str] = None
+    stop_reason: str = ''
+    elapsed: float = 0.0
+    field_hits: Dict[str, Counter] = field(default_factory=dict, init=False)    # 필드 → 선택자별 적중 카드 수 (카드당 한 번)
+    field_misses: Counter = field(default_factory=Counter, init=False)         # 필드 → 어느 선택자도 안 맞은 카드 수
+    _seen: Set[str] = field(default_factory=set, init=False, repr=False)
+    _stall: int = field(default=0, init=False, repr=False)
+
+    def _step_args(self) -> Dict[str, Any]:
+        return {'cardSelectors': self.card_selectors, 'fields': self.fields, 'reset': self.steps == 0}
+
+    def _out_of_budget(self, started: float) -> bool:
+        if self.steps >= self.budget.max_steps:
+            self.stop_reason = f"스크롤 {self.budget.max_steps}회 한도"
+        elif time.perf_counter() - started >= self.budget.max_seconds:
+            self.stop_reason = f"{self.budget.max_seconds:.0f}초 한도"
+        return bool(self.stop_reason)
+
+    def _accept(self, step: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        스크롤 한 번의 결과에서 새 상품만 골라 종료 조건 갱신 (카드 키/필드 선택자는 dict에서 뺌)
+
+        필드 선택자 적중은 여기서 받아들인 카드만 집계하므로 카드당 한 번입니다.
+        """
+        self.steps += 1
+        self.selector = self.selector or step.get('selector')
+        products = []
+        for product in step.get('products', []):
+            key = product.pop('key', None)
+            selectors = product.pop('fieldSelectors', None) or {}
+            if key in self._seen:
+                continue
+            self._seen.add(key)
+            for name, selector in selectors.items():
+                if selector:
+                    self.field_hits.setdefault(name, Counter())[selector] += 1
+                else:
+                    self.field_misses[name] += 1
+            products.append(product)
+            if self.emitted + len(products) >= self.budget.max_products:
+                self.stop_reason = f"상품 {self.budget.max_products}개 한도"
+                break
+        self.emitted += len(products)
+
+        if products:
+            self._stall = 0
+        elif not self.selector and self.steps >= self.budget.no_match_steps:
+            self.stop_reason = "카드 선택자 불일치"
+        elif step.get('atBottom'):
+            self._stall += 1
+            if self._stall >= self.budget.stall_steps:
+                self.stop_reason = "새 카드 없음"
+        return products
+
+    def harvest(self, page) -> Iterator[Dict[str, Any]]:
+        """
+        새 카드가 없을 때까지 스크롤하며 상품을 하나씩 내보냄 (동기 Playwright)
+
+        평가 오류는 호출한 쪽으로 전파됩니다.
+        """
+        started = time.perf_counter()
+        try:
+            while not self._out_of_budget(started):
+                yield from self._accept(page.evaluate(SCROLL_STEP_JS, self._step_args()))
+                # 마지막 스크롤 뒤에는 렌더링을 기다리지 않음
+                if self.stop_reason or self._out_of_budget(started):
+                    return
+                if self.readiness is not None:
+                    self.readiness.wait(page, SCROLL_SETTLE_WAIT, quiet_ms=SCROLL_QUIET_MS)
+                else:
+                    page.wait_for_timeout(SCROLL_SETTLE_WAIT * 1000)
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    async def harvest_async(self, page) -> AsyncIterator[Dict[str, Any]]:
+        """harvest()의 비동기 Playwright 버전"""
+        started = time.perf_counter()
+        try:
+            while not self._out_of_budget(started):
+                for product in self._accept(await page.evaluate(SCROLL_STEP_JS, self._step_args())):
+                    yield product
+                if self.stop_reason or self._out_of_budget(started):
+                    return
+                if self.readiness is not None:
+                    await self.readiness.wait_async(page, SCROLL_SETTLE_WAIT, quiet_ms=SCROLL_QUIET_MS)
+                else:
+                    await page.wait_for_timeout(SCROLL_SETTLE_WAIT * 1000)
+        finally:
+            self.elapsed = time.perf_counter() - started
+
+    def report(self):
+        """스크롤 수집 결과 출력"""
+        print(
+            f"📜 [{self.store}] 스크롤 {self.steps}회, 카드 {self.emitted}개 수집 "
+            f"({self.elapsed:.1f}초, 종료: {self.stop_reason or '중단'})"
+        )
@@ -0,0 +1,164 @@
+"""
+선택자 적중률 학습
+store_config의 선택자는 ', '로 이은 대체 목록이라 BaseScraper가 매번 선언 순서대로
+시도하며 실패하는 탐색 비용을 치릅니다. 마트별로 선택자마다 적중 수, 마지막 성공 시각,
+평균 일치 수를 data/cache/selectors/<마트>.json 에 저장해 두고,
+다음 실행부터는 잘 맞던 선택자부터 시도합니다.
+
+- 적중/실패 수는 탐색(카드) 단위, 연속 실패(miss_streak)는 실행 단위
+  (한 실행에서 한 번이라도 맞으면 0으로, 시도만 되고 한 번도 안 맞으면 +1)
+- 정렬: 연속 STALE_AFTER회 실행 이상 실패(매칭 중단)는 뒤로, 그 외는 적중 수 많은 순, 같으면 선언 순서
+- report(): 예전엔 맞았는데 최근 연속으로 실패한 선택자 / 한 번도 맞지 않은 선택자 표시
+- SELECTOR_STATS=0 이면 선언 순서 그대로 사용하고 기록하지 않음
+
+사용 예:
+    stats = SelectorStats("Dirk")
+    selectors = stats.order('title', ["h3[class*='title']", "span[class*='name']"])
+    ...
+    stats.record('title', selectors, hits={"span[class*='name']": 24})
+    stats.save()
+    stats.report()
+"""
+import json
+import os
+import re
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Mapping
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+STATS_DIR = PROJECT_ROOT / "data" / "cache" / "selectors"
+
+STATS_ENABLED = os.getenv("SELECTOR_STATS", "1") != "0"
+STALE_AFTER = 3     # 이만큼 연속 실행에서 실패하면 매칭 중단으로 간주
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class SelectorStats:
+    """마트 하나의 선택자별 적중 통계"""
+
+    def __init__(self, store: str, stats_dir: Path = STATS_DIR):
+        self.store = store
+        self.path = Path(stats_dir) / f"{_slug(store)}.json"
+        self._dirty = False
+        self._stats: Dict[str, Dict[str, Dict[str, Any]]] = self._load() if STATS_ENABLED else {}
+        # 이번 실행에서 시도한 선택자 → 한 번이라도 맞았는지 (save() 때 miss_streak 반영)
+        self._run: Dict[str, Dict[str, bool]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data.get('selectors', {}) if isinstance(data, dict) else {}
+
+    def _entry(self, key: str, selector: str) -> Dict[str, Any]:
+        return self._stats.setdefault(key, {}).setdefault(selector, {
+            'hits': 0, 'misses': 0, 'miss_streak': 0,
+            'avg_matches': 0.0, 'last_success': None,
+        })
+
+    def order(self, key: str, selectors: List[str]) -> List[str]:
+        """선택자 후보를 학습된 순서로 정렬 (통계가 없으면 선언 순서)"""
+        if not STATS_ENABLED or key not in self._stats:
+            return list(selectors)
+        known = self._stats[key]
+
+        def rank(item):
+            index, selector = item
+            entry = known.get(selector, {})
+            return (entry.get('miss_streak', 0) >= STALE_AFTER, -entry.get('hits', 0), index)
+
+        return [selector for _, selector in sorted(enumerate(selectors), key=rank)]
+
+    def record(self, key: str, tried: List[str], hits: Mapping[str, int], exhausted: bool = False):
+        """
+        탐색 한 번의 결과 기록 (연속 실패는 save() 때 실행 단위로 반영)
+
+        Args:
+            tried: 시도한 순서대로의 선택자 목록
+            hits: 선택자 → 일치한 요소(카드) 수 (일치가 없으면 빠져도 됨)
+            exhausted: 끝까지 아무것도 못 찾았는지 (True면 일치 없는 선택자 모두 실패로 기록)
+        """
+        if not STATS_ENABLED:
+            return
+        last_hit = max((i for i, selector in enumerate(tried) if hits.get(selector)), default=-1)
+        now = datetime.now().isoformat(timespec='seconds')
+        for index, selector in enumerate(tried):
+            count = hits.get(selector, 0)
+            if count:
+                entry = self._entry(key, selector)
+                entry['avg_matches'] = (entry['avg_matches'] * entry['hits'] + count) / (entry['hits'] + 1)
+                entry['hits'] += 1
+                entry['last_success'] = now
+                self._run.setdefault(key, {})[selector] = True
+            elif index < last_hit or exhausted:
+                # 뒤 선택자가 맞았거나 모두 실패했으면 이 선택자는 실제로 시도됐다가 실패한 것
+                entry = self._entry(key, selector)
+                entry['misses'] += 1
+                self._run.setdefault(key, {}).setdefault(selector, False)
+            else:
+                continue
+            self._dirty = True
+
+    def _close_run(self):
+        """이번 실행 결과를 miss_streak에 반영 (선택자마다 실행당 한 번)"""
+        for key, outcomes in self._run.items():
+            for selector, matched in outcomes.items():
+                entry = self._entry(key, selector)
+                entry['miss_streak'] = 0 if matched else entry['miss_streak'] + 1
+        self._run = {}
+
+    def stale(self) -> List[Dict[str, Any]]:
+        """매칭이 멈춘 선택자 (예전엔 맞았음) / 한 번도 맞지 않은 선택자"""
+        flagged = []
+        for key, selectors in self._stats.items():
+            for selector, entry in selectors.items():
+                if entry['miss_streak'] < STALE_AFTER:
+                    continue
+                flagged.append({
+                    'key': key,
+                    'selector': selector,
+                    'status': 'stopped' if entry['hits'] else 'never',
+                    'miss_streak': entry['miss_streak'],
+                    'last_success': entry['last_success'],
+                })
+        return flagged
+
+    def report(self):
+        """매칭이 멈춘 선택자 출력 (store_config 수정 후보)"""
+        for item in self.stale():
+            if item['status'] == 'stopped':
+                print(
+                    f"🧭 [{self.store}] {item['key']} 선택자 매칭 중단: {item['selector']} "
+                    f"(연속 {item['miss_streak']}회 실패, 마지막 성공 {item['last_success']})"
+                )
+            else:
+                print(f"🧭 [{self.store}] {item['key']} 선택자 한 번도 매칭 안 됨: {item['selector']}")
+
+    def save(self):
+        """이번 실행의 연속 실패를 반영하고, 변경이 있을 때만 임시 파일에 쓴 뒤 rename"""
+        if not STATS_ENABLED:
+            return
+        self._close_run()
+        if not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {'store': self.store, 'updated_at': datetime.now().isoformat(), 'selectors': self._stats}
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._dirty = False
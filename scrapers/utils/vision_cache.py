@@ -0,0 +1,217 @@
+"""
+Vision 분석 결과 캐시 (지각 해시 기반)
+같은 주에 여러 번 실행해도 전단지/공식 세일 페이지 화면은 거의 그대로인 경우가 많아,
+스크린샷(또는 타일)의 지각 해시(dHash)가 이전과 충분히 가까우면 Gemini Vision을
+다시 호출하지 않고 저장해 둔 상품 목록을 그대로 사용합니다.
+
+- 긴 스크린샷은 가로 띠(BAND_HEIGHT) 단위로 해시해, 일부 구간만 바뀌어도 감지
+- 해밍 거리 임계값: VISION_CACHE_DISTANCE (띠 하나당 64비트 중, 기본 4)
+- 항목은 세일 주차(week)별로 저장하고 주차가 바뀌면 만료
+- VISION_CACHE=0 이면 캐시 사용 안 함
+- Pillow가 없으면 바이트가 완전히 같은 이미지만 캐시 적중
+"""
+import copy
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CACHE_DIR = PROJECT_ROOT / "data" / "cache" / "vision"
+
+CACHE_ENABLED = os.getenv("VISION_CACHE", "1") != "0"
+HASH_DISTANCE = int(os.getenv("VISION_CACHE_DISTANCE", "4"))
+BAND_HEIGHT = 1080          # 띠 하나의 높이 (px, 뷰포트 높이 기준)
+MAX_ENTRIES = 50            # 주차/캐시 파일당 최대 항목 수
+
+EXACT_PREFIX = 'sha1:'
+
+
+def _dhash(image, size: int = 8) -> str:
+    """차이 해시 (size*size 비트, 16진수 문자열)"""
+    pixels = list(image.resize((size + 1, size), Image.LANCZOS).getdata())
+    bits = 0
+    for row in range(size):
+        for col in range(size):
+            left = pixels[row * (size + 1) + col]
+            right = pixels[row * (size + 1) + col + 1]
+            bits = (bits << 1) | (left > right)
+    return f"{bits:0{size * size // 4}x}"
+
+
+def image_hash(data: bytes, band_height: int = BAND_HEIGHT) -> str:
+    """
+    이미지 지각 해시
+
+    Returns:
+        띠별 dHash를 '-'로 이은 문자열. Pillow가 없거나 이미지를 열 수 없으면
+        'sha1:<hex>' (완전히 같은 바이트만 일치)
+    """
+    if Image is not None:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                gray = image.convert('L')
+                width, height = gray.size
+                bands = []
+                for top in range(0, max(height, 1), band_height):
+                    band = gray.crop((0, top, width, min(top + band_height, height)))
+                    bands.append(_dhash(band))
+                return '-'.join(bands)
+        except Exception:
+            pass
+    return EXACT_PREFIX + hashlib.sha1(data).hexdigest()
+
+
+def hash_distance(a: str, b: str) -> Optional[int]:
+    """
+    두 해시의 거리 (띠별 해밍 거리 중 최댓값)
+
+    띠 개수가 다르거나 정확 해시끼리 다르면 None (비교 불가)
+    """
+    if a.startswith(EXACT_PREFIX) or b.startswith(EXACT_PREFIX):
+        return 0 if a == b else None
+    bands_a, bands_b = a.split('-'), b.split('-')
+    if len(bands_a) != len(bands_b):
+        return None
+    return max(bin(int(x, 16) ^ int(y, 16)).count('1') for x, y in zip(bands_a, bands_b))
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+class VisionCache:
+    """
+    마트 하나의 Vision 추출 결과 캐시 (파일: data/cache/vision/<마트>.json)
+
+    사용 예:
+        cache = get_vision_cache("Dirk", week="2025-10-08")
+        products = cache.lookup(image_bytes, tag="0/3")
+        if products is None:
+            products = analyze(...)
+            cache.store(image_bytes, products, tag="0/3")
+        cache.save()
+    """
+
+    def __init__(self, namespace: str, week: Optional[str] = None,
+                 threshold: int = HASH_DISTANCE, root: Path = CACHE_DIR):
+        self.namespace = namespace
+        self.week = week or current_sale_week()
+        self.threshold = threshold
+        self.path = Path(root) / f"{_slug(namespace)}.json"
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries: List[Dict[str, Any]] = self._load()
+
+    def _load(self) -> List[Dict[str, Any]]:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        if not isinstance(data, dict) or data.get('week') != self.week:
+            # 세일 주차가 바뀌면 이전 항목은 모두 만료
+            self._dirty = self.path.exists()
+            return []
+        return [e for e in data.get('entries', []) if isinstance(e, dict) and 'hash' in e]
+
+    def _same(self, entry: Dict[str, Any], key: str, tag: str) -> bool:
+        if entry.get('tag', '') != tag:
+            return False
+        distance = hash_distance(key, entry['hash'])
+        return distance is not None and distance <= self.threshold
+
+    def lookup(self, data: bytes, tag: str = '') -> Optional[List[Dict[str, Any]]]:
+        """
+        가장 가까운 캐시 항목의 상품 목록 (거리가 임계값 이하일 때만)
+
+        Returns:
+            상품 목록 복사본, 적중하지 않으면 None
+        """
+        if not CACHE_ENABLED:
+            return None
+        key = image_hash(data)
+        best, best_distance = None, None
+        with self._lock:
+            for entry in self._entries:
+                if entry.get('tag', '') != tag:
+                    continue
+                distance = hash_distance(key, entry['hash'])
+                if distance is None or distance > self.threshold:
+                    continue
+                if best_distance is None or distance < best_distance:
+                    best, best_distance = entry, distance
+            if best is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return copy.deepcopy(best['products'])
+
+    def store(self, data: bytes, products: List[Dict[str, Any]], tag: str = ''):
+        """추출 결과 저장 (같은 태그의 가까운 항목은 교체)"""
+        if not CACHE_ENABLED:
+            return
+        key = image_hash(data)
+        with self._lock:
+            self._entries = [e for e in self._entries if not self._same(e, key, tag)]
+            self._entries.append({
+                'hash': key,
+                'tag': tag,
+                'products': copy.deepcopy(products),
+                'saved_at': datetime.now().isoformat(),
+            })
+            del self._entries[:-MAX_ENTRIES]
+            self._dirty = True
+
+    def save(self):
+        """변경이 있을 때만 임시 파일에 쓴 뒤 rename"""
+        with self._lock:
+            if not self._dirty or not CACHE_ENABLED:
+                return
+            payload = {'week': self.week, 'namespace': self.namespace, 'entries': list(self._entries)}
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+
+def current_sale_week() -> str:
+    """기본 세일 주차 키 (ISO 주차, 예: '2025-41')"""
+    today = datetime.now()
+    return f"{today.year}-{today.isocalendar()[1]:02d}"
+
+
+_caches: Dict[tuple, VisionCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_vision_cache(namespace: str, week: Optional[str] = None) -> VisionCache:
+    """프로세스 공용 캐시 (마트/주차별 하나, 병렬 타일 분석에서 공유)"""
+    week = week or current_sale_week()
+    with _caches_lock:
+        cache = _caches.get((namespace, week))
+        if cache is None:
+            cache = _caches[(namespace, week)] = VisionCache(namespace, week)
+        return cache